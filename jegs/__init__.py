@@ -0,0 +1 @@
+"""Shared helpers for the Jegs brand scrapers."""
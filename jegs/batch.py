@@ -0,0 +1,171 @@
+"""
+Scrape a batch of parts from one tab with concurrent in-page fetch() calls.
+
+Instead of one driver.get per part, a pool worker takes fetch_batch_size
+parts at a time and stays on its jegs.com tab. All of the batch's product
+pages are fetched together in one execute_async_script call, then every
+part's first fitment page, then every part's remaining fitment pages, so
+each round trip carries the whole batch (fetch_batch_size requests in
+flight). Pages come back as raw HTML and are parsed offline in Python.
+
+The scrape functions take the usual (driver, part_links) but return
+{part_link: records}; a part that failed is missing and its error is
+recorded with jegs.retry, so one bad page never costs the batch.
+"""
+from jegs.brands import APPLICATION, INDIVIDUAL
+from jegs.cache import get_cache
+from jegs.fitment import (
+    missing_fitment_pages,
+    part_number_from_link,
+    scrape_part_fitment,
+    start_fitment_pages,
+    url_from_onclick,
+)
+from jegs.inpage import fetch_pages, page_fetcher
+from jegs.metrics import count, stage
+from jegs.parser import (
+    fitment_tab_onclick,
+    max_page_number,
+    pagination_onclicks,
+    parse_fitment_html,
+    parse_product_html,
+)
+from jegs.retry import record_failure
+from jegs.settings import load_config
+
+
+def batch_size():
+    return max(1, int(load_config()['fetch_batch_size']))
+
+
+def _fetch_all(driver, urls, cache):
+    """{url: HTML or Exception}, from the cache where possible and the page otherwise."""
+    results = {}
+    missing = []
+    for url in dict.fromkeys(urls):
+        body = cache.get(url) if cache else None
+        if body is None:
+            missing.append(url)
+        else:
+            results[url] = body
+    if missing:
+        for url, body in zip(missing, fetch_pages(driver, missing, concurrency=batch_size())):
+            results[url] = body
+            if cache and not isinstance(body, Exception):
+                cache.put(url, body)
+    return results
+
+
+def _fail(part_link, error):
+    print(f"Error processing part ({part_link}): {str(error)}")
+    record_failure(part_link, error)
+
+
+def _fitment(driver, products, cache):
+    """{part_link: fitment rows} for parts whose product page is in products."""
+    states = {}
+    rows = {}
+    first_urls = {}
+    for part_link, product_html in products.items():
+        if part_number_from_link(part_link) is None:
+            print("Error: Part link does not contain enough segments.")
+            rows[part_link] = []
+            continue
+        first_url = url_from_onclick(fitment_tab_onclick(product_html), part_link)
+        if first_url:
+            first_urls[part_link] = first_url
+            continue
+        # No endpoint in the tab handler: open the tab for this part alone
+        try:
+            rows[part_link] = scrape_part_fitment(driver, part_link, page_fetcher(driver), product_html)
+        except Exception as e:
+            _fail(part_link, e)
+
+    with stage('fitment pages'):
+        first_pages = _fetch_all(driver, first_urls.values(), cache)
+        for part_link, first_url in first_urls.items():
+            body = first_pages[first_url]
+            if isinstance(body, Exception):
+                _fail(part_link, body)
+            else:
+                states[part_link] = list(start_fitment_pages(first_url, body))
+
+        while True:
+            wanted = {
+                part_link: missing_fitment_pages(*state)
+                for part_link, state in states.items()
+            }
+            urls = [url for missing in wanted.values() for _, url in missing]
+            if not urls:
+                break
+            bodies = _fetch_all(driver, urls, cache)
+            for part_link, missing in wanted.items():
+                pages, template, last_page = states[part_link]
+                for page_number, url in missing:
+                    body = bodies[url]
+                    if isinstance(body, Exception):
+                        _fail(part_link, body)
+                        del states[part_link]
+                        break
+                    pages[page_number] = body
+                    last_page = max(last_page, max_page_number(pagination_onclicks(body)))
+                else:
+                    states[part_link][2] = last_page
+
+    with stage('fitment parse'):
+        for part_link, (pages, _, _) in states.items():
+            part_number = part_number_from_link(part_link)
+            part_rows = []
+            for page_number in sorted(pages):
+                part_rows.extend(parse_fitment_html(pages[page_number], part_number))
+            count('fitment_rows', len(part_rows))
+            rows[part_link] = part_rows
+    return rows
+
+
+def _scrape(driver, part_links, outputs):
+    cache = get_cache()
+    print(f"Fetching a batch of {len(part_links)} parts in the page")
+    with stage('product page'):
+        bodies = _fetch_all(driver, part_links, cache)
+
+    products = {}
+    for part_link in part_links:
+        body = bodies[part_link]
+        if isinstance(body, Exception):
+            _fail(part_link, body)
+        else:
+            products[part_link] = body
+
+    result = {part_link: {output: [] for output in outputs} for part_link in products}
+    if INDIVIDUAL in outputs:
+        with stage('extraction'):
+            for part_link, product_html in products.items():
+                part_detail = parse_product_html(product_html)
+                if part_detail:
+                    result[part_link][INDIVIDUAL].append(part_detail)
+    if APPLICATION in outputs:
+        fitment_rows = _fitment(driver, products, cache)
+        for part_link in products:
+            if part_link in fitment_rows:
+                result[part_link][APPLICATION] = fitment_rows[part_link]
+            else:
+                del result[part_link]
+    return result
+
+
+def scrape_individual(driver, part_links):
+    """{part_link: [part_detail]} for a batch, fetched in the page."""
+    scraped = _scrape(driver, part_links, [INDIVIDUAL])
+    return {part_link: records[INDIVIDUAL] for part_link, records in scraped.items()}
+
+
+def scrape_application(driver, part_links):
+    """{part_link: fitment rows} for a batch, fetched in the page."""
+    scraped = _scrape(driver, part_links, [APPLICATION])
+    return {part_link: records[APPLICATION] for part_link, records in scraped.items()}
+
+
+def scrape_combined(driver, part_links):
+    """{part_link: {output: records}} for a batch, for combined.SplitSink."""
+    return _scrape(driver, part_links, [INDIVIDUAL, APPLICATION])
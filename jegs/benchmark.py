@@ -0,0 +1,204 @@
+"""
+End-to-end throughput benchmark against the local stand-in site.
+
+    python -m jegs.benchmark --parts 300 --latency 0.1 --workers 4
+
+Each pipeline runs the engine's --fetch http scrapers (jegs.extract,
+jegs.fitment and jegs.combined) through streamed link discovery, the
+browser pool, the checkpoint, the row sink, chunked process_data and the
+xlsxwriter workbook. Only the fetcher is swapped: pages come over plain
+HTTP instead of through the browser's session and the page cache, so no
+Chrome and no jegs.com are involved, and the shared rate limiter is off
+unless --request-delay is given. The in-browser modes (page, batch, tabs)
+need Chrome and are not measured. Reports parts/hour, fitment rows/hour,
+peak RSS and the per-stage timings, and writes them to a JSON file.
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+
+import psutil
+import requests
+
+from jegs import combined, discovery, extract, fitment
+from jegs.brands import APPLICATION, COMBINED, INDIVIDUAL
+from jegs.checkpoint import Checkpoint
+from jegs.engine import PROCESSORS
+from jegs.excel import write_workbook
+from jegs.fakesite import add_site_arguments, brand_website, site_from_args, start_server
+from jegs.http_session import HTTP_POOL_SIZE, session_fetcher
+from jegs.metrics import METRICS, stage, timed
+from jegs.pool import scrape_with_pool
+from jegs.ratelimit import NO_LIMIT, RateLimiter
+from jegs.sink import JsonlSink, iter_processed
+
+PIPELINES = (INDIVIDUAL, APPLICATION, COMBINED)
+MEMORY_SAMPLE_SECONDS = 0.05
+
+
+class PeakMemory:
+    """Samples this process's RSS in the background and keeps the peak."""
+
+    def __init__(self, interval=MEMORY_SAMPLE_SECONDS):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name='peak-memory', daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+class NoBrowser:
+    """Stands in for a verified driver; the benchmark fetches over HTTP."""
+
+    def get(self, url):
+        pass
+
+
+def http_fetcher(limiter=NO_LIMIT):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount('http://', adapter)
+    return session_fetcher(session, limiter=limiter)
+
+
+def scrapers(fetch):
+    """The pipelines' scrape_part_details_http, fetching with `fetch` instead of a browser."""
+    return {
+        INDIVIDUAL: lambda driver, part_links: extract._scrape(driver, part_links, fetch),
+        APPLICATION: lambda driver, part_links: fitment._scrape(driver, part_links, fetch),
+        COMBINED: lambda driver, part_links: combined._scrape(driver, part_links, fetch),
+    }
+
+
+def run_pipeline(pipeline, website, workers, workdir, request_delay=0.0):
+    """Run one pipeline end to end and return its measurements."""
+    METRICS.reset()
+    limiter = NO_LIMIT
+    if request_delay > 0:
+        limiter = RateLimiter(request_delay, path=os.path.join(workdir, 'ratelimit.sqlite3'))
+    fetch = http_fetcher(limiter)
+    outputs = [INDIVIDUAL, APPLICATION] if pipeline == COMBINED else [pipeline]
+    sinks = {output: JsonlSink(os.path.join(workdir, f"{pipeline}_{output}.jsonl")) for output in outputs}
+    sink = combined.SplitSink(sinks) if pipeline == COMBINED else sinks[pipeline]
+    checkpoint = Checkpoint(pipeline, path=os.path.join(workdir, 'checkpoint.sqlite3'))
+    checkpoint.reset()
+
+    started = time.perf_counter()
+    with PeakMemory() as memory:
+        # Listing pages are streamed into the pool, as in the engine
+        with stage('scrape_part_details'):
+            scrape_with_pool(
+                NoBrowser(), [], scrapers(fetch)[pipeline],
+                setup_driver=NoBrowser,
+                wait_for_captcha=lambda driver: None,
+                cleanup=lambda driver: None,
+                website=website,
+                workers=workers,
+                checkpoint=checkpoint,
+                sink=sink,
+                link_source=lambda get_driver: discovery.iter_part_links(fetch, website),
+            )
+        part_links = checkpoint.load_links()
+        sink.close()
+        checkpoint.close()
+        scraped = time.perf_counter()
+
+        rows = {}
+        for output, output_sink in sinks.items():
+            with stage('save_to_excel'):
+                data = iter_processed(output_sink.path, timed('process_data', PROCESSORS[output]))
+                rows[output] = write_workbook(os.path.join(workdir, f"{pipeline}_{output}.xlsx"), data)
+    finished = time.perf_counter()
+
+    summary = METRICS.summary()
+    parts = summary['counters'].get('parts', 0)
+    fitment_rows = summary['counters'].get('fitment_rows', 0)
+    hours = (finished - started) / 3600
+    return {
+        'pipeline': pipeline,
+        'links': len(part_links),
+        'parts': parts,
+        'fitment_rows': fitment_rows,
+        'workbook_rows': rows,
+        'seconds': finished - started,
+        'scrape_seconds': scraped - started,
+        'parts_per_hour': parts / hours if hours else 0.0,
+        'fitment_rows_per_hour': fitment_rows / hours if hours else 0.0,
+        'peak_rss_mb': memory.peak / 1024 ** 2,
+        'stages': summary['stages'],
+    }
+
+
+def report(result):
+    print(f"{result['pipeline']}: {result['parts']}/{result['links']} parts, "
+          f"{result['fitment_rows']} fitment rows in {result['seconds']:.1f}s "
+          f"({result['scrape_seconds']:.1f}s scraping)")
+    print(f"  {result['parts_per_hour']:,.0f} parts/hour, "
+          f"{result['fitment_rows_per_hour']:,.0f} fitment rows/hour, "
+          f"peak RSS {result['peak_rss_mb']:.0f} MB")
+    for stage_name, entry in sorted(result['stages'].items()):
+        print(f"  {stage_name}: n={entry['count']} p50={entry['p50'] * 1000:.1f}ms "
+              f"p95={entry['p95'] * 1000:.1f}ms max={entry['max'] * 1000:.1f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m jegs.benchmark', description="Benchmark the scraping pipelines offline.")
+    parser.add_argument('pipelines', nargs='*', help=f"Any of {', '.join(PIPELINES)} (default: all)")
+    parser.add_argument('--workers', type=int, default=4, help="Pool workers per pipeline")
+    parser.add_argument('--request-delay', type=float, default=0.0, help="Pace requests through the rate limiter (seconds per request)")
+    parser.add_argument('--output', default=None, help="JSON results file (default: jegs_metrics/benchmark-<time>.json)")
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+    args.pipelines = args.pipelines or list(PIPELINES)
+    for pipeline in args.pipelines:
+        if pipeline not in PIPELINES:
+            parser.error(f"unknown pipeline '{pipeline}'")
+
+    site = site_from_args(args)
+    server, base_url = start_server(site)
+    website = brand_website(base_url)
+    print(f"Stand-in site at {website}")
+
+    results = []
+    try:
+        for pipeline in args.pipelines:
+            with tempfile.TemporaryDirectory(prefix=f"jegs-bench-{pipeline}-") as workdir:
+                result = run_pipeline(pipeline, website, args.workers, workdir, args.request_delay)
+            report(result)
+            results.append(result)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    output = args.output or os.path.join('jegs_metrics', f"benchmark-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'settings': vars(args),
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'requests_served': site.requests,
+            'results': results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
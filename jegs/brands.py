@@ -0,0 +1,67 @@
+"""
+Brands scraped from jegs.com.
+
+Every brand page lives at /v/<name>/<vendor code> and its products at
+/i/<name>/<vendor code>/..., so the name and code are all the engine needs
+to find a brand. `output` is the prefix of the workbook names written to
+the Desktop, and `modes` lists the workbooks the brand has. `max_pages`
+caps the listing pages read, carried over from the brand's old scripts; an
+entry without one uses max_pages from config.yaml.
+"""
+
+BRAND_URL = 'https://www.jegs.com/v/{name}/{code}?storeId=10001&catalogId=10002&langId=-1&Tab=GROUP&csrc=brand'
+
+INDIVIDUAL = 'individual'
+APPLICATION = 'application'
+COMBINED = 'combined'
+
+BOTH = (INDIVIDUAL, APPLICATION)
+
+BRANDS = {
+    'acc_performance': {'name': 'ACC-Performance', 'code': '082', 'output': 'ACC_Performance', 'modes': (INDIVIDUAL,), 'max_pages': 100},
+    'airlift': {'name': 'Air-Lift', 'code': '022', 'output': 'AirLift', 'modes': BOTH, 'max_pages': 300},
+    'arb': {'name': 'ARB-4X4', 'code': '378', 'output': 'ARB', 'modes': BOTH, 'max_pages': 200},
+    'backrack': {'name': 'Backrack', 'code': '181', 'output': 'Backrack', 'modes': BOTH, 'max_pages': 300},
+    'bestop': {'name': 'Bestop', 'code': '025', 'output': 'Bestop', 'modes': BOTH, 'max_pages': 300},
+    'bilstein': {'name': 'Bilstein', 'code': '132', 'output': 'Bilstein', 'modes': BOTH, 'max_pages': 200},
+    'borla': {'name': 'Borla', 'code': '157', 'output': 'Borla', 'modes': BOTH, 'max_pages': 200},
+    'ebcbrakes': {'name': 'EBC-Brakes', 'code': '870', 'output': 'EBC_Brakes', 'modes': BOTH, 'max_pages': 120},
+    'edelbrock': {'name': 'Edelbrock', 'code': '350', 'output': 'Edelbrock', 'modes': BOTH, 'max_pages': 200},
+    'eibach': {'name': 'Eibach', 'code': '369', 'output': 'Eibach', 'modes': BOTH, 'max_pages': 300},
+    'fox_racing_shox': {'name': 'Fox-Racing-Shox', 'code': '433', 'output': 'Fox_Racing_Shox', 'modes': BOTH, 'max_pages': 200},
+    'king_shocks': {'name': 'King-Shocks', 'code': '745', 'output': 'King_Shocks', 'modes': BOTH, 'max_pages': 500},
+    'magnaflow': {'name': 'Magnaflow', 'code': '642', 'output': 'MagnaFlow', 'modes': BOTH, 'max_pages': 300},
+    'mbrp': {'name': 'MBRP', 'code': '679', 'output': 'MBRP', 'modes': BOTH, 'max_pages': 200},
+    'omix-ada': {'name': 'Omix-ADA', 'code': '440', 'output': 'Omix-ADA', 'modes': BOTH, 'max_pages': 300},
+    'pace_edwards': {'name': 'Pace-Edwards', 'code': '783', 'output': 'Pace-Edwards', 'modes': BOTH, 'max_pages': 200},
+    'race_sport_lighting': {'name': 'Race-Sport-Lighting', 'code': '740', 'output': 'Race_Sport_Lighting', 'modes': BOTH, 'max_pages': 300},
+    'ranchhand': {'name': 'Ranch-Hand', 'code': '163', 'output': 'Ranch_Hand', 'modes': BOTH, 'max_pages': 300},
+    'ruggedridge': {'name': 'Rugged-Ridge', 'code': '742', 'output': 'Rugged_Ridge', 'modes': BOTH, 'max_pages': 300},
+    'skyjacker': {'name': 'Skyjacker', 'code': '825', 'output': 'Skyjacker', 'modes': BOTH, 'max_pages': 200},
+    'superlift_suspension': {'name': 'Superlift-Suspension-Systems', 'code': '426', 'output': 'Superlift_Suspension', 'modes': BOTH, 'max_pages': 500},
+    'superwinch': {'name': 'Superwinch', 'code': '846', 'output': 'Superwinch', 'modes': BOTH, 'max_pages': 300},
+    'warn': {'name': 'Warn', 'code': '940', 'output': 'Warn', 'modes': BOTH, 'max_pages': 200},
+    'zoneoffroad': {'name': 'Zone-Offroad', 'code': '981', 'output': 'Zone_Offroad', 'modes': BOTH, 'max_pages': 300},
+}
+
+
+def get_brand(slug):
+    """Registry entry for a brand slug, e.g. 'warn' or 'omix-ada'."""
+    try:
+        return BRANDS[slug.lower()]
+    except KeyError:
+        raise Exception(f"Unknown brand '{slug}', expected one of: {', '.join(sorted(BRANDS))}")
+
+
+def brand_url(brand):
+    """The brand's jegs.com landing page."""
+    return BRAND_URL.format(name=brand['name'], code=brand['code'])
+
+
+def brand_modes(brand, mode):
+    """The workbooks a mode produces for a brand ('combined' means all of them)."""
+    if mode == COMBINED:
+        return list(brand['modes'])
+    if mode not in brand['modes']:
+        raise Exception(f"{brand['name']} has no {mode} workbook")
+    return [mode]
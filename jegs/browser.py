@@ -0,0 +1,144 @@
+"""
+Browser helpers shared by the engine and the brand scripts.
+
+Lightweight browsing: skip everything on a page the scrapers never read.
+
+Product pages pull in product photos, web fonts, analytics and ad scripts,
+and a normal driver.get() waits for all of them. In lightweight mode the
+driver uses the 'eager' page-load strategy (driver.get() returns at
+DOMContentLoaded) and Chrome DevTools blocks images, media, fonts and the
+known third-party trackers at the network layer, so they are never
+downloaded. The specification tab and the fitment markup are plain HTML
+from jegs.com and still render.
+
+Blocking starts once the operator has passed the bot check, so the
+challenge page itself always loads in full.
+
+Turn it off with lightweight_browser: false in config.yaml.
+
+Scoped cleanup: cleanup() tears down only the chromedriver and Chrome
+processes that belong to the driver it is given, so several scrapers (or
+pool workers) can share one machine, and removes the driver's temporary
+profile in the background.
+"""
+import os
+import shutil
+import threading
+
+import psutil
+
+from jegs.settings import load_config
+
+PAGE_LOAD_STRATEGY = 'eager'
+
+# Seconds Chrome gets to exit after quit()/terminate() before it is killed
+QUIT_TIMEOUT = 3
+
+# Network.setBlockedURLs patterns; '*' matches any run of characters
+BLOCKED_RESOURCES = (
+    '*.png', '*.png?*', '*.jpg', '*.jpg?*', '*.jpeg', '*.jpeg?*',
+    '*.gif', '*.gif?*', '*.webp', '*.webp?*', '*.svg', '*.svg?*',
+    '*.ico', '*.ico?*', '*.bmp', '*.avif',
+    '*.woff', '*.woff?*', '*.woff2', '*.woff2?*', '*.ttf', '*.ttf?*',
+    '*.otf', '*.otf?*', '*.eot', '*.eot?*',
+    '*.mp4', '*.webm', '*.mp3',
+)
+
+# Analytics, ads, chat and session-replay scripts. Bot-check providers
+# (Cloudflare, reCAPTCHA, hCaptcha) are deliberately not listed.
+BLOCKED_THIRD_PARTIES = (
+    '*googletagmanager.com/*', '*google-analytics.com/*', '*analytics.google.com/*',
+    '*doubleclick.net/*', '*googlesyndication.com/*', '*googleadservices.com/*',
+    '*adservice.google.com/*', '*connect.facebook.net/*', '*facebook.com/tr*',
+    '*bat.bing.com/*', '*clarity.ms/*', '*hotjar.com/*', '*criteo.com/*',
+    '*criteo.net/*', '*pinterest.com/*', '*pinimg.com/*', '*tiktok.com/*',
+    '*snapchat.com/*', '*twitter.com/*', '*ads-twitter.com/*', '*yahoo.com/*',
+    '*quantserve.com/*', '*scorecardresearch.com/*', '*newrelic.com/*',
+    '*nr-data.net/*', '*fullstory.com/*', '*livechatinc.com/*', '*zendesk.com/*',
+    '*bazaarvoice.com/*', '*powerreviews.com/*', '*yotpo.com/*', '*klaviyo.com/*',
+    '*affirm.com/*', '*paypal.com/*', '*paypalobjects.com/*', '*youtube.com/*',
+    '*ytimg.com/*', '*vimeo.com/*', '*fonts.googleapis.com/*', '*fonts.gstatic.com/*',
+    '*typekit.net/*', '*fontawesome.com/*',
+)
+
+BLOCKED_URLS = BLOCKED_RESOURCES + BLOCKED_THIRD_PARTIES
+
+
+def lightweight_enabled():
+    return bool(load_config()['lightweight_browser'])
+
+
+def block_resources(driver, patterns=BLOCKED_URLS):
+    """
+    Block requests matching patterns in driver's current tab.
+
+    DevTools settings are per tab, so call this again for any new window.
+    """
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+
+
+def unblock_resources(driver):
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+
+
+def driver_pids(driver):
+    """PIDs of the processes driver started: chromedriver and, for uc drivers, Chrome."""
+    pids = []
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if process is not None:
+        pids.append(process.pid)
+    browser_pid = getattr(driver, 'browser_pid', None)
+    if browser_pid:
+        pids.append(browser_pid)
+    return pids
+
+
+def process_tree(driver):
+    """psutil.Process objects for driver's processes and all their descendants."""
+    processes = {}
+    for pid in driver_pids(driver):
+        try:
+            root = psutil.Process(pid)
+            processes[root.pid] = root
+            for child in root.children(recursive=True):
+                processes[child.pid] = child
+        except psutil.Error:
+            continue
+    return list(processes.values())
+
+
+def _remove_profile(path):
+    thread = threading.Thread(
+        target=shutil.rmtree, args=(path,), kwargs={'ignore_errors': True},
+        name='remove-profile',
+    )
+    thread.start()
+    return thread
+
+
+def cleanup(driver):
+    """Quit driver, end only its own process tree and remove its temp profile."""
+    # Collect the tree first: once chromedriver exits, Chrome's children are
+    # re-parented and can no longer be found from it
+    processes = process_tree(driver)
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"Error during driver closure: {e}")
+
+    for process in processes:
+        try:
+            process.terminate()
+        except psutil.Error:
+            continue
+    _, alive = psutil.wait_procs(processes, timeout=QUIT_TIMEOUT)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.Error:
+            continue
+
+    user_data_dir = getattr(driver, 'user_data_dir', None)
+    if user_data_dir and os.path.exists(user_data_dir):
+        _remove_profile(user_data_dir)
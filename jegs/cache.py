@@ -0,0 +1,168 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from jegs.settings import load_config
+
+_shared_cache = None
+_shared_cache_loaded = False
+_shared_cache_lock = threading.Lock()
+
+
+def canonical_url(url):
+    """Normalise a URL so equivalent spellings share one cache entry."""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+
+class PageCache:
+    """
+    Compressed on-disk cache of fetched HTML, keyed by canonical URL.
+
+    Each entry is a gzip file named after the SHA-256 of the canonical URL
+    and holds the URL on its first line followed by the page. Entries older
+    than `ttl` seconds are treated as misses, and the oldest entries are
+    evicted once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, directory, ttl=24 * 3600, max_bytes=2 * 1024 ** 3):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(os.path.getsize(path) for path in self._paths())
+
+    def _path(self, url):
+        digest = hashlib.sha256(canonical_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.html.gz")
+
+    def _paths(self):
+        for folder, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.html.gz'):
+                    yield os.path.join(folder, name)
+
+    def get(self, url, max_age=-1):
+        """
+        Return the cached HTML for url, or None on a miss.
+
+        Args:
+            max_age (float): Override the cache TTL in seconds; None accepts
+                entries of any age
+        """
+        max_age = self.ttl if max_age == -1 else max_age
+        path = self._path(url)
+        try:
+            if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+                return None
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                f.readline()
+                return f.read()
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+
+    def put(self, url, page_html):
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(canonical_url(url))
+            f.write('\n')
+            f.write(page_html)
+
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temp_path, path)
+            self._size += os.path.getsize(path) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Drop the oldest entries until the cache is back under 90% of its limit
+        entries = sorted(self._paths(), key=os.path.getmtime)
+        target = self.max_bytes * 0.9
+        for path in entries:
+            if self._size <= target:
+                break
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                continue
+
+    def urls(self, prefix=''):
+        """Canonical URLs of every cached entry whose path starts with prefix."""
+        found = []
+        for path in self._paths():
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    url = f.readline().rstrip('\n')
+            except (OSError, EOFError):
+                continue
+            if urlsplit(url).path.startswith(prefix):
+                found.append(url)
+        return sorted(found)
+
+
+def get_cache():
+    """Shared PageCache configured from config.yaml, or None when disabled."""
+    global _shared_cache, _shared_cache_loaded
+    with _shared_cache_lock:
+        if not _shared_cache_loaded:
+            config = load_config()
+            if config['page_cache']:
+                _shared_cache = PageCache(
+                    os.path.join(os.getcwd(), config['cache_dir']),
+                    ttl=config['cache_ttl_hours'] * 3600,
+                    max_bytes=config['cache_max_mb'] * 1024 ** 2,
+                )
+            _shared_cache_loaded = True
+        return _shared_cache
+
+
+def cached_fetcher(fetch, cache):
+    """Wrap a fetch callable so hits come from cache and misses are stored."""
+    if cache is None:
+        return fetch
+
+    def cached_fetch(urls):
+        bodies = {url: cache.get(url) for url in urls}
+        missing = [url for url, body in bodies.items() if body is None]
+        if missing:
+            for url, body in zip(missing, fetch(missing)):
+                cache.put(url, body)
+                bodies[url] = body
+        return [bodies[url] for url in urls]
+    return cached_fetch
+
+
+def replay_fetcher(cache):
+    """Fetch callable that only reads the cache, whatever the entries' age."""
+    def fetch(urls):
+        bodies = []
+        for url in urls:
+            body = cache.get(url, max_age=None)
+            if body is None:
+                raise Exception(f"Page not in cache: {url}")
+            bodies.append(body)
+        return bodies
+    return fetch
+
+
+def replay_links(checkpoint, href_prefix):
+    """Part links to replay: the checkpoint's links, else every cached product page."""
+    part_links = checkpoint.load_links()
+    if part_links:
+        return part_links
+    cache = get_cache()
+    if cache is None:
+        raise Exception("Replay needs page_cache enabled in config.yaml")
+    # Entries with a query string are fitment fragments, not product pages
+    return [url for url in cache.urls(href_prefix) if not urlsplit(url).query]
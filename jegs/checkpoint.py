@@ -0,0 +1,156 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+CHECKPOINT_FILE = 'jegs_checkpoint.sqlite3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    run TEXT NOT NULL,
+    url TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (run, url)
+);
+CREATE TABLE IF NOT EXISTS parts (
+    run TEXT NOT NULL,
+    url TEXT NOT NULL,
+    records TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    PRIMARY KEY (run, url)
+);
+CREATE TABLE IF NOT EXISTS failures (
+    run TEXT NOT NULL,
+    url TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    error_class TEXT NOT NULL,
+    error TEXT NOT NULL,
+    failed_at REAL NOT NULL,
+    retry_at REAL,
+    PRIMARY KEY (run, url)
+);
+"""
+
+
+class Checkpoint:
+    """
+    Durable crawl state for one brand run, kept in SQLite.
+
+    Stores the discovered part links and, for every finished part, the
+    records it produced, so an interrupted run can pick up where it stopped.
+    Parts that failed are kept too, with their last error and when they are
+    due for a retry (retry_at is NULL once a part is given up on).
+    Safe to share between the browser pool's worker threads.
+    """
+
+    def __init__(self, run, path=None):
+        self.run = run
+        self.path = path or os.path.join(os.getcwd(), CHECKPOINT_FILE)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def reset(self):
+        """Forget everything stored for this run."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM links WHERE run = ?', (self.run,))
+            self._conn.execute('DELETE FROM parts WHERE run = ?', (self.run,))
+            self._conn.execute('DELETE FROM failures WHERE run = ?', (self.run,))
+
+    def save_links(self, part_links):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO links (run, url, position) VALUES (?, ?, ?)',
+                [(self.run, url, position) for position, url in enumerate(part_links)],
+            )
+
+    def load_links(self):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url FROM links WHERE run = ? ORDER BY position', (self.run,)
+            ).fetchall()
+        return [url for (url,) in rows]
+
+    def mark_done(self, part_link, records):
+        """Record a finished part and the rows it produced."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO parts (run, url, records, finished_at) VALUES (?, ?, ?, ?)',
+                (self.run, part_link, json.dumps(records), time.time()),
+            )
+            self._conn.execute('DELETE FROM failures WHERE run = ? AND url = ?', (self.run, part_link))
+
+    def mark_failed(self, part_link, attempts, error, retry_at=None):
+        """Record a failed attempt; retry_at None means the part is dead-lettered."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO failures '
+                '(run, url, attempts, error_class, error, failed_at, retry_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (self.run, part_link, attempts, type(error).__name__, str(error), time.time(), retry_at),
+            )
+
+    def failures(self, dead=False):
+        """Failed parts as dicts, only the dead-lettered ones if dead is True."""
+        query = 'SELECT url, attempts, error_class, error, failed_at, retry_at FROM failures WHERE run = ?'
+        if dead:
+            query += ' AND retry_at IS NULL'
+        with self._lock:
+            rows = self._conn.execute(query + ' ORDER BY failed_at', (self.run,)).fetchall()
+        fields = ('url', 'attempts', 'error_class', 'error', 'failed_at', 'retry_at')
+        return [dict(zip(fields, row)) for row in rows]
+
+    def completed(self):
+        with self._lock:
+            rows = self._conn.execute('SELECT url FROM parts WHERE run = ?', (self.run,)).fetchall()
+        return {url for (url,) in rows}
+
+    def records(self, part_links):
+        """All stored records for part_links, in part_links order."""
+        with self._lock:
+            stored = dict(self._conn.execute(
+                'SELECT url, records FROM parts WHERE run = ?', (self.run,)
+            ).fetchall())
+        part_data = []
+        for part_link in part_links:
+            if part_link in stored:
+                part_data.extend(json.loads(stored[part_link]))
+        return part_data
+
+    def iter_records(self, part_links):
+        """Stored records per finished part, one part at a time."""
+        for part_link in part_links:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT records FROM parts WHERE run = ? AND url = ?', (self.run, part_link)
+                ).fetchone()
+            if row is not None:
+                yield json.loads(row[0])
+
+    def close(self):
+        self._conn.close()
+
+
+def open_checkpoint(script_path, argv=None):
+    """
+    Open the checkpoint for a brand script.
+
+    With --resume (or --replay) on the command line the previous state is
+    kept; otherwise the run starts from scratch.
+
+    Args:
+        script_path (str): The brand script's __file__, used as the run name
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    run = os.path.splitext(os.path.basename(script_path))[0]
+    checkpoint = Checkpoint(run)
+    if '--resume' in argv or '--replay' in argv:
+        print(f"Resuming {run}: {len(checkpoint.load_links())} links, "
+              f"{len(checkpoint.completed())} parts already done, "
+              f"{len(checkpoint.failures())} failed parts to retry.")
+    else:
+        checkpoint.reset()
+    return checkpoint
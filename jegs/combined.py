@@ -0,0 +1,62 @@
+from jegs.brands import APPLICATION, INDIVIDUAL
+from jegs.cache import cached_fetcher, get_cache
+from jegs.fitment import scrape_part_fitment
+from jegs.http_session import http_first_fetcher
+from jegs.inpage import page_fetcher
+from jegs.metrics import stage
+from jegs.parser import ChallengeError, parse_product_html
+from jegs.retry import record_failure
+
+
+class SplitSink:
+    """Routes {output name: rows} results to one row sink per output."""
+
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def write(self, result):
+        for name, rows in result.items():
+            self.sinks[name].write(rows)
+
+    def close(self):
+        for sink in self.sinks.values():
+            sink.close()
+
+
+def _scrape(driver, part_links, fetch):
+    result = {INDIVIDUAL: [], APPLICATION: []}
+    total_links = len(part_links)
+
+    for index, part_link in enumerate(part_links, 1):
+        try:
+            print(f"Processing part {index}/{total_links}: {part_link}")
+            with stage('product page'):
+                product_html = fetch([part_link])[0]
+
+            with stage('extraction'):
+                part_detail = parse_product_html(product_html)
+            if part_detail:
+                result[INDIVIDUAL].append(part_detail)
+
+            rows = scrape_part_fitment(driver, part_link, fetch, product_html=product_html)
+            result[APPLICATION].extend(rows)
+            print(f"Scraped details and {len(rows)} fitment rows for part {index}")
+        except ChallengeError:
+            # Let the pool verify the browser again and retry the part
+            raise
+        except Exception as e:
+            print(f"Error processing part {index} ({part_link}): {str(e)}")
+            record_failure(part_link, e)
+            continue
+
+    return result
+
+
+def scrape_part_details(driver, part_links):
+    """Individual and Application records from one product page fetch, inside the browser."""
+    return _scrape(driver, part_links, cached_fetcher(page_fetcher(driver), get_cache()))
+
+
+def scrape_part_details_http(driver, part_links):
+    """Individual and Application records from one product page fetch, over HTTP."""
+    return _scrape(driver, part_links, cached_fetcher(http_first_fetcher(driver), get_cache()))
@@ -0,0 +1,139 @@
+import math
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from jegs.http_session import get_session, session_fetcher
+from jegs.inpage import page_fetcher
+from jegs.metrics import stage
+from jegs.parser import parse_listing_html
+
+# Tried largest first; the first size the site honours is used for every page
+PAGE_SIZES = (120, 90, 60, 30)
+LISTING_CONCURRENCY = 6
+
+
+def href_prefix(website):
+    """Product href prefix for a brand page, e.g. /v/Warn/940 -> /i/Warn/940/."""
+    path = urlsplit(website).path.strip('/').split('/')
+    return f"/i/{'/'.join(path[1:3])}/"
+
+
+def listing_url(website, page_number, page_size):
+    """Individual products (Tab=SKU) listing URL for one page of a brand."""
+    parts = urlsplit(website)
+    query = dict(parse_qsl(parts.query))
+    query.update({
+        'Tab': 'SKU',
+        'pageSize': str(page_size),
+        'pageNumber': str(page_number),
+    })
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def _first_page(fetch, website, prefix, page_sizes):
+    """Find the largest page size the site honours and return page 1 with it."""
+    for page_size in page_sizes:
+        url = listing_url(website, 1, page_size)
+        links, last_page, total = parse_listing_html(fetch([url])[0], prefix, url)
+        # A capped page size shows up as fewer links than asked for while
+        # more pages remain; smaller sizes are then tried in turn
+        if links and (len(links) >= page_size or last_page == 1 or page_size == page_sizes[-1]):
+            return page_size, links, last_page, total
+    return page_sizes[-1], [], 1, None
+
+
+def iter_part_links(fetch, website, max_pages=None, page_sizes=PAGE_SIZES,
+                    concurrency=LISTING_CONCURRENCY):
+    """
+    Yield a brand's product links a listing page at a time, as pages arrive.
+
+    Page 1 is read once to learn the page count (from the result total or
+    the highest pageNumber in div#pagination); the remaining pages are then
+    fetched `concurrency` at a time. Pages are re-checked for higher page
+    numbers in case pagination only shows a window of them.
+
+    Args:
+        fetch: Callable taking a list of URLs and returning their HTML
+        website (str): Brand page URL, e.g. the scripts' WEBSITE constant
+        max_pages (int): Optional cap on listing pages
+
+    Yields:
+        list: The links of each page not seen on an earlier one, in
+        listing order
+    """
+    prefix = href_prefix(website)
+    page_size, first_links, last_page, total = _first_page(fetch, website, prefix, page_sizes)
+    if total:
+        last_page = max(last_page, math.ceil(total / page_size))
+    print(f"Listing has {last_page} pages of {page_size} (total: {total or 'unknown'})")
+
+    seen = set()
+
+    def new_links(links):
+        fresh = [link for link in dict.fromkeys(links) if link not in seen]
+        seen.update(fresh)
+        return fresh
+
+    yield new_links(first_links)
+    fetched = {1}
+    while True:
+        if max_pages:
+            last_page = min(last_page, max_pages)
+        missing = [n for n in range(2, last_page + 1) if n not in fetched]
+        if not missing:
+            break
+
+        for start in range(0, len(missing), concurrency):
+            batch = missing[start:start + concurrency]
+            urls = [listing_url(website, n, page_size) for n in batch]
+            with stage('listing pages'):
+                bodies = fetch(urls)
+            for page_number, url, body in zip(batch, urls, bodies):
+                links, linked_last_page, _ = parse_listing_html(body, prefix, url)
+                fetched.add(page_number)
+                last_page = max(last_page, linked_last_page)
+                print(f"Found {len(links)} links on page {page_number}")
+                yield new_links(links)
+
+    print(f"Total unique links found: {len(seen)}")
+
+
+def discover_part_links(fetch, website, max_pages=None, page_sizes=PAGE_SIZES,
+                        concurrency=LISTING_CONCURRENCY):
+    """
+    Collect every product link for a brand from concurrently fetched listing pages.
+
+    Returns:
+        list: Unique product links in listing order (see iter_part_links)
+    """
+    return [
+        link
+        for links in iter_part_links(fetch, website, max_pages, page_sizes, concurrency)
+        for link in links
+    ]
+
+
+def scrape_part_links(driver, website, max_pages=None):
+    """Drop-in for the scripts' scrape_part_links, fetching pages inside the browser."""
+    return discover_part_links(page_fetcher(driver, LISTING_CONCURRENCY), website, max_pages)
+
+
+def scrape_part_links_http(driver, website, max_pages=None):
+    """Drop-in for the scripts' scrape_part_links, fetching pages over HTTP."""
+    return discover_part_links(session_fetcher(get_session(driver), LISTING_CONCURRENCY), website, max_pages)
+
+
+def stream_part_links(get_driver, website, max_pages=None):
+    """
+    iter_part_links fetching pages inside the browser, for a streamed pool.
+
+    get_driver() is called for every fetch, so a pool worker's restarted
+    browser carries on with the listing.
+    """
+    def fetch(urls):
+        return page_fetcher(get_driver(), LISTING_CONCURRENCY)(urls)
+    return iter_part_links(fetch, website, max_pages)
+
+
+def stream_part_links_http(get_driver, website, max_pages=None):
+    """iter_part_links fetching pages over HTTP with the browser's session, for a streamed pool."""
+    return iter_part_links(session_fetcher(get_session(get_driver()), LISTING_CONCURRENCY), website, max_pages)
@@ -0,0 +1,384 @@
+"""
+One scraper for every brand in jegs.brands.
+
+    python -m jegs.engine warn skyjacker --mode application
+    python -m jegs.engine all --mode combined --workers 3 --resume
+
+Brands run back to back in one process. The browser is verified once, on
+the first brand, and then just pointed at each following brand page, and
+extra pool browsers stay open from one brand to the next, so the CAPTCHA
+and startup cost is paid once per session instead of once per brand.
+"""
+import argparse
+import logging
+import os
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+from seleniumbase import Driver
+
+from jegs import batch, combined, discovery, extract, fitment, tabs
+from jegs.brands import APPLICATION, BRANDS, COMBINED, INDIVIDUAL, brand_modes, brand_url, get_brand
+from jegs.browser import PAGE_LOAD_STRATEGY, block_resources, cleanup, lightweight_enabled
+from jegs.cache import replay_links
+from jegs.checkpoint import open_checkpoint
+from jegs.excel import write_workbook
+from jegs.metrics import METRICS, stage, timed, write_metrics
+from jegs.netlog import network_capture_enabled
+from jegs.pool import scrape_with_pool
+from jegs.ratelimit import get_limiter
+from jegs.session_store import saved_user_agent, verify_session
+from jegs.settings import load_config
+from jegs.sink import iter_processed, open_sink
+from jegs.supervisor import is_alive, start_driver
+from jegs.waits import WAIT_STATS
+
+# How listing, product and fitment pages are loaded: 'page' one part at a
+# time from inside the browser, 'http' over a keep-alive session with the
+# browser's cookies (the browser only handles bot checks), 'batch'
+# fetch_batch_size parts at a time with concurrent in-page fetch(), and
+# 'tabs' Individual Parts product pages in pipeline_tabs tabs of each
+# browser at once (other modes batch their fetches as with 'batch')
+FETCH_MODES = ('page', 'http', 'batch', 'tabs')
+# 'script' reads each product page in one execute_script call,
+# 'html' parses page_source offline in a process pool
+EXTRACTION_MODES = ('script', 'html')
+
+# Listing pages are streamed into the pool as they arrive
+DISCOVERY = {
+    'page': discovery.stream_part_links,
+    'http': discovery.stream_part_links_http,
+    'batch': discovery.stream_part_links,
+    'tabs': discovery.stream_part_links,
+}
+SCRAPERS = {
+    INDIVIDUAL: {
+        'script': extract.scrape_part_details,
+        'html': extract.scrape_part_details_html,
+        'http': extract.scrape_part_details_http,
+        'batch': batch.scrape_individual,
+        'tabs': tabs.scrape_individual,
+    },
+    APPLICATION: {
+        'page': fitment.scrape_part_details,
+        'http': fitment.scrape_part_details_http,
+        'batch': batch.scrape_application,
+        # Fitment is fetched, never rendered, so there is no page load to
+        # pipeline; batching its fetches is the multi-request equivalent
+        'tabs': batch.scrape_application,
+    },
+    COMBINED: {
+        'page': combined.scrape_part_details,
+        'http': combined.scrape_part_details_http,
+        'batch': batch.scrape_combined,
+        'tabs': batch.scrape_combined,
+    },
+}
+REPLAYERS = {
+    INDIVIDUAL: extract.replay_part_details,
+    APPLICATION: fitment.replay_part_details,
+}
+OUTPUT_NAMES = {
+    INDIVIDUAL: 'Individual_Part',
+    APPLICATION: 'Application',
+}
+
+
+def setup_driver():
+    try:
+        # Create a temporary directory for user data
+        user_data_dir = tempfile.mkdtemp()
+
+        # Initialize the driver with user consent enabled; lightweight drivers
+        # return from get() at DOMContentLoaded instead of the load event
+        lightweight = lightweight_enabled()
+        network_capture = network_capture_enabled()
+        driver = Driver(
+            uc=True,
+            agent=saved_user_agent(),
+            user_data_dir=user_data_dir,
+            page_load_strategy=PAGE_LOAD_STRATEGY if lightweight else None,
+            log_cdp_events=network_capture,
+        )
+        driver.lightweight = lightweight
+        driver.network_capture = network_capture
+
+        # Attach the temp directory path to the driver for later cleanup
+        driver.user_data_dir = user_data_dir
+
+        # Set page load timeout
+        driver.set_page_load_timeout(30)
+
+        return driver
+
+    except Exception as e:
+        print(f"Driver setup failed: {e}")
+        raise
+
+
+def wait_for_captcha(driver):
+    # Prompts only if a challenge is showing and the saved session fails
+    verify_session(driver)
+    if getattr(driver, 'lightweight', False):
+        block_resources(driver)
+
+
+def _strip(df):
+    for column in df.columns:
+        if df[column].dtype == 'object':
+            df[column] = df[column].str.strip()
+    return df
+
+
+def process_individual(part_data):
+    """Individual Part columns: identity, bullets, Specs, Description, then specifications."""
+    if not part_data:
+        raise ValueError("No part data to process")
+
+    df = _strip(pd.DataFrame(part_data))
+
+    # Bullet columns are numbered per part, so there are as many as the
+    # longest bullet list
+    bullet_columns = sorted([col for col in df.columns if 'Bullet' in col])
+    new_order = ['Part Number', 'Title', 'Product Category'] + bullet_columns + ['Specs', 'Description']
+    remaining_columns = [col for col in df.columns if col not in new_order]
+
+    return df[new_order + remaining_columns]
+
+
+def process_application(part_data):
+    """Application columns: Part Number, Year, Make, Model, then the rest of the fitment."""
+    if not part_data:
+        raise ValueError("No part data to process")
+
+    df = _strip(pd.DataFrame(part_data))
+
+    # 'Vehicle' is only used to split out Year/Make/Model
+    df = df.drop('Vehicle', axis=1)
+
+    desired_columns = ['Part Number', 'Year', 'Make', 'Model']
+    reordered_columns = [col for col in desired_columns if col in df.columns]
+    other_columns = [col for col in df.columns if col not in desired_columns]
+
+    return df[reordered_columns + other_columns]
+
+
+PROCESSORS = {
+    INDIVIDUAL: process_individual,
+    APPLICATION: process_application,
+}
+
+
+def save_to_excel(brand, mode, data):
+    current_datetime = datetime.now().strftime("%Y-%m-%d")
+    output_file_name = f"{brand['output']}_{OUTPUT_NAMES[mode]}_{current_datetime}.xlsx"
+    desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
+    file_path = os.path.join(desktop_path, output_file_name)
+
+    write_workbook(file_path, data)
+
+    print(f'Data successfully saved to: {file_path}')
+    return file_path
+
+
+def run_name(slug, mode):
+    """Checkpoint and sink name for one brand and mode."""
+    return f"{slug}_{mode}"
+
+
+def replay_brand(slug, mode):
+    """Rebuild a brand's workbooks from the page cache, without a browser."""
+    brand = get_brand(slug)
+    METRICS.reset()
+    for output in brand_modes(brand, mode):
+        print(f"Replaying cached {output} pages for {brand['name']}...")
+        checkpoint = open_checkpoint(run_name(slug, mode), ['--replay'])
+        part_links = replay_links(checkpoint, discovery.href_prefix(brand_url(brand)))
+        checkpoint.close()
+        with stage('scrape_part_details'):
+            part_data = REPLAYERS[output](part_links)
+        with stage('save_to_excel'):
+            save_to_excel(brand, output, timed('process_data', PROCESSORS[output])(part_data))
+    write_metrics(f"{run_name(slug, mode)}_replay")
+
+
+def run_brand(driver, slug, mode, drivers, fetch_mode='page', extraction_mode='script',
+              workers=None, resume=False):
+    """
+    Scrape one brand with an already-verified driver.
+
+    Args:
+        driver: Verified driver, left open for the next brand
+        slug (str): Key in jegs.brands.BRANDS
+        mode (str): 'individual', 'application' or 'combined'
+        drivers (list): Extra pool drivers kept warm between brands
+        fetch_mode (str): One of FETCH_MODES, how pages are fetched
+        extraction_mode (str): 'script' or 'html' for Individual Part details
+            loaded in the browser (fetched pages are always parsed offline)
+        workers (int): Pool size, defaults to thread_workers in config.yaml
+        resume (bool): Keep the brand's checkpoint from an earlier run
+
+    Returns:
+        list: Paths of the workbooks written
+    """
+    brand = get_brand(slug)
+    website = brand_url(brand)
+    outputs = brand_modes(brand, mode)
+    run = run_name(slug, mode)
+
+    print(f"Starting {brand['name']} ({mode})...")
+    METRICS.reset()
+    checkpoint = open_checkpoint(run, ['--resume'] if resume else [])
+    get_limiter().acquire()
+    driver.get(website)
+
+    part_links = checkpoint.load_links()
+    link_source = None
+    if part_links:
+        print(f"Scraping {len(part_links)} parts...")
+    else:
+        # Scraping starts on page 1's links while the rest of the listing
+        # loads; the pool saves the links once they are all in
+        print("Collecting part links and scraping parts as they are found...")
+        max_pages = brand.get('max_pages', load_config()['max_pages'])
+        link_source = lambda get_driver: DISCOVERY[fetch_mode](get_driver, website, max_pages)
+
+    if len(outputs) > 1:
+        scrape = SCRAPERS[COMBINED][fetch_mode]
+        sinks = {output: open_sink(run_name(slug, output)) for output in outputs}
+        sink = combined.SplitSink(sinks)
+    else:
+        output = outputs[0]
+        if output == INDIVIDUAL:
+            # Fetched pages are never rendered, so they are always parsed offline
+            scrape = SCRAPERS[INDIVIDUAL][extraction_mode if fetch_mode == 'page' else fetch_mode]
+        else:
+            scrape = SCRAPERS[APPLICATION][fetch_mode]
+        sink = open_sink(run_name(slug, output))
+        sinks = {output: sink}
+
+    try:
+        with stage('scrape_part_details'):
+            scrape_with_pool(
+                driver, part_links, scrape,
+                setup_driver=setup_driver,
+                wait_for_captcha=wait_for_captcha,
+                cleanup=cleanup,
+                website=website,
+                workers=workers,
+                checkpoint=checkpoint,
+                sink=sink,
+                drivers=drivers,
+                batch_size=batch.batch_size() if fetch_mode in ('batch', 'tabs') else 1,
+                link_source=link_source,
+                # In-page listing fetches share the first worker's browser
+                source_uses_driver=fetch_mode != 'http',
+            )
+    finally:
+        sink.close()
+        checkpoint.close()
+
+    paths = []
+    for output, output_sink in sinks.items():
+        print(f"Processing and saving {output} data...")
+        # Processing is streamed into the workbook, so save_to_excel includes it
+        with stage('save_to_excel'):
+            data = iter_processed(output_sink.path, timed('process_data', PROCESSORS[output]))
+            paths.append(save_to_excel(brand, output, data))
+    write_metrics(run)
+    return paths
+
+
+def _live_driver(driver, drivers, website):
+    """driver if its session is still alive, else a live pool driver or a new one."""
+    while not is_alive(driver):
+        print("Browser session died, switching to another browser...")
+        cleanup(driver)
+        if not drivers:
+            return start_driver(setup_driver, wait_for_captcha, website, cleanup)
+        driver = drivers.pop(0)
+    return driver
+
+
+def run_brands(slugs, mode, fetch_mode='page', extraction_mode='script', workers=None,
+               resume=False):
+    """
+    Scrape several brands back to back with one verified browser session.
+
+    A brand that fails is reported and skipped so the rest of the list
+    still runs; its checkpoint lets it be picked up later with --resume.
+    """
+    for slug in slugs:
+        get_brand(slug)
+
+    driver = None
+    drivers = []
+    failed = []
+    try:
+        driver = setup_driver()
+        driver.get(brand_url(get_brand(slugs[0])))
+        wait_for_captcha(driver)
+
+        for slug in slugs:
+            try:
+                driver = _live_driver(driver, drivers, brand_url(get_brand(slug)))
+                run_brand(driver, slug, mode, drivers, fetch_mode=fetch_mode,
+                          extraction_mode=extraction_mode, workers=workers, resume=resume)
+            except Exception as e:
+                print(f"{slug} failed: {e}")
+                failed.append(slug)
+    finally:
+        for worker_driver in drivers:
+            cleanup(worker_driver)
+        if driver:
+            cleanup(driver)
+
+    WAIT_STATS.report()
+    if failed:
+        print(f"Brands that did not finish: {', '.join(failed)}")
+    return failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m jegs.engine', description="Scrape jegs.com brands.")
+    parser.add_argument('brands', nargs='+', help=f"Brand slugs, or 'all': {', '.join(sorted(BRANDS))}")
+    parser.add_argument('--mode', choices=(INDIVIDUAL, APPLICATION, COMBINED), default=COMBINED)
+    parser.add_argument('--fetch', choices=FETCH_MODES, default='page', dest='fetch_mode')
+    parser.add_argument('--extraction', choices=EXTRACTION_MODES, default='script', dest='extraction_mode')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--resume', action='store_true', help="Continue from each brand's checkpoint")
+    parser.add_argument('--replay', action='store_true', help="Rebuild workbooks from the page cache only")
+    args = parser.parse_args(argv)
+
+    if args.brands == ['all']:
+        args.brands = [slug for slug, brand in BRANDS.items()
+                       if args.mode == COMBINED or args.mode in brand['modes']]
+    return args
+
+
+def main(argv=None):
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s: %(message)s',
+        handlers=[
+            logging.FileHandler('jegs_scraper.log'),
+            logging.StreamHandler()
+        ]
+    )
+    args = parse_args(argv)
+
+    if args.replay:
+        for slug in args.brands:
+            try:
+                replay_brand(slug, args.mode)
+            except Exception as e:
+                print(f"{slug} failed: {e}")
+        return
+
+    run_brands(args.brands, args.mode, fetch_mode=args.fetch_mode,
+               extraction_mode=args.extraction_mode, workers=args.workers, resume=args.resume)
+
+
+if __name__ == "__main__":
+    main()
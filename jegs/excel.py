@@ -0,0 +1,78 @@
+import math
+import os
+
+import pandas as pd
+import xlsxwriter
+
+MIN_COLUMN_WIDTH = 8
+MAX_COLUMN_WIDTH = 50
+HEADER_COLOR = '#C8C8C8'  # (200, 200, 200), as the old xlwings pass used
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _display_width(value):
+    # Longest line, as Excel's autofit sizes wrapped cells by their widest line
+    return max((len(line) for line in str(value).split('\n')), default=0)
+
+
+def write_workbook(file_path, data):
+    """
+    Write a formatted workbook in a single streaming pass, without Excel.
+
+    Produces the same layout the scripts used to get from df.to_excel plus an
+    xlwings pass: a bold grey header row frozen at the top and column widths
+    fitted to the data and clamped to 8-50. Rows go to disk as they are
+    written (xlsxwriter constant_memory mode), and widths are measured on the
+    way through.
+
+    Args:
+        file_path (str): Output .xlsx path
+        data: A DataFrame, or an iterable of (columns, DataFrame chunk) pairs
+            such as jegs.sink.iter_processed() yields
+    """
+    if isinstance(data, pd.DataFrame):
+        data = [(list(data.columns), data)]
+
+    # Headless servers often have no ~/Desktop yet
+    os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+
+    workbook = xlsxwriter.Workbook(file_path, {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet()
+        header_format = workbook.add_format({'bold': True, 'bg_color': HEADER_COLOR})
+        worksheet.freeze_panes(1, 0)
+        worksheet.set_row(0, None, header_format)
+
+        columns = None
+        widths = []
+        row_number = 1
+        for chunk_columns, frame in data:
+            if columns is None:
+                columns = [str(column) for column in chunk_columns]
+                widths = [_display_width(column) for column in columns]
+                for col, column in enumerate(columns):
+                    worksheet.write_string(0, col, column, header_format)
+
+            for values in frame.itertuples(index=False, name=None):
+                for col, value in enumerate(values):
+                    if _is_blank(value):
+                        continue
+                    if isinstance(value, str):
+                        # write() would turn '=...' into a formula and URLs into links
+                        worksheet.write_string(row_number, col, value)
+                    else:
+                        worksheet.write(row_number, col, value)
+                    widths[col] = max(widths[col], _display_width(value))
+                row_number += 1
+
+        for col, width in enumerate(widths):
+            # +1 for the padding autofit adds around the text
+            width = min(max(width + 1, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH)
+            worksheet.set_column(col, col, width)
+    finally:
+        workbook.close()
+
+    return row_number - 1
@@ -0,0 +1,273 @@
+import atexit
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from selenium.common.exceptions import TimeoutException
+
+from jegs.cache import cached_fetcher, get_cache
+from jegs.http_session import http_first_fetcher
+from jegs.metrics import stage
+from jegs.parser import ChallengeError, is_challenge_page, parse_product_html, parse_product_pages
+from jegs.ratelimit import get_limiter
+from jegs.retry import record_failure
+from jegs.waits import present, wait_for
+
+PAGE_LOAD_WAIT_TIME = 30
+
+_parse_executor = None
+_parse_executor_lock = threading.Lock()
+
+# Builds the same record as the element-by-element scrape_part_details in the
+# individual parts scripts, but inside the page, so a part costs one round trip
+# to chromedriver. Returns [key, value] pairs to keep the column order intact,
+# and with arguments[0] set, the page's HTML for the page cache as well.
+PRODUCT_SCRIPT = r"""
+const text = (el) => el
+    ? (el.innerText || el.textContent || '')
+        .replace(/[ \t\u00a0]+/g, ' ')
+        .replace(/ *\n */g, '\n')
+        .trim()
+    : '';
+const one = (selector) => document.querySelector(selector);
+const all = (selector) => Array.from(document.querySelectorAll(selector));
+const record = [];
+
+const partNumber = one('#product_id');
+if (partNumber) record.push(['Part Number', text(partNumber)]);
+
+const title = all('#pdpHeading .productItemName span').map(text).filter(Boolean).join(' ');
+record.push(['Title', title]);
+
+const shortDesc = one('#shortDesc');
+if (shortDesc) record.push(['Product Category', text(shortDesc)]);
+
+all('#shortDesc li').forEach((li, i) => record.push([`Bullet ${i + 1}`, text(li)]));
+
+record.push(['Specs', '']);
+
+let description = '';
+const aux = one('#tab-auxDescription1');
+const longDesc = one('#tab-longDescription');
+if (aux && longDesc) {
+    const auxText = text(aux);
+    const longText = text(longDesc);
+    const bullets = all('#tab-longDescription ul li').map(text).filter(Boolean).map((b) => `. ${b}`);
+    if (auxText && longText) description = `${auxText}\n\n${longText}\n`;
+    else if (longText) description = longText;
+    else if (bullets.length) description = bullets.join('\n');
+}
+record.push(['Description', description]);
+
+all('div#tab-item-specification div.cf').forEach((row) => {
+    const key = text(row.querySelector('.itemAttribName'));
+    const value = text(row.querySelector('.itemAttribValue'));
+    if (key && value) record.push([key, value]);
+});
+
+return arguments[0] ? [record, document.documentElement.outerHTML] : record;
+"""
+
+
+def extract_product_details(driver, with_html=False):
+    """
+    Extract the current product page in a single execute_script call.
+
+    Args:
+        with_html (bool): Also return the page's HTML, from the same call,
+            for the page cache
+
+    Returns:
+        dict: Part Number, Title, Product Category, Bullet N, Specs,
+        Description and the specification attributes, in page order. With
+        with_html, a (dict, page HTML) tuple
+    """
+    if with_html:
+        record, page_html = driver.execute_script(PRODUCT_SCRIPT, True)
+        return dict(record or []), page_html
+    return dict(driver.execute_script(PRODUCT_SCRIPT, False) or [])
+
+
+def scrape_part_details(driver, part_links):
+    """Drop-in replacement for the individual scripts' scrape_part_details."""
+    part_data = []
+    total_links = len(part_links)
+    cache = get_cache()
+    limiter = get_limiter()
+
+    for index, part_link in enumerate(part_links, 1):
+        try:
+            print(f"Processing part {index}/{total_links}: {part_link}")
+            cached_html = cache.get(part_link) if cache else None
+            if cached_html is not None:
+                part_data.append(parse_product_html(cached_html))
+                print(f"Parsed cached page for part {index}")
+                continue
+
+            limiter.acquire()
+            with stage('navigation'):
+                started = time.monotonic()
+                driver.get(part_link)
+
+            # Returns as soon as the specifications tab is in the DOM
+            try:
+                wait_for(driver, [present('#tab-item-specification')], PAGE_LOAD_WAIT_TIME, name='product page')
+            except TimeoutException as e:
+                limiter.report(ok=False)
+                if is_challenge_page(driver.page_source):
+                    raise ChallengeError(f"Part {index} hit a bot check")
+                print(f"Page load timeout for part {index}")
+                record_failure(part_link, e)
+                continue
+            limiter.report(seconds=time.monotonic() - started)
+
+            with stage('extraction'):
+                if cache:
+                    part_detail, page_html = extract_product_details(driver, with_html=True)
+                    cache.put(part_link, page_html)
+                else:
+                    part_detail = extract_product_details(driver)
+
+            if part_detail:
+                part_data.append(part_detail)
+                print(f"Successfully scraped details for part {index}")
+
+        except ChallengeError:
+            # Let the pool verify the browser again and retry the part
+            raise
+        except Exception as e:
+            print(f"Error processing part {index} ({part_link}): {str(e)}")
+            record_failure(part_link, e)
+            continue
+
+    return part_data
+
+
+def _scrape(driver, part_links, fetch):
+    part_data = []
+    total_links = len(part_links)
+
+    for index, part_link in enumerate(part_links, 1):
+        try:
+            print(f"Processing part {index}/{total_links}: {part_link}")
+            with stage('product page'):
+                page_html = fetch([part_link])[0]
+
+            with stage('extraction'):
+                part_detail = parse_product_html(page_html)
+            if part_detail:
+                part_data.append(part_detail)
+                print(f"Successfully scraped details for part {index}")
+
+        except ChallengeError:
+            # Let the pool verify the browser again and retry the part
+            raise
+        except Exception as e:
+            print(f"Error processing part {index} ({part_link}): {str(e)}")
+            record_failure(part_link, e)
+            continue
+
+    return part_data
+
+
+def scrape_part_details_http(driver, part_links):
+    """
+    Fetch product pages over HTTP with the browser's session and parse them offline.
+
+    Most parts cost one keep-alive request and no rendering; only a request
+    that hits a bot check goes through the browser (http_first_fetcher).
+    """
+    return _scrape(driver, part_links, cached_fetcher(http_first_fetcher(driver), get_cache()))
+
+
+def get_parse_executor():
+    """Process pool for page parsing, shared by every browser worker."""
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            _parse_executor = ProcessPoolExecutor()
+            atexit.register(_parse_executor.shutdown)
+        return _parse_executor
+
+
+def scrape_part_details_html(driver, part_links):
+    """
+    Grab each product page's source and parse it in a process pool.
+
+    The browser only navigates and hands over page_source; field extraction
+    runs in jegs.parser while the next part is loading.
+    """
+    pending = []
+    total_links = len(part_links)
+    executor = get_parse_executor()
+    cache = get_cache()
+    limiter = get_limiter()
+
+    for index, part_link in enumerate(part_links, 1):
+        try:
+            print(f"Processing part {index}/{total_links}: {part_link}")
+            cached_html = cache.get(part_link) if cache else None
+            if cached_html is not None:
+                pending.append((index, executor.submit(parse_product_html, cached_html)))
+                continue
+
+            limiter.acquire()
+            with stage('navigation'):
+                started = time.monotonic()
+                driver.get(part_link)
+
+            try:
+                wait_for(driver, [present('#tab-item-specification')], PAGE_LOAD_WAIT_TIME, name='product page')
+            except TimeoutException as e:
+                limiter.report(ok=False)
+                if is_challenge_page(driver.page_source):
+                    raise ChallengeError(f"Part {index} hit a bot check")
+                print(f"Page load timeout for part {index}")
+                record_failure(part_link, e)
+                continue
+            limiter.report(seconds=time.monotonic() - started)
+
+            with stage('page source'):
+                page_source = driver.page_source
+            if cache:
+                cache.put(part_link, page_source)
+            pending.append((index, executor.submit(parse_product_html, page_source)))
+
+        except ChallengeError:
+            # Let the pool verify the browser again and retry the part
+            raise
+        except Exception as e:
+            print(f"Error processing part {index} ({part_link}): {str(e)}")
+            record_failure(part_link, e)
+            continue
+
+    part_data = []
+    for index, future in pending:
+        try:
+            part_detail = future.result()
+        except Exception as e:
+            print(f"Error parsing part {index}: {str(e)}")
+            continue
+        if part_detail:
+            part_data.append(part_detail)
+
+    return part_data
+
+
+def replay_part_details(part_links):
+    """Rebuild part_data for part_links from the page cache, without a browser."""
+    cache = get_cache()
+    if cache is None:
+        raise Exception("Replay needs page_cache enabled in config.yaml")
+
+    pages = []
+    for part_link in part_links:
+        page_html = cache.get(part_link, max_age=None)
+        if page_html is None:
+            print(f"Not in cache, skipping: {part_link}")
+            continue
+        pages.append(page_html)
+
+    print(f"Parsing {len(pages)} cached pages...")
+    part_data = [part_detail for part_detail in parse_product_pages(pages) if part_detail]
+    return part_data
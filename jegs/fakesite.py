@@ -0,0 +1,278 @@
+"""
+A local stand-in for the parts of jegs.com the scrapers read.
+
+    python -m jegs.fakesite --port 8000 --parts 500 --latency 0.2
+
+serves, for any /v/<Brand>/<code> brand page:
+
+- Individual products listings (Tab=SKU) with div#product-details links,
+  a "N results" count and a div#pagination that only shows a window of
+  page numbers. pageSize is capped like the real site caps it.
+- Product pages at /i/<Brand>/<code>/<sku>/10002/-1 with #pdpHeading,
+  #product_id, #shortDesc, the description tabs, #tab-item-specification
+  and the Vehicle Fitment tab's ajaxLoadFirstProductFitment onclick.
+- Paginated fitment fragments at /fitment, with fitment-data rows and
+  windowed pageNumber onclick links, or the no-fitment message.
+
+Content is generated deterministically from the seed and SKU, so the same
+settings always produce the same site. Every response waits `latency`
+seconds (plus up to `jitter`), and product pages carry `page_kb` of inert
+padding so transfer and parse costs resemble the real pages.
+"""
+import argparse
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from jegs.parser import NO_FITMENT_TEXT
+
+FIRST_SKU = 100000
+PAGINATION_WINDOW = 2
+
+MAKES = {
+    'Jeep': ['Wrangler JL', 'Wrangler JK', 'Gladiator', 'Cherokee XJ', 'Grand Cherokee'],
+    'Ford': ['F-150', 'F-250 Super Duty', 'Bronco', 'Ranger'],
+    'Chevrolet': ['Silverado 1500', 'Colorado', 'Tahoe'],
+    'Toyota': ['Tacoma', '4Runner', 'Tundra'],
+    'Ram': ['1500', '2500'],
+}
+ENGINES = ['3.6L V6', '2.0L L4 Turbo', '5.7L V8', '6.7L L6 Diesel', '3.5L V6 Twin Turbo']
+CATEGORIES = ['Winches', 'Suspension Lift Kits', 'Shock Absorbers', 'Exhaust Systems', 'Brake Pads', 'Bumpers']
+SPEC_NAMES = ['Material', 'Finish', 'Color', 'Weight', 'Length', 'Width', 'Height', 'Warranty',
+              'Country of Origin', 'Quantity', 'Mounting Hardware Included', 'Drilling Required']
+
+
+class FakeSite:
+    """
+    Generates the stand-in pages.
+
+    Args:
+        parts (int): Products per brand
+        max_page_size (int): Largest listing pageSize honoured
+        fitment_rows (tuple): (min, max) vehicles per part; 0 means the part
+            shows the no-fitment message
+        fitment_page_size (int): Vehicles per fitment page
+        spec_rows (int): Specification rows per product
+        page_kb (int): Padding added to each product page
+        latency (float): Seconds every response is delayed
+        jitter (float): Extra random delay of up to this many seconds
+        seed (int): Seed for the generated content
+    """
+
+    def __init__(self, parts=200, max_page_size=60, fitment_rows=(0, 40), fitment_page_size=10,
+                 spec_rows=10, page_kb=150, latency=0.0, jitter=0.0, seed=1):
+        self.parts = parts
+        self.max_page_size = max_page_size
+        self.fitment_rows = fitment_rows
+        self.fitment_page_size = fitment_page_size
+        self.spec_rows = spec_rows
+        self.page_kb = page_kb
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _random(self, *key):
+        return random.Random(f"{self.seed}:{':'.join(map(str, key))}")
+
+    def _padding(self):
+        # Inline script ballast: counted by transfer and parsing, invisible to the parser
+        return f"<script>/*{'x' * (self.page_kb * 1024)}*/</script>" if self.page_kb else ''
+
+    def listing(self, name, code, query):
+        page_size = min(int(query.get('pageSize', 30)), self.max_page_size)
+        page_number = max(1, int(query.get('pageNumber', 1)))
+        last_page = max(1, -(-self.parts // page_size))
+
+        start = (page_number - 1) * page_size
+        skus = range(FIRST_SKU + start, FIRST_SKU + min(start + page_size, self.parts))
+        links = ''.join(
+            f'<div class="product"><a href="/i/{name}/{code}/{sku}/10002/-1">{name} Part {sku}</a></div>'
+            for sku in skus
+        )
+
+        window = range(max(1, page_number - PAGINATION_WINDOW), min(last_page, page_number + PAGINATION_WINDOW) + 1)
+        page_links = ''.join(
+            f'<a href="/v/{name}/{code}?{urlencode(dict(query, pageNumber=n))}">{n}</a>'
+            for n in window if n != page_number
+        )
+        return (
+            f"<html><head><title>{name}</title></head><body>"
+            f'<div class="result-count">{self.parts:,} results</div>'
+            f'<div id="SKU-description-container"><div id="product-details">{links}</div></div>'
+            f'<div id="pagination">{page_links}</div>'
+            f"</body></html>"
+        )
+
+    def brand_page(self, name, code):
+        return (
+            f"<html><body><h1>{name}</h1>"
+            f'<span id="unselected-tab"><a href="/v/{name}/{code}?Tab=SKU">Individual Products</a></span>'
+            f"</body></html>"
+        )
+
+    def _fitment_count(self, code, sku):
+        low, high = self.fitment_rows
+        return self._random('fitment', code, sku).randint(low, high)
+
+    def product(self, name, code, sku):
+        rng = self._random('product', code, sku)
+        category = rng.choice(CATEGORIES)
+        bullets = ''.join(f"<li>{name} feature {i} for part {sku}</li>" for i in range(1, rng.randint(2, 6)))
+        specs = ''.join(
+            f'<div class="cf"><span class="itemAttribName">{spec}</span>'
+            f'<span class="itemAttribValue">{rng.choice(["Steel", "Aluminum", "Black", "Yes", "No", rng.randint(1, 99)])}</span></div>'
+            for spec in SPEC_NAMES[:self.spec_rows]
+        )
+        long_bullets = ''.join(f"<li>Detail {i} of {sku}</li>" for i in range(1, 4))
+        fitment_url = html.escape(f"/fitment?{urlencode({'brand': name, 'code': code, 'sku': sku, 'pageNumber': 1})}")
+        return (
+            f"<html><head><title>{name} {sku}</title>{self._padding()}</head><body>"
+            f'<div id="pdpHeading"><h1 class="productItemName"><span>{name}</span> <span>{category} {sku}</span></h1></div>'
+            f'<span id="product_id">{code}-{sku}</span>'
+            f'<div id="shortDesc">{category}<ul>{bullets}</ul></div>'
+            f'<div id="tab-auxDescription1">Fits select {rng.choice(list(MAKES))} models.</div>'
+            f'<div id="tab-longDescription"><p>{name} {category.lower()} part {sku}.</p><ul>{long_bullets}</ul></div>'
+            f'<div id="tab-item-specification">{specs}</div>'
+            f'<a class="tab-label" onclick="ajaxLoadFirstProductFitment(\'{fitment_url}\', \'fitment\');">Vehicle Fitment</a>'
+            f'<div id="fitment"></div>'
+            f"</body></html>"
+        )
+
+    def fitment(self, query):
+        name, code, sku = query.get('brand', ''), query.get('code', ''), int(query.get('sku', 0))
+        page_number = max(1, int(query.get('pageNumber', 1)))
+        total = self._fitment_count(code, sku)
+        if not total:
+            return f'<div class="fitment-empty">{NO_FITMENT_TEXT}</div>'
+
+        last_page = -(-total // self.fitment_page_size)
+        rows = []
+        start = (page_number - 1) * self.fitment_page_size
+        for index in range(start, min(start + self.fitment_page_size, total)):
+            rng = self._random('vehicle', code, sku, index)
+            make = rng.choice(list(MAKES))
+            rows.append(
+                f'<div class="fitment-data col-4 desk-6 phone-12">'
+                f"<h3>{rng.randint(1990, 2025)} {make} {rng.choice(MAKES[make])}</h3>"
+                f"<ul><li>Engine: {rng.choice(ENGINES)}</li><li>SubModel: Base</li>"
+                f"<li>Notes: Vehicle {index + 1} for {name} {sku}</li></ul></div>"
+            )
+
+        window = range(max(1, page_number - PAGINATION_WINDOW), min(last_page, page_number + PAGINATION_WINDOW) + 1)
+        page_links = ''.join(
+            f'<a onclick="ajaxLoadProductFitment(\'{html.escape("/fitment?" + urlencode(dict(query, pageNumber=n)))}\');">{n}</a>'
+            for n in window if n != page_number
+        )
+        return f"<div>{''.join(rows)}<div class=\"fitment-pagination\">{page_links}</div></div>"
+
+    def respond(self, path, query):
+        """(status, HTML) for a request path and its parsed query."""
+        segments = [segment for segment in path.split('/') if segment]
+        if len(segments) == 3 and segments[0] == 'v':
+            if query.get('Tab') == 'SKU':
+                return 200, self.listing(segments[1], segments[2], query)
+            return 200, self.brand_page(segments[1], segments[2])
+        if len(segments) >= 4 and segments[0] == 'i' and segments[3].isdigit():
+            sku = int(segments[3])
+            if FIRST_SKU <= sku < FIRST_SKU + self.parts:
+                return 200, self.product(segments[1], segments[2], sku)
+        if segments == ['fitment']:
+            return 200, self.fitment(query)
+        return 404, "<html><body>Not found</body></html>"
+
+    def delay(self):
+        with self._lock:
+            self.requests += 1
+        pause = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if pause > 0:
+            time.sleep(pause)
+
+
+def make_handler(site):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            site.delay()
+            status, body = site.respond(parts.path, dict(parse_qsl(parts.query)))
+            payload = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(site, host='127.0.0.1', port=0):
+    """
+    Serve site from a background thread.
+
+    Returns:
+        tuple: (server, base URL); call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fakesite', daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def brand_website(base_url, name='Warn', code='940'):
+    """Brand page URL on the stand-in site, shaped like jegs.brands.BRAND_URL."""
+    return f"{base_url}/v/{name}/{code}?storeId=10001&catalogId=10002&langId=-1&Tab=GROUP&csrc=brand"
+
+
+def add_site_arguments(parser):
+    parser.add_argument('--parts', type=int, default=200, help="Products per brand")
+    parser.add_argument('--max-page-size', type=int, default=60)
+    parser.add_argument('--fitment-min', type=int, default=0)
+    parser.add_argument('--fitment-max', type=int, default=40)
+    parser.add_argument('--fitment-page-size', type=int, default=10)
+    parser.add_argument('--page-kb', type=int, default=150, help="Padding per product page")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=1)
+
+
+def site_from_args(args):
+    return FakeSite(
+        parts=args.parts,
+        max_page_size=args.max_page_size,
+        fitment_rows=(args.fitment_min, args.fitment_max),
+        fitment_page_size=args.fitment_page_size,
+        page_kb=args.page_kb,
+        latency=args.latency,
+        jitter=args.jitter,
+        seed=args.seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m jegs.fakesite', description="Serve a local stand-in for jegs.com.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(site_from_args(args)))
+    print(f"Serving the stand-in site on {brand_website(f'http://{args.host}:{args.port}')}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import re
+from urllib.parse import urljoin
+
+from selenium.webdriver.common.by import By
+
+from jegs.cache import cached_fetcher, get_cache, replay_fetcher
+from jegs.http_session import http_first_fetcher
+from jegs.inpage import page_fetcher
+from jegs.metrics import count, stage
+from jegs.netlog import capture_response, start_capture
+from jegs.parser import (
+    NO_FITMENT_TEXT,
+    ChallengeError,
+    fitment_tab_onclick,
+    max_page_number,
+    pagination_onclicks,
+    parse_fitment_html,
+)
+from jegs.ratelimit import get_limiter
+from jegs.retry import record_failure
+from jegs.waits import changed, contains, present, wait_for
+
+ELEMENT_WAIT_TIME = 10
+
+FITMENT_ROWS = 'div.fitment-data'
+
+FITMENT_TAB = 'a.tab-label[onclick*="ajaxLoadFirstProductFitment"]'
+
+# Quoted arguments inside an onclick handler, e.g. ajaxLoadX('/url?a=1', 'x')
+_QUOTED = re.compile(r"""(['"])(.*?)\1""")
+
+
+def part_number_from_link(part_link):
+    """Build the application part number from a /i/<Brand>/<code>/<sku>/... link."""
+    part_segments = part_link.split('/')
+    if len(part_segments) < 6:
+        return None
+    return f"{part_segments[-4]}-{part_segments[-3]}"
+
+
+def url_from_onclick(onclick, base_url):
+    """Pull the endpoint URL out of an onclick handler, or None."""
+    if not onclick:
+        return None
+    for _, value in _QUOTED.findall(onclick):
+        if '?' in value or '/' in value:
+            return urljoin(base_url, value.replace('&amp;', '&'))
+    return None
+
+
+def with_page_number(url, page_number):
+    """Point a fitment URL at another page."""
+    if re.search(r'pageNumber=\d+', url):
+        return re.sub(r'pageNumber=\d+', f'pageNumber={page_number}', url)
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}pageNumber={page_number}"
+
+
+def start_fitment_pages(first_url, first_page):
+    """
+    Pagination state for a part's fitment list, from its first page.
+
+    Returns:
+        tuple: (pages, template, last_page), where pages maps page number
+        -> fragment HTML and template is None when there is nothing more
+    """
+    pages = {1: first_page}
+    if NO_FITMENT_TEXT in first_page:
+        return pages, None, 1
+    onclicks = pagination_onclicks(first_page)
+    template = url_from_onclick(onclicks[0], first_url) if onclicks else None
+    return pages, template, max_page_number(onclicks)
+
+
+def missing_fitment_pages(pages, template, last_page):
+    """(page number, URL) for every known page that has not been fetched yet."""
+    if not template:
+        return []
+    return [(n, with_page_number(template, n)) for n in range(2, last_page + 1) if n not in pages]
+
+
+def fetch_fitment_pages(fetch, first_url, first_page=None):
+    """
+    Fetch every page of a part's fitment list.
+
+    Page 1 tells us the highest page number it links to; the missing pages
+    are then requested together, repeating until no fragment links to a page
+    we have not seen (pagination may only show a window of page numbers).
+
+    Returns:
+        dict: page number -> fragment HTML
+    """
+    if first_page is None:
+        first_page = fetch([first_url])[0]
+    pages, template, last_page = start_fitment_pages(first_url, first_page)
+
+    while True:
+        missing = missing_fitment_pages(pages, template, last_page)
+        if not missing:
+            break
+        for (page_number, _), body in zip(missing, fetch([url for _, url in missing])):
+            pages[page_number] = body
+            last_page = max(last_page, max_page_number(pagination_onclicks(body)))
+
+    return pages
+
+
+def wait_for_fitment(driver, before=None, timeout=ELEMENT_WAIT_TIME):
+    """
+    Wait until fitment rows or the no-fitment message are on the page.
+
+    Pass before=snapshot(driver, FITMENT_ROWS) taken ahead of a pagination
+    click to wait for the rows of the new page instead of the old ones.
+
+    Returns:
+        bool: False when the part has no fitment records
+    """
+    rows = present(FITMENT_ROWS) if before is None else changed(FITMENT_ROWS, before)
+    name = 'fitment tab' if before is None else 'fitment page'
+    return wait_for(driver, [rows, contains('body', NO_FITMENT_TEXT)], timeout, name=name) == 0
+
+
+def is_fitment_fragment(body):
+    """True for a fitment endpoint response: rows or the no-fitment message."""
+    return 'fitment-data' in body or NO_FITMENT_TEXT in body
+
+
+def capture_fitment_rows(driver, fitment_tab, part_number):
+    """
+    Open the fitment tab and page through it, reading each page's fragment
+    from the network log (jegs.netlog) instead of the rendered DOM.
+
+    Pagination handlers are taken from the fragment and run in the page, so
+    no page has to render before the next one is requested.
+    """
+    rows = []
+    since = start_capture(driver)
+    driver.execute_script("arguments[0].click();", fitment_tab)
+    page_number = 1
+    while True:
+        _, fragment = capture_response(driver, since, is_fitment_fragment, ELEMENT_WAIT_TIME)
+        rows.extend(parse_fitment_html(fragment, part_number))
+        next_page = f"pageNumber={page_number + 1}"
+        onclick = next((o for o in pagination_onclicks(fragment) if next_page in o), None)
+        if onclick is None:
+            return rows
+        since = start_capture(driver)
+        driver.execute_script(onclick)
+        page_number += 1
+
+
+def _first_page_from_tab(driver, part_link):
+    """Open the fitment tab once and return (page-1 HTML, base URL)."""
+    get_limiter().acquire()
+    driver.get(part_link)
+    wait_for(driver, [present(FITMENT_TAB)], ELEMENT_WAIT_TIME, name='product page')
+    fitment_tab = driver.find_element(By.CSS_SELECTOR, FITMENT_TAB)
+    if getattr(driver, 'network_capture', False):
+        # The fragment the tab requests, without waiting for it to render
+        since = start_capture(driver)
+        driver.execute_script("arguments[0].click();", fitment_tab)
+        url, fragment = capture_response(driver, since, is_fitment_fragment, ELEMENT_WAIT_TIME)
+        return fragment, url
+    driver.execute_script("arguments[0].click();", fitment_tab)
+    wait_for_fitment(driver)
+    return driver.page_source, driver.current_url
+
+
+def _fallback_first_page(driver, part_link):
+    """Page 1 of the fitment list via the tab, cached under a synthetic URL."""
+    cache = get_cache()
+    key = f"{part_link}?fitmentTab=1"
+    if driver is None:
+        # Replaying: the tab cannot be opened, so page 1 must be in the cache
+        first_page = cache.get(key, max_age=None) if cache else None
+        if first_page is None:
+            raise Exception(f"Page not in cache: {key}")
+        return first_page, part_link
+
+    first_page = cache.get(key) if cache else None
+    if first_page is not None:
+        return first_page, part_link
+    first_page, base_url = _first_page_from_tab(driver, part_link)
+    if cache:
+        cache.put(key, first_page)
+    return first_page, base_url
+
+
+def scrape_part_fitment(driver, part_link, fetch, product_html=None):
+    """
+    Collect every fitment row for one part without clicking through pages.
+
+    The fitment endpoint is read from the Vehicle Fitment tab's onclick and
+    called directly for each page. When the handler does not expose a URL,
+    the tab is opened once and the remaining pages are fetched from the
+    pagination links of the first page. Pass product_html when the product
+    page has already been fetched.
+    """
+    part_number = part_number_from_link(part_link)
+    if part_number is None:
+        print("Error: Part link does not contain enough segments.")
+        return []
+
+    if product_html is None:
+        with stage('product page'):
+            product_html = fetch([part_link])[0]
+    first_url = url_from_onclick(fitment_tab_onclick(product_html), part_link)
+    with stage('fitment pages'):
+        if first_url:
+            pages = fetch_fitment_pages(fetch, first_url)
+        else:
+            first_page, base_url = _fallback_first_page(driver, part_link)
+            pages = fetch_fitment_pages(fetch, base_url, first_page=first_page)
+
+    rows = []
+    with stage('fitment parse'):
+        for page_number in sorted(pages):
+            rows.extend(parse_fitment_html(pages[page_number], part_number))
+    count('fitment_rows', len(rows))
+    return rows
+
+
+def _scrape(driver, part_links, fetch):
+    part_data = []
+    total_links = len(part_links)
+
+    for index, part_link in enumerate(part_links, 1):
+        try:
+            print(f"Processing part {index}/{total_links}: {part_link}")
+            rows = scrape_part_fitment(driver, part_link, fetch)
+            if not rows:
+                print(f"No fitment data found for part {index} ({part_link})")
+                continue
+            part_data.extend(rows)
+            print(f"Scraped {len(rows)} fitment rows for part {index}")
+        except ChallengeError:
+            # Let the pool verify the browser again and retry the part
+            raise
+        except Exception as e:
+            print(f"Error processing part {index} ({part_link}): {str(e)}")
+            record_failure(part_link, e)
+            continue
+
+    return part_data
+
+
+def scrape_part_details(driver, part_links):
+    """Drop-in for the application scripts, fetching fitment from inside the page."""
+    return _scrape(driver, part_links, cached_fetcher(page_fetcher(driver), get_cache()))
+
+
+def scrape_part_details_http(driver, part_links):
+    """Drop-in for the application scripts, fetching fitment over HTTP."""
+    return _scrape(driver, part_links, cached_fetcher(http_first_fetcher(driver), get_cache()))
+
+
+def replay_part_details(part_links):
+    """Rebuild fitment part_data for part_links from the page cache, without a browser."""
+    cache = get_cache()
+    if cache is None:
+        raise Exception("Replay needs page_cache enabled in config.yaml")
+    return _scrape(None, part_links, replay_fetcher(cache))
@@ -0,0 +1,103 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from jegs.inpage import page_fetcher
+from jegs.metrics import count
+from jegs.parser import ChallengeError, is_challenge_page
+from jegs.ratelimit import get_limiter
+
+HTTP_POOL_SIZE = 10
+HTTP_TIMEOUT = 30
+FETCH_CONCURRENCY = 4
+
+
+def session_from_driver(driver, pool_size=HTTP_POOL_SIZE):
+    """
+    Build a keep-alive requests session that shares the driver's identity.
+
+    Copies the browser's cookies and user agent, so requests made through the
+    session look like they come from the already-verified browser.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    session.headers.update({
+        'User-Agent': driver.execute_script('return navigator.userAgent;'),
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Referer': driver.current_url,
+    })
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie['name'],
+            cookie['value'],
+            domain=cookie.get('domain'),
+            path=cookie.get('path', '/'),
+        )
+    return session
+
+
+def get_session(driver):
+    """Return the session attached to driver, creating it on first use."""
+    if getattr(driver, 'http_session', None) is None:
+        driver.http_session = session_from_driver(driver)
+    return driver.http_session
+
+
+def session_fetcher(session, concurrency=FETCH_CONCURRENCY, limiter=None):
+    """
+    Fetch callable that uses a requests session sharing the browser's cookies.
+
+    Every request is paced by limiter (default: the shared get_limiter()), and
+    error statuses, bot-check pages and slow responses are reported back to it.
+    """
+    limiter = limiter or get_limiter()
+
+    def get(url):
+        limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = session.get(url, timeout=HTTP_TIMEOUT)
+        except requests.RequestException:
+            limiter.report(ok=False)
+            raise
+        challenged = is_challenge_page(response.text)
+        limiter.report(ok=response.status_code < 400 and not challenged, seconds=time.monotonic() - started)
+        if challenged:
+            raise ChallengeError(f"Fetching {url} hit a bot check")
+        response.raise_for_status()
+        return response.text
+
+    def fetch(urls):
+        if len(urls) == 1:
+            return [get(urls[0])]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(get, urls))
+    return fetch
+
+
+def http_first_fetcher(driver, concurrency=FETCH_CONCURRENCY):
+    """
+    Fetch over the driver's keep-alive HTTP session, using the browser only for bot checks.
+
+    A request that gets a challenge page is retried as an in-page fetch() in
+    the browser, which carries Chrome's own fingerprint and clearance
+    cookies. The HTTP session is then rebuilt from the browser's current
+    cookies on the next call. If the browser is challenged too, the
+    ChallengeError reaches the pool, which verifies the browser again.
+    """
+    fallback = page_fetcher(driver, concurrency)
+
+    def fetch(urls):
+        try:
+            return session_fetcher(get_session(driver), concurrency)(urls)
+        except ChallengeError as e:
+            print(f"{e}; fetching through the browser instead")
+            count('browser_fallbacks')
+            driver.http_session = None
+            return fallback(urls)
+    return fetch
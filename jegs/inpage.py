@@ -0,0 +1,99 @@
+import math
+import time
+
+from jegs.parser import ChallengeError, is_challenge_page
+from jegs.ratelimit import get_limiter
+
+FETCH_TIMEOUT = 60
+FETCH_CONCURRENCY = 4
+
+# Fetches same-origin URLs from inside the page, so requests carry the
+# browser's cookies and verification state. At most `limit` requests are in
+# flight at once; each result is [status, body] or [0, error message].
+FETCH_SCRIPT = r"""
+const urls = arguments[0];
+const limit = arguments[1];
+const done = arguments[arguments.length - 1];
+const results = new Array(urls.length);
+let next = 0;
+
+async function worker() {
+    while (next < urls.length) {
+        const i = next++;
+        try {
+            const response = await fetch(urls[i], {credentials: 'same-origin'});
+            results[i] = [response.status, await response.text()];
+        } catch (error) {
+            results[i] = [0, String(error)];
+        }
+    }
+}
+
+Promise.all(Array.from({length: Math.min(limit, urls.length)}, worker))
+    .then(() => done(results));
+"""
+
+
+def fetch_in_page(driver, urls, concurrency=10, timeout=FETCH_TIMEOUT):
+    """
+    Fetch URLs through the page's own fetch() in one execute_async_script call.
+
+    Args:
+        driver: Driver sitting on a jegs.com page
+        urls (list): Same-origin URLs, absolute or relative to the current page
+        concurrency (int): Maximum requests in flight inside the page
+
+    Returns:
+        list: (status, body) tuples in the order of urls; status is 0 when
+        the request itself failed and body holds the error message
+    """
+    if not urls:
+        return []
+    driver.set_script_timeout(timeout)
+    results = driver.execute_async_script(FETCH_SCRIPT, list(urls), concurrency)
+    return [(status, body) for status, body in results]
+
+
+def fetch_pages(driver, urls, concurrency=FETCH_CONCURRENCY, limiter=None):
+    """
+    Fetch a batch in the page, with a result per URL instead of failing together.
+
+    A batch reserves one rate-limit slot per URL before it starts, so the
+    next batch (from this or any other worker) waits out the whole batch.
+
+    Returns:
+        list: For each URL its HTML, or the Exception (ChallengeError for a
+        bot-check page) it failed with
+    """
+    limiter = limiter or get_limiter()
+    limiter.acquire(len(urls))
+    started = time.monotonic()
+    results = fetch_in_page(driver, urls, concurrency=concurrency)
+    # Requests run `concurrency` at a time, so a round is the closest
+    # thing to a single response time
+    rounds = math.ceil(len(urls) / concurrency) or 1
+    ok = all(status == 200 and not is_challenge_page(body) for status, body in results)
+    limiter.report(ok=ok, seconds=(time.monotonic() - started) / rounds)
+
+    bodies = []
+    for url, (status, body) in zip(urls, results):
+        if status != 200:
+            bodies.append(Exception(f"Fetching {url} failed with status {status}: {body[:200]}"))
+        elif is_challenge_page(body):
+            bodies.append(ChallengeError(f"Fetching {url} hit a bot check"))
+        else:
+            bodies.append(body)
+    return bodies
+
+
+def page_fetcher(driver, concurrency=FETCH_CONCURRENCY, limiter=None):
+    """Fetch callable that runs same-origin fetch() calls inside the page."""
+    limiter = limiter or get_limiter()
+
+    def fetch(urls):
+        bodies = fetch_pages(driver, urls, concurrency, limiter)
+        for body in bodies:
+            if isinstance(body, Exception):
+                raise body
+        return bodies
+    return fetch
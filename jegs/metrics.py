@@ -0,0 +1,179 @@
+"""
+Per-stage timings and throughput for a scraping run.
+
+Code under measurement wraps each stage in `with stage('navigation'):` or
+adds to a counter with count('fitment_rows', n). At the end of a run
+write_metrics() stores p50/p95/max per stage and parts/min and fitment
+rows/min as JSON and as a Prometheus textfile (node_exporter's textfile
+collector format), one pair of files per run under metrics_dir.
+"""
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from jegs.settings import load_config
+
+QUANTILES = (0.5, 0.95)
+
+
+def percentile(sorted_values, quantile):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(quantile * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Metrics:
+    """Thread-safe stage durations and counters since the last reset()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self._durations = {}
+            self._counters = {}
+
+    def observe(self, stage_name, seconds):
+        with self._lock:
+            self._durations.setdefault(stage_name, []).append(seconds)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def summary(self):
+        """Stage histograms, counters and throughput, as written to JSON."""
+        with self._lock:
+            elapsed = time.time() - self.started
+            stages = {}
+            for stage_name, values in self._durations.items():
+                values = sorted(values)
+                stages[stage_name] = {
+                    'count': len(values),
+                    'total': sum(values),
+                    'p50': percentile(values, 0.5),
+                    'p95': percentile(values, 0.95),
+                    'max': values[-1],
+                }
+            counters = dict(self._counters)
+
+        minutes = elapsed / 60 if elapsed > 0 else 0
+        return {
+            'started': self.started,
+            'elapsed_seconds': elapsed,
+            'stages': stages,
+            'counters': counters,
+            'parts_per_minute': counters.get('parts', 0) / minutes if minutes else 0.0,
+            'fitment_rows_per_minute': counters.get('fitment_rows', 0) / minutes if minutes else 0.0,
+        }
+
+
+METRICS = Metrics()
+
+
+@contextmanager
+def stage(stage_name):
+    """Time the enclosed block as one observation of stage_name."""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        METRICS.observe(stage_name, time.monotonic() - started)
+
+
+def timed(stage_name, function):
+    """Wrap function so each call is timed as stage_name."""
+    def wrapper(*args, **kwargs):
+        with stage(stage_name):
+            return function(*args, **kwargs)
+    return wrapper
+
+
+def count(name, value=1):
+    METRICS.count(name, value)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(run, summary):
+    """Render a summary in the Prometheus text exposition format."""
+    run_label = f'run="{_label(run)}"'
+    lines = [
+        '# HELP jegs_stage_seconds Time spent per scraping stage.',
+        '# TYPE jegs_stage_seconds summary',
+    ]
+    for stage_name, entry in sorted(summary['stages'].items()):
+        labels = f'{run_label},stage="{_label(stage_name)}"'
+        for quantile in QUANTILES:
+            lines.append(f'jegs_stage_seconds{{{labels},quantile="{quantile}"}} '
+                         f'{entry[f"p{int(quantile * 100)}"]:.6f}')
+        lines.append(f'jegs_stage_seconds_sum{{{labels}}} {entry["total"]:.6f}')
+        lines.append(f'jegs_stage_seconds_count{{{labels}}} {entry["count"]}')
+
+    lines += [
+        '# HELP jegs_stage_max_seconds Slowest observation per scraping stage.',
+        '# TYPE jegs_stage_max_seconds gauge',
+    ]
+    for stage_name, entry in sorted(summary['stages'].items()):
+        lines.append(f'jegs_stage_max_seconds{{{run_label},stage="{_label(stage_name)}"}} {entry["max"]:.6f}')
+
+    lines += [
+        '# HELP jegs_items_total Items produced by the run.',
+        '# TYPE jegs_items_total counter',
+    ]
+    for name, value in sorted(summary['counters'].items()):
+        lines.append(f'jegs_items_total{{{run_label},item="{_label(name)}"}} {value}')
+
+    for name in ('parts_per_minute', 'fitment_rows_per_minute', 'elapsed_seconds'):
+        lines += [f'# TYPE jegs_{name} gauge', f'jegs_{name}{{{run_label}}} {summary[name]:.6f}']
+    lines += [
+        '# TYPE jegs_run_finished_timestamp_seconds gauge',
+        f'jegs_run_finished_timestamp_seconds{{{run_label}}} {time.time():.0f}',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def _write_atomic(path, text):
+    # The textfile collector may read at any moment, so never expose a partial file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def write_metrics(run, directory=None):
+    """
+    Write the current run's metrics to <run>.json and <run>.prom.
+
+    Args:
+        run (str): Run name, e.g. a script path or '<slug>_<mode>'
+        directory (str): Defaults to metrics_dir in config.yaml
+
+    Returns:
+        dict: The summary that was written
+    """
+    run = os.path.splitext(os.path.basename(run))[0]
+    directory = directory or os.path.join(os.getcwd(), load_config()['metrics_dir'])
+    os.makedirs(directory, exist_ok=True)
+
+    summary = METRICS.summary()
+    summary['run'] = run
+    _write_atomic(os.path.join(directory, f"{run}.json"), json.dumps(summary, indent=2))
+    _write_atomic(os.path.join(directory, f"{run}.prom"), prometheus_text(run, summary))
+
+    print(f"Run metrics: {summary['counters'].get('parts', 0)} parts, "
+          f"{summary['parts_per_minute']:.1f} parts/min, "
+          f"{summary['fitment_rows_per_minute']:.1f} fitment rows/min")
+    for stage_name, entry in sorted(summary['stages'].items()):
+        print(f"  {stage_name}: n={entry['count']} p50={entry['p50']:.2f}s "
+              f"p95={entry['p95']:.2f}s max={entry['max']:.2f}s")
+    return summary
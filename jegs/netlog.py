@@ -0,0 +1,157 @@
+"""
+Read fitment responses straight from Chrome's DevTools network log.
+
+Opening the Vehicle Fitment tab (ajaxLoadFirstProductFitment), or one of its
+pagination links, makes the page request a fitment fragment from jegs.com.
+With network_capture on, drivers start with Chrome's performance log, which
+records every Network.responseReceived / Network.loadingFinished event.
+capture_response() waits for the page's next XHR/fetch to finish, finds it
+in the log and pulls its body with Network.getResponseBody. The fragment is
+then parsed in bulk with jegs.parser instead of waiting for it to render and
+walking the DOM element by element.
+
+The log is drained on every read, so it does not pile up over a long run.
+"""
+import base64
+import json
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+from jegs.settings import load_config
+
+# Chrome capability that turns the performance (DevTools event) log on
+LOGGING_PREFS = {'performance': 'ALL'}
+
+REQUEST_TYPES = ('XHR', 'Fetch')
+
+# Seconds between log reads while the log trails the page
+LOG_POLL_SECONDS = 0.05
+
+# Clears the resource timing buffer (it stops recording once full) and
+# returns the page's clock, so later waits only see requests made after it
+START_SCRIPT = """
+performance.clearResourceTimings();
+return performance.now();
+"""
+
+# arguments: page time, timeout in ms, callback. Resolves with the latest
+# responseEnd of the XHR/fetch requests that finished after that time, or -1
+WAIT_SCRIPT = r"""
+const since = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+
+const latest = (entries) => entries
+    .filter((e) => ['xmlhttprequest', 'fetch'].includes(e.initiatorType) && e.responseEnd > since)
+    .reduce((end, e) => Math.max(end, e.responseEnd), -1);
+
+const finished = latest(performance.getEntriesByType('resource'));
+if (finished >= 0) {
+    done(finished);
+} else {
+    const observer = new PerformanceObserver((list) => {
+        const end = latest(list.getEntries());
+        if (end >= 0) {
+            observer.disconnect();
+            clearTimeout(timer);
+            done(end);
+        }
+    });
+    observer.observe({type: 'resource'});
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        done(-1);
+    }, timeoutMs);
+}
+"""
+
+
+def network_capture_enabled():
+    return bool(load_config()['network_capture'])
+
+
+def network_events(driver):
+    """(method, params) for the Network events logged since the last call."""
+    events = []
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message.get('method', '').startswith('Network.'):
+            events.append((message['method'], message.get('params', {})))
+    return events
+
+
+def response_body(driver, request_id):
+    """Body of a finished request as text, or None once Chrome has dropped it."""
+    try:
+        result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+    except Exception:
+        return None
+    if result.get('base64Encoded'):
+        return base64.b64decode(result['body']).decode('utf-8', errors='replace')
+    return result['body']
+
+
+def start_capture(driver):
+    """
+    Forget earlier responses, ahead of the click that makes the request.
+
+    Returns:
+        float: The page's clock, for capture_response()
+    """
+    network_events(driver)
+    return driver.execute_script(START_SCRIPT)
+
+
+def capture_response(driver, since, wanted, timeout):
+    """
+    Body of the first XHR/fetch response since start_capture() that wanted() accepts.
+
+    Args:
+        driver: Driver started with LOGGING_PREFS
+        since (float): What start_capture() returned
+        wanted: Callable(body) -> bool picking the response out
+        timeout (float): Seconds before giving up
+
+    Returns:
+        tuple: (response URL, body)
+
+    Raises:
+        TimeoutException: If no such response finished within timeout
+    """
+    deadline = time.monotonic() + timeout
+    received = {}
+    finished = set()
+    # The page's clock for the latest XHR/fetch it has seen finish. The log
+    # can trail the page, so waits only move on to it once the log has
+    # delivered a matching response
+    latest = since
+    while True:
+        matched = False
+        for method, params in network_events(driver):
+            if method == 'Network.responseReceived' and params.get('type') in REQUEST_TYPES:
+                received[params['requestId']] = params['response']['url']
+            elif method == 'Network.loadingFinished':
+                finished.add(params.get('requestId'))
+        # loadingFinished can be logged before its responseReceived
+        for request_id in [request_id for request_id in received if request_id in finished]:
+            finished.discard(request_id)
+            url = received.pop(request_id)
+            matched = True
+            body = response_body(driver, request_id)
+            if body is not None and wanted(body):
+                return url, body
+        if matched:
+            since = latest
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(f"No matching response within {timeout}s")
+        if latest > since:
+            # The page has a response the log hasn't caught up with yet
+            time.sleep(min(LOG_POLL_SECONDS, remaining))
+            continue
+        driver.set_script_timeout(remaining + 5)
+        end = driver.execute_async_script(WAIT_SCRIPT, since, int(remaining * 1000))
+        if end >= 0:
+            latest = end
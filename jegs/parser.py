@@ -0,0 +1,318 @@
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urljoin
+
+from lxml import etree, html as lxml_html
+
+# Selectors are compiled once per process and reused for every page
+_PART_NUMBER = etree.XPath('//*[@id="product_id"]')
+_TITLE_SPANS = etree.XPath(
+    '//*[@id="pdpHeading"]//*[contains(concat(" ", normalize-space(@class), " "), " productItemName ")]//span'
+)
+_SHORT_DESC = etree.XPath('//*[@id="shortDesc"]')
+_SHORT_DESC_BULLETS = etree.XPath('//*[@id="shortDesc"]//li')
+_AUX_DESCRIPTION = etree.XPath('//*[@id="tab-auxDescription1"]')
+_LONG_DESCRIPTION = etree.XPath('//*[@id="tab-longDescription"]')
+_LONG_DESCRIPTION_BULLETS = etree.XPath('//*[@id="tab-longDescription"]//ul//li')
+_SPEC_ROWS = etree.XPath(
+    '//div[@id="tab-item-specification"]//div[contains(concat(" ", normalize-space(@class), " "), " cf ")]'
+)
+_ATTRIB_NAME = etree.XPath('.//*[contains(concat(" ", normalize-space(@class), " "), " itemAttribName ")]')
+_ATTRIB_VALUE = etree.XPath('.//*[contains(concat(" ", normalize-space(@class), " "), " itemAttribValue ")]')
+_FITMENT_TAB_ONCLICK = etree.XPath(
+    '//a[contains(concat(" ", normalize-space(@class), " "), " tab-label ")]'
+    '[contains(@onclick, "ajaxLoadFirstProductFitment")]/@onclick'
+)
+_FITMENT_ROWS = etree.XPath(
+    '//div[contains(concat(" ", normalize-space(@class), " "), " fitment-data ")'
+    ' and contains(concat(" ", normalize-space(@class), " "), " col-4 ")'
+    ' and contains(concat(" ", normalize-space(@class), " "), " desk-6 ")'
+    ' and contains(concat(" ", normalize-space(@class), " "), " phone-12 ")]'
+)
+_FITMENT_VEHICLE = etree.XPath('.//h3')
+_FITMENT_DETAILS = etree.XPath('.//ul//li')
+_PAGE_NUMBER_ONCLICKS = etree.XPath('//a[contains(@onclick, "pageNumber=")]/@onclick')
+_LISTING_LINKS = etree.XPath('//div[@id="product-details"]//a/@href')
+_LISTING_PAGE_HREFS = etree.XPath('//div[@id="pagination"]//a[contains(@href, "pageNumber=")]/@href')
+_RESULT_COUNT = re.compile(r'([\d,]+)\s+(?:results|items|products)', re.IGNORECASE)
+_PAGE_NUMBER = re.compile(r'pageNumber=(\d+)')
+
+NO_FITMENT_TEXT = "No Fitment record found for current selection"
+
+# Bot-protection interstitials served instead of the requested page
+CHALLENGE_MARKERS = (
+    '<title>Just a moment...</title>',
+    'Attention Required! | Cloudflare',
+    'cf-browser-verification',
+    'cf_chl_opt',
+    '_Incapsula_Resource',
+    'captcha-delivery.com',
+    'px-captcha',
+    '<title>Access Denied</title>',
+)
+
+# Tags that start a new line in rendered text, like the browser's innerText
+_BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul',
+}
+_SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+_SPACES = re.compile(r'[ \t\r\f\v\u00a0]+')
+_LINE_EDGES = re.compile(r' *\n[ \n]*')
+
+
+def _collect_text(element, chunks):
+    if not isinstance(element.tag, str) or element.tag in _SKIP_TAGS:
+        if element.tail:
+            chunks.append(element.tail)
+        return
+
+    block = element.tag in _BLOCK_TAGS
+    if block:
+        chunks.append('\n')
+    if element.tag == 'br':
+        chunks.append('\n')
+    if element.text:
+        chunks.append(element.text)
+    for child in element:
+        _collect_text(child, chunks)
+    if block:
+        chunks.append('\n')
+    if element.tail:
+        chunks.append(element.tail)
+
+
+def element_text(element):
+    """Approximate Selenium's element.text for an lxml element."""
+    if element is None:
+        return ''
+    chunks = []
+    tail, element.tail = element.tail, None
+    try:
+        _collect_text(element, chunks)
+    finally:
+        element.tail = tail
+    text = _SPACES.sub(' ', ''.join(chunks).replace('\n', ' \n '))
+    return _LINE_EDGES.sub('\n', text).strip()
+
+
+def _first(xpath, node):
+    found = xpath(node)
+    return found[0] if found else None
+
+
+def parse_product_html(page_html):
+    """
+    Turn a product page HTML string into the individual-parts record.
+
+    Produces the same keys, in the same order, as jegs.extract and the
+    element-by-element scrape_part_details in the individual parts scripts.
+
+    Args:
+        page_html (str): Product page source, e.g. one driver.page_source grab
+
+    Returns:
+        dict: Part Number, Title, Product Category, Bullet N, Specs,
+        Description and the specification attributes
+    """
+    root = lxml_html.fromstring(page_html)
+    part_detail = {}
+
+    part_number = _first(_PART_NUMBER, root)
+    if part_number is not None:
+        part_detail['Part Number'] = element_text(part_number)
+
+    title_parts = [element_text(span) for span in _TITLE_SPANS(root)]
+    part_detail['Title'] = ' '.join(part for part in title_parts if part)
+
+    short_desc = _first(_SHORT_DESC, root)
+    if short_desc is not None:
+        part_detail['Product Category'] = element_text(short_desc)
+
+    for i, bullet in enumerate(_SHORT_DESC_BULLETS(root), 1):
+        part_detail[f'Bullet {i}'] = element_text(bullet)
+
+    part_detail['Specs'] = ''
+
+    description = ''
+    aux_description = _first(_AUX_DESCRIPTION, root)
+    long_description = _first(_LONG_DESCRIPTION, root)
+    if aux_description is not None and long_description is not None:
+        aux_text = element_text(aux_description)
+        long_text = element_text(long_description)
+        bullet_texts = [f". {text}" for text in map(element_text, _LONG_DESCRIPTION_BULLETS(root)) if text]
+        if aux_text and long_text:
+            description = f"{aux_text}\n\n{long_text}\n"
+        elif long_text:
+            description = long_text
+        elif bullet_texts:
+            description = "\n".join(bullet_texts)
+    part_detail['Description'] = description
+
+    for row in _SPEC_ROWS(root):
+        key = element_text(_first(_ATTRIB_NAME, row))
+        value = element_text(_first(_ATTRIB_VALUE, row))
+        if key and value:
+            part_detail[key] = value
+
+    return part_detail
+
+
+class ChallengeError(Exception):
+    """A request got a bot-check page; the browser has to be verified again."""
+
+
+def is_challenge_page(page_html):
+    """True when page_html is a CAPTCHA or bot-check page rather than site content."""
+    return bool(page_html) and any(marker in page_html for marker in CHALLENGE_MARKERS)
+
+
+def parse_vehicle_info(vehicle_info):
+    """
+    Split vehicle information into Year, Make, and Model
+
+    Args:
+        vehicle_info (str): Full vehicle information string
+
+    Returns:
+        dict: Dictionary with parsed Year, Make, and Model
+    """
+    parts = vehicle_info.split()
+
+    # Assume the first part is the year (if it's a 4-digit number)
+    if len(parts[0]) == 4 and parts[0].isdigit():
+        year = parts[0]
+        make = parts[1] if len(parts) > 1 else ''
+        model = ' '.join(parts[2:])
+    else:
+        year = ''
+        make = parts[0]
+        model = ' '.join(parts[1:])
+
+    return {
+        'Year': year,
+        'Make': make,
+        'Model': model
+    }
+
+
+def parse_fitment_html(fragment_html, part_number):
+    """
+    Turn one page of fitment markup into application rows.
+
+    Works on a full product page or on the fragment returned by the fitment
+    endpoint, and yields the same rows as the application scripts'
+    scrape_part_details.
+
+    Args:
+        fragment_html (str): Fitment page HTML
+        part_number (str): Part number to stamp on every row
+
+    Returns:
+        list: One dict per vehicle with Vehicle, Year, Make, Model,
+        Part Number and the fitment attributes
+    """
+    if not fragment_html or NO_FITMENT_TEXT in fragment_html:
+        return []
+
+    root = lxml_html.fromstring(fragment_html)
+    rows = []
+    for fitment in _FITMENT_ROWS(root):
+        vehicle_info = element_text(_first(_FITMENT_VEHICLE, fitment))
+        if not vehicle_info:
+            continue
+
+        part_detail = {'Vehicle': vehicle_info}
+        part_detail.update(parse_vehicle_info(vehicle_info))
+        part_detail['Part Number'] = part_number
+
+        for detail in _FITMENT_DETAILS(fitment):
+            detail_text = element_text(detail)
+            if detail_text and ':' in detail_text:
+                key, value = detail_text.split(':', 1)
+                part_detail[key.strip()] = value.strip()
+
+        rows.append(part_detail)
+    return rows
+
+
+def fitment_tab_onclick(page_html):
+    """Return the onclick handler of the Vehicle Fitment tab, or None."""
+    found = _FITMENT_TAB_ONCLICK(lxml_html.fromstring(page_html))
+    return found[0] if found else None
+
+
+def pagination_onclicks(fragment_html):
+    """Return the onclick handlers of a fitment fragment's page links."""
+    if not fragment_html:
+        return []
+    return _PAGE_NUMBER_ONCLICKS(lxml_html.fromstring(fragment_html))
+
+
+def max_page_number(onclicks):
+    """Highest pageNumber=N referenced by a list of onclick handlers."""
+    numbers = [int(n) for onclick in onclicks for n in _PAGE_NUMBER.findall(onclick)]
+    return max(numbers, default=1)
+
+
+def parse_listing_html(listing_html, href_prefix, base_url):
+    """
+    Read a brand listing page.
+
+    Args:
+        listing_html (str): Listing page HTML
+        href_prefix (str): Product href prefix, e.g. '/i/Warn/940/'
+        base_url (str): URL the page was loaded from, to absolutise hrefs
+
+    Returns:
+        tuple: (product links in page order, highest pageNumber linked from
+        div#pagination, total result count or None)
+    """
+    root = lxml_html.fromstring(listing_html)
+    links = [
+        urljoin(base_url, href) for href in _LISTING_LINKS(root)
+        if href.startswith(href_prefix) or href.startswith(urljoin(base_url, href_prefix))
+    ]
+    last_page = max_page_number(_LISTING_PAGE_HREFS(root))
+    count = _RESULT_COUNT.search(element_text(root))
+    total = int(count.group(1).replace(',', '')) if count else None
+    return list(dict.fromkeys(links)), last_page, total
+
+
+def parse_product_pages(pages, workers=None, chunksize=8):
+    """
+    Parse many product pages in a process pool, off the browser thread.
+
+    Args:
+        pages (iterable): Product page HTML strings
+        workers (int): Worker processes, defaults to the CPU count
+
+    Returns:
+        list: One part_detail dict per page, in input order
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_product_html, pages, chunksize=chunksize))
+
+
+def main(paths):
+    """Parse saved product pages and report how long it took."""
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+
+    start = time.perf_counter()
+    records = [parse_product_html(page) for page in pages]
+    elapsed = time.perf_counter() - start
+
+    for path, record in zip(paths, records):
+        print(f"{path}: {record.get('Part Number', '')} ({len(record)} fields)")
+    if pages:
+        print(f"Parsed {len(pages)} pages in {elapsed:.3f}s ({elapsed / len(pages) * 1000:.2f} ms/page)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
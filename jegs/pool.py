@@ -0,0 +1,335 @@
+import threading
+import time
+
+from jegs.metrics import METRICS, count
+from jegs.parser import ChallengeError
+from jegs.retry import RetryQueue, take_failure, write_dead_letters
+from jegs.settings import load_config
+from jegs.supervisor import DriverSupervisor, is_dead_session, start_driver
+
+
+def _empty(records):
+    # Combined scrapers return {output: rows}
+    if isinstance(records, dict):
+        return not any(records.values())
+    return not records
+
+
+def _enqueue(link_queue, part_links, links, done, checkpoint, sink, wait=False):
+    """
+    Add links to part_links and queue those not finished in an earlier run.
+
+    Returns:
+        int: How many were skipped as finished, or None if the queue was
+        closed while waiting for room
+    """
+    skipped = []
+    for part_link in links:
+        index = len(part_links)
+        part_links.append(part_link)
+        if part_link in done:
+            skipped.append(part_link)
+        elif not link_queue.put(index, part_link, wait=wait):
+            return None
+    if skipped and sink is not None:
+        for records in checkpoint.iter_records(skipped):
+            sink.write(records)
+    return len(skipped)
+
+
+def _worker(name, supervisor, link_queue, results, scrape_part_details, part_links, checkpoint, sink,
+            batch_size, feed=None):
+    while True:
+        # A worker that also reads the listing (feed) takes another listing
+        # page whenever the queue has room, and never waits on itself
+        while feed is not None and not link_queue.full():
+            if not feed():
+                feed = None
+            elif not link_queue.empty():
+                break
+        batch = link_queue.get_batch(batch_size)
+        if not batch:
+            return
+        for index, _, _ in batch:
+            # part_links may still be growing while links are streamed in
+            print(f"[{name}] Part {index + 1}/{len(part_links)}")
+        batch_links = [part_link for _, part_link, _ in batch]
+
+        error = None
+        scraped = {}
+        started = time.monotonic()
+        try:
+            if batch_size > 1:
+                # Batch scrapers return {part_link: records}
+                scraped = scrape_part_details(supervisor.driver, batch_links)
+            else:
+                scraped = {batch_links[0]: scrape_part_details(supervisor.driver, batch_links)}
+        except Exception as e:
+            error = e
+        elapsed = time.monotonic() - started
+        for _ in batch:
+            METRICS.observe('part', elapsed / len(batch))
+
+        # The scrapers catch their own per-part errors and record them
+        errors = {part_link: take_failure(part_link) or error for part_link in batch_links}
+        failed = [item for item in batch if errors[item[1]] is not None]
+
+        # A failure may mean the browser died or was challenged under the
+        # scraper; those parts are not at fault, so retry them at once and
+        # recover the browser after saving the rest of the batch
+        recover = None
+        if failed:
+            if any(is_dead_session(errors[item[1]]) for item in failed) or not supervisor.alive():
+                reason = 'browser session died'
+                recover = lambda: supervisor.restart(reason)
+            else:
+                challenge = next((e for e in errors.values() if isinstance(e, ChallengeError)),
+                                 errors[failed[0][1]])
+                if supervisor.challenged(challenge):
+                    reason = 'bot check'
+                    recover = supervisor.reverify
+        if recover is not None:
+            # Empty results from the same batch may be the broken browser's too;
+            # on their own they just mean a part has no data
+            failed += [item for item in batch if item not in failed and _empty(scraped.get(item[1]))]
+            for index, part_link, attempt in failed:
+                link_queue.failed(name, index, part_link, attempt,
+                                  errors[part_link] or Exception(reason), backoff=False)
+
+        finished = 0
+        for item in batch:
+            index, part_link, attempt = item
+            if recover is not None and item in failed:
+                continue
+            if errors[part_link] is not None:
+                print(f"[{name}] Error processing part {index + 1} ({part_link}): {str(errors[part_link])}")
+                link_queue.failed(name, index, part_link, attempt, errors[part_link])
+                continue
+
+            records = scraped.get(part_link) or []
+            count('parts')
+            if sink is not None:
+                sink.write(records)
+            else:
+                results[index] = records
+            if checkpoint is not None:
+                checkpoint.mark_done(part_link, records)
+            finished += 1
+
+        # The whole batch is saved or re-queued by now, so a browser that
+        # cannot be recycled or recovered loses nothing
+        if finished and not supervisor.page_done(finished):
+            return
+        if recover is not None and not recover():
+            return
+
+
+def scrape_with_pool(driver, part_links, scrape_part_details, setup_driver,
+                     wait_for_captcha, cleanup, website, workers=None, checkpoint=None,
+                     sink=None, drivers=None, batch_size=1, link_source=None,
+                     source_uses_driver=False):
+    """
+    Scrape part details with several browsers pulling from one shared queue.
+
+    The already-verified driver becomes the first worker. Extra drivers are
+    built with the script's own setup_driver(), opened on the brand page and
+    verified one at a time, and join the pool as soon as they are ready.
+    Each worker's browser is supervised: a dead session is relaunched and
+    its part re-queued, and browsers are recycled as they age (see
+    jegs.supervisor). Parts that fail are retried with backoff and, once
+    out of attempts, written to a dead-letter file (see jegs.retry).
+
+    With a link_source the links are streamed in while the pool runs, so
+    scraping starts on page 1's links. Each listing page's links are queued
+    as the page arrives, and the listing is held back once link_queue_size
+    links are waiting. It is read on its own thread, or, when it fetches
+    with the browser (source_uses_driver), by the first worker between its
+    batches, so one browser never runs two things at once.
+
+    Args:
+        driver: Verified driver owned by the caller (only cleaned up here
+            if it dies or is recycled)
+        part_links (list): Product URLs to scrape (more may come from link_source)
+        scrape_part_details: The script's scrape_part_details(driver, part_links)
+        setup_driver, wait_for_captcha, cleanup: The script's driver helpers
+        website (str): Brand page used to verify extra drivers
+        workers (int): Pool size, defaults to thread_workers in config.yaml
+        checkpoint: Optional jegs.checkpoint.Checkpoint; finished parts are
+            recorded as they complete and parts it already holds are skipped
+        sink: Optional jegs.sink row sink; rows are written to it as parts
+            finish (in completion order) instead of being kept in memory
+        drivers (list): Optional caller-owned list of extra verified drivers.
+            They are reused before new ones are set up, new and replacement
+            ones are added to it, and the caller cleans them up, so a pool
+            stays warm across several brands
+        batch_size (int): Parts handed to scrape_part_details at a time. Above
+            1 it must be a batch scraper returning {part_link: records}
+            (see jegs.batch)
+        link_source: Optional callable(get_driver) returning an iterable of
+            link lists, e.g. jegs.discovery.stream_part_links. get_driver()
+            is the first worker's current browser, which changes when it is
+            restarted. Once the source is used up the links are saved to the
+            checkpoint; an error it raises is raised here after the parts
+            already queued have been scraped
+        source_uses_driver (bool): link_source fetches with the first
+            worker's browser, so that worker reads it between its batches
+
+    Returns:
+        list: part_data merged in the original part_links order, or None
+        when a sink is used
+    """
+    if workers is None:
+        workers = load_config()['thread_workers']
+
+    streaming = link_source is not None
+    maxsize = int(load_config()['link_queue_size']) if streaming else 0
+    done = checkpoint.completed() if checkpoint is not None else set()
+    link_queue = RetryQueue(checkpoint, maxsize=maxsize)
+    if streaming:
+        link_queue.open()
+    initial_links = part_links
+    part_links = []
+    skipped = _enqueue(link_queue, part_links, initial_links, done, checkpoint, sink)
+    if skipped:
+        print(f"Skipping {skipped} parts finished in a previous run.")
+
+    if streaming:
+        workers = max(1, int(workers))
+    else:
+        workers = max(1, min(int(workers), -(-link_queue.qsize() // batch_size)))
+    results = {}
+    threads = []
+    extra_drivers = []
+    warm_drivers = list(drivers or [])
+    owned = drivers if drivers is not None else extra_drivers
+    owned_lock = threading.Lock()
+    running = [0]
+    feed_errors = []
+    supervisors = []
+    links = None
+
+    def replaced(old_driver, new_driver):
+        with owned_lock:
+            if old_driver in owned:
+                owned[owned.index(old_driver)] = new_driver
+            else:
+                # The caller's own driver; the replacement is ours to track
+                owned.append(new_driver)
+
+    def feed(wait=False):
+        """Queue the next listing page's links; False once the listing is over."""
+        try:
+            page_links = next(links)
+        except StopIteration:
+            if checkpoint is not None:
+                checkpoint.save_links(part_links)
+            link_queue.close()
+            return False
+        except Exception as e:
+            print(f"Collecting part links failed: {e}")
+            feed_errors.append(e)
+            link_queue.close()
+            return False
+        skipped = _enqueue(link_queue, part_links, page_links, done, checkpoint, sink, wait=wait)
+        if skipped is None:
+            print("Stopped collecting part links: no browser is left to scrape them.")
+            return False
+        if skipped:
+            print(f"Skipping {skipped} parts finished in a previous run.")
+        return True
+
+    def feed_all():
+        try:
+            while feed(wait=True):
+                pass
+        finally:
+            link_queue.close()
+
+    def run(name, supervisor, worker_feed):
+        try:
+            _worker(name, supervisor, link_queue, results, scrape_part_details,
+                    part_links, checkpoint, sink, batch_size, worker_feed)
+        finally:
+            if worker_feed is not None and link_queue.feeding:
+                # Nobody else reads the listing; let the other workers finish
+                print(f"[{name}] Stopped before the listing was complete.")
+                feed_errors.append(Exception("Collecting part links stopped: the first browser was lost"))
+                link_queue.close()
+            with owned_lock:
+                running[0] -= 1
+                last = running[0] == 0
+            if last:
+                # Nobody is left to take links; don't hold the producer back
+                link_queue.close()
+
+    def start(name, worker_driver, worker_feed=None):
+        supervisor = DriverSupervisor(
+            name, worker_driver, setup_driver, wait_for_captcha, cleanup, website,
+            on_replace=replaced,
+        )
+        supervisors.append(supervisor)
+        with owned_lock:
+            running[0] += 1
+        thread = threading.Thread(target=run, args=(name, supervisor, worker_feed), name=name, daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    if workers > 1:
+        print(f"Starting browser pool with {workers} workers...")
+    feeder = None
+    if streaming:
+        # Listing fetches follow worker-1's browser across restarts
+        links = iter(link_source(lambda: supervisors[0].driver if supervisors else driver))
+    if streaming and source_uses_driver:
+        start('worker-1', driver, feed)
+    else:
+        start('worker-1', driver)
+        if streaming:
+            # worker-1 is already counted, so the feeder is never shut out
+            # before a browser is there to take its links
+            feeder = threading.Thread(target=feed_all, name='link-feed', daemon=True)
+            feeder.start()
+
+    try:
+        for number in range(2, workers + 1):
+            if link_queue.empty() and not link_queue.feeding:
+                break
+            if warm_drivers:
+                start(f'worker-{number}', warm_drivers.pop(0))
+                continue
+            print(f"Verifying browser for worker-{number}...")
+            try:
+                worker_driver = start_driver(setup_driver, wait_for_captcha, website, cleanup)
+            except Exception as e:
+                print(f"Could not start worker-{number}: {e}")
+                continue
+            with owned_lock:
+                owned.append(worker_driver)
+            start(f'worker-{number}', worker_driver)
+
+        if feeder is not None:
+            feeder.join()
+        for thread in threads:
+            thread.join()
+        if not link_queue.empty():
+            print(f"{link_queue.qsize()} parts were left unscraped because no browser could be restarted.")
+    finally:
+        for worker_driver in extra_drivers:
+            cleanup(worker_driver)
+
+    if checkpoint is not None:
+        write_dead_letters(checkpoint.run, checkpoint.failures(dead=True))
+    elif link_queue.dead:
+        write_dead_letters('parts', link_queue.dead)
+    if feed_errors:
+        raise feed_errors[0]
+
+    if sink is not None:
+        return None
+    if checkpoint is not None:
+        return checkpoint.records(part_links)
+
+    part_data = []
+    for index in sorted(results):
+        part_data.extend(results[index])
+    return part_data
@@ -0,0 +1,170 @@
+"""
+One request rate for jegs.com, shared by every worker thread and process.
+
+The limiter is a token bucket kept as GCRA state (a "theoretical arrival
+time") in a small SQLite file in the working directory, so browser pool
+threads, in-page fetch batches, HTTP sessions and separate engine processes
+all draw from the same budget. The budget is request_delay seconds per
+request from config.yaml, with rate_burst requests allowed back to back.
+
+It also backs off by itself. An error status, a bot-check page or a
+response slower than slow_response_seconds stretches the delay (up to
+max_request_delay) for everyone. Healthy responses shrink it back towards
+request_delay.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from jegs.metrics import METRICS
+from jegs.settings import load_config
+
+RATE_LIMIT_FILE = 'jegs_ratelimit.sqlite3'
+RATE_LIMIT_NAME = 'jegs.com'
+
+ERROR_BACKOFF = 2.0
+SLOW_BACKOFF = 1.5
+RECOVERY = 0.95
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS limits (
+    name TEXT PRIMARY KEY,
+    tat REAL NOT NULL,
+    delay REAL NOT NULL
+);
+"""
+
+
+class RateLimiter:
+    """
+    Cross-process token bucket with automatic backoff.
+
+    Args:
+        delay (float): Seconds per request at full speed
+        burst (int): Requests that may go out back to back
+        max_delay (float): Ceiling for the backed-off delay
+        slow_seconds (float): Responses slower than this count as slow
+        path (str): SQLite file holding the shared state
+        name (str): Bucket name, one per site
+    """
+
+    def __init__(self, delay, burst=1, max_delay=30.0, slow_seconds=10.0, path=None, name=RATE_LIMIT_NAME):
+        self.base_delay = float(delay)
+        self.burst = max(1, int(burst))
+        self.max_delay = max(float(max_delay), self.base_delay)
+        self.slow_seconds = slow_seconds
+        self.name = name
+        self.path = path or os.path.join(os.getcwd(), RATE_LIMIT_FILE)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def _update(self, change):
+        # BEGIN IMMEDIATE takes the write lock up front, so the read-modify-
+        # write below is atomic across processes as well as threads
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute('SELECT tat, delay FROM limits WHERE name = ?', (self.name,)).fetchone()
+                tat, delay = row if row else (0.0, self.base_delay)
+                delay = min(max(delay, self.base_delay), self.max_delay)
+                tat, delay, result = change(time.time(), tat, delay)
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO limits (name, tat, delay) VALUES (?, ?, ?)',
+                    (self.name, tat, delay),
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return result
+
+    def acquire(self, requests=1):
+        """
+        Reserve slots for `requests` requests, sleeping until the first is due.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        def reserve(now, tat, delay):
+            tat = max(tat, now)
+            start = tat - delay * (self.burst - 1)
+            return tat + delay * requests, delay, max(0.0, start - now)
+
+        if requests <= 0:
+            return 0.0
+        wait = self._update(reserve)
+        if wait > 0:
+            time.sleep(wait)
+            METRICS.observe('wait:rate limit', wait)
+        return wait
+
+    def report(self, ok=True, seconds=None):
+        """
+        Feed back how a request went so the shared delay can adapt.
+
+        Args:
+            ok (bool): False for error statuses and bot-check pages
+            seconds (float): Response time, compared with slow_seconds
+        """
+        slow = seconds is not None and seconds > self.slow_seconds
+
+        def adapt(now, tat, delay):
+            if not ok:
+                delay = min(delay * ERROR_BACKOFF, self.max_delay)
+                # Everyone pauses for one full backed-off delay
+                tat = max(tat, now) + delay
+            elif slow:
+                delay = min(delay * SLOW_BACKOFF, self.max_delay)
+            else:
+                delay = max(delay * RECOVERY, self.base_delay)
+            return tat, delay, delay
+
+        new_delay = self._update(adapt)
+        if not ok or slow:
+            print(f"Rate limit backing off: {new_delay:.2f}s per request")
+        return new_delay
+
+    @property
+    def delay(self):
+        """The current shared delay, including any backoff."""
+        return self._update(lambda now, tat, delay: (tat, delay, delay))
+
+
+class NoLimit:
+    """Limiter that never waits, for the offline benchmark and tests."""
+
+    base_delay = 0.0
+    delay = 0.0
+
+    def acquire(self, requests=1):
+        return 0.0
+
+    def report(self, ok=True, seconds=None):
+        return 0.0
+
+
+NO_LIMIT = NoLimit()
+
+
+def get_limiter():
+    """The process-wide limiter configured from config.yaml (NO_LIMIT when request_delay is 0)."""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            config = load_config()
+            if float(config['request_delay']) <= 0:
+                _shared_limiter = NO_LIMIT
+            else:
+                _shared_limiter = RateLimiter(
+                    config['request_delay'],
+                    burst=config['rate_burst'],
+                    max_delay=config['max_request_delay'],
+                    slow_seconds=config['slow_response_seconds'],
+                )
+        return _shared_limiter
@@ -0,0 +1,207 @@
+"""
+Failed parts are retried, not dropped.
+
+The scrapers' error handlers call record_failure(part_link, error) instead
+of only printing, and the browser pool picks the error up for the part it
+just ran. The part goes back into the RetryQueue after an exponential
+backoff (retry_backoff_seconds, doubling each time). After retry_attempts
+tries it is given up on and written to a dead-letter file,
+<dead_letter_dir>/<run>.jsonl, with the error class and message.
+
+Every failure is also kept in the checkpoint, so `--resume` re-fetches
+just the failed and dead-lettered parts instead of the whole brand.
+"""
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+from jegs.metrics import count
+from jegs.settings import load_config
+
+MAX_BACKOFF = 300
+
+_failures = {}
+_failures_lock = threading.Lock()
+
+
+def record_failure(part_link, error):
+    """Note that part_link failed with error, for the pool to retry it."""
+    with _failures_lock:
+        _failures[part_link] = error
+
+
+def take_failure(part_link):
+    """The error recorded for part_link since it was last taken, or None."""
+    with _failures_lock:
+        return _failures.pop(part_link, None)
+
+
+class RetryQueue:
+    """
+    Part links for the pool's workers: in order first, failed ones again later.
+
+    get() hands out the next link that is due and blocks while only
+    backed-off retries are left, so no worker exits while a retry is pending.
+    While a producer is still adding links (between open() and close()),
+    get() also waits for those, and the producer's put(wait=True) blocks
+    once maxsize links are queued.
+
+    Args:
+        checkpoint: Optional jegs.checkpoint.Checkpoint failures are kept in
+        attempts (int): Tries per part, defaults to retry_attempts in config.yaml
+        backoff (float): First retry delay, defaults to retry_backoff_seconds
+        maxsize (int): Queued links a waiting producer is held to, 0 for no limit
+    """
+
+    def __init__(self, checkpoint=None, attempts=None, backoff=None, maxsize=0):
+        config = load_config()
+        self.checkpoint = checkpoint
+        self.attempts = max(1, int(config['retry_attempts'] if attempts is None else attempts))
+        self.backoff = float(config['retry_backoff_seconds'] if backoff is None else backoff)
+        self.maxsize = maxsize
+        self.dead = []
+        self.feeding = False
+        self._heap = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+
+    def open(self):
+        """A producer is about to add links; keep workers waiting for them."""
+        with self._condition:
+            self.feeding = True
+
+    def close(self):
+        """No more links are coming; release waiting workers and producers."""
+        with self._condition:
+            self.feeding = False
+            self._condition.notify_all()
+
+    def put(self, index, part_link, attempt=0, delay=0.0, wait=False):
+        """
+        Queue a part. Retries never wait; a producer passes wait=True.
+
+        Returns:
+            bool: False if the queue was closed while the producer waited
+        """
+        due = time.monotonic() + delay if delay else 0.0
+        with self._condition:
+            while wait and self.maxsize and len(self._heap) >= self.maxsize:
+                if not self.feeding:
+                    return False
+                self._condition.wait()
+            heapq.heappush(self._heap, (due, next(self._order), index, part_link, attempt))
+            self._condition.notify_all()
+            return True
+
+    def get(self):
+        """
+        The next (index, part_link, attempt) that is due.
+
+        Returns:
+            tuple: or None once nothing is left
+        """
+        with self._condition:
+            while self._heap or self.feeding:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                wait = self._heap[0][0] - time.monotonic()
+                if wait <= 0:
+                    _, _, index, part_link, attempt = heapq.heappop(self._heap)
+                    # Room for a producer held at maxsize
+                    self._condition.notify_all()
+                    return index, part_link, attempt
+                self._condition.wait(wait)
+            return None
+
+    def get_batch(self, size):
+        """
+        Up to size due items: waits for the first like get(), then takes only
+        what is already due.
+
+        Returns:
+            list: (index, part_link, attempt) tuples, empty once nothing is left
+        """
+        first = self.get()
+        if first is None:
+            return []
+        batch = [first]
+        with self._condition:
+            now = time.monotonic()
+            while self._heap and len(batch) < size and self._heap[0][0] <= now:
+                _, _, index, part_link, attempt = heapq.heappop(self._heap)
+                batch.append((index, part_link, attempt))
+            self._condition.notify_all()
+        return batch
+
+    def qsize(self):
+        with self._condition:
+            return len(self._heap)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def full(self):
+        """True once maxsize links are queued (never, without a maxsize)."""
+        return bool(self.maxsize) and self.qsize() >= self.maxsize
+
+    def failed(self, name, index, part_link, attempt, error, backoff=True):
+        """
+        Retry a failed part later, or dead-letter it once it is out of attempts.
+
+        Args:
+            backoff (bool): False to retry straight away (the browser was
+                replaced, not the part at fault)
+        """
+        attempts = attempt + 1
+        if attempts < self.attempts:
+            delay = min(self.backoff * 2 ** attempt, MAX_BACKOFF) if backoff else 0.0
+            print(f"[{name}] Retrying part {index + 1} in {delay:.0f}s "
+                  f"(attempt {attempts + 1}/{self.attempts}, {type(error).__name__})")
+            if self.checkpoint is not None:
+                self.checkpoint.mark_failed(part_link, attempts, error, retry_at=time.time() + delay)
+            count('retries')
+            self.put(index, part_link, attempts, delay)
+            return
+
+        print(f"[{name}] Giving up on part {index + 1} ({part_link}) after {attempts} attempts: "
+              f"{type(error).__name__}: {error}")
+        if self.checkpoint is not None:
+            self.checkpoint.mark_failed(part_link, attempts, error)
+        count('dead_letters')
+        with self._condition:
+            self.dead.append({
+                'url': part_link,
+                'attempts': attempts,
+                'error_class': type(error).__name__,
+                'error': str(error),
+                'failed_at': time.time(),
+            })
+
+
+def write_dead_letters(run, entries, directory=None):
+    """
+    Write the parts given up on to <run>.jsonl, one JSON object per line.
+
+    Returns:
+        str: The file written, or None when there is nothing to report (a
+        stale file from an earlier run is removed)
+    """
+    directory = directory or os.path.join(os.getcwd(), load_config()['dead_letter_dir'])
+    path = os.path.join(directory, f"{run}.jsonl")
+    if not entries:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + '\n')
+    os.replace(temp_path, path)
+    print(f"{len(entries)} parts could not be scraped; see {path}")
+    return path
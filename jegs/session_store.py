@@ -0,0 +1,128 @@
+"""
+Verified browser sessions that outlive one browser.
+
+After the operator passes the bot check once, the browser's cookies, user
+agent and localStorage are saved to session_file. Every later browser (pool
+workers, restarted browsers, the next brand, tomorrow's run) loads that
+state into itself before asking anyone. The operator is prompted only when
+a challenge page is actually showing and the saved session no longer gets
+past it. The saved session is dropped after session_ttl_hours, or sooner
+once its cookies expire.
+"""
+import json
+import os
+import threading
+import time
+
+from jegs.parser import is_challenge_page
+from jegs.settings import load_config
+
+_session_lock = threading.Lock()
+
+LOCAL_STORAGE_SCRIPT = 'return JSON.stringify(Object.assign({}, window.localStorage));'
+RESTORE_STORAGE_SCRIPT = """
+const items = arguments[0];
+for (const key of Object.keys(items)) window.localStorage.setItem(key, items[key]);
+"""
+
+# Fields add_cookie() accepts from a get_cookies() entry
+COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'expiry', 'sameSite')
+
+
+def _session_path():
+    return os.path.join(os.getcwd(), load_config()['session_file'])
+
+
+def load_session(path=None):
+    """The saved session, or None if there is none or it has expired."""
+    path = path or _session_path()
+    try:
+        with open(path, encoding='utf-8') as f:
+            session = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    now = time.time()
+    max_age = float(load_config()['session_ttl_hours']) * 3600
+    if now - session.get('saved_at', 0) > max_age:
+        return None
+    session['cookies'] = [
+        cookie for cookie in session.get('cookies', [])
+        if cookie.get('expiry') is None or cookie['expiry'] > now
+    ]
+    if not session['cookies']:
+        return None
+    return session
+
+
+def saved_user_agent():
+    """User agent of the saved session, so new browsers match its cookies."""
+    session = load_session()
+    return session['user_agent'] if session else None
+
+
+def save_session(driver, path=None):
+    """Save driver's cookies, user agent and localStorage as the verified session."""
+    path = path or _session_path()
+    session = {
+        'saved_at': time.time(),
+        'url': driver.current_url,
+        'user_agent': driver.execute_script('return navigator.userAgent;'),
+        'cookies': [
+            {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+            for cookie in driver.get_cookies()
+        ],
+        'local_storage': json.loads(driver.execute_script(LOCAL_STORAGE_SCRIPT) or '{}'),
+    }
+    # Cookies are credentials: write privately, and never expose a partial file
+    with _session_lock:
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(session, f)
+        os.replace(temp_path, path)
+
+
+def restore_session(driver, session=None):
+    """
+    Load the saved session into driver and reload the current page.
+
+    Returns:
+        bool: False if there was no usable saved session
+    """
+    session = session or load_session()
+    if session is None:
+        return False
+    for cookie in session['cookies']:
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            # Cookies for another domain than the open page are refused
+            continue
+    try:
+        driver.execute_script(RESTORE_STORAGE_SCRIPT, session.get('local_storage', {}))
+    except Exception as e:
+        print(f"Could not restore localStorage: {e}")
+    driver.refresh()
+    return True
+
+
+def on_challenge(driver):
+    return is_challenge_page(driver.page_source)
+
+
+def verify_session(driver):
+    """
+    Get driver past the bot check, asking the operator only when needed.
+
+    Expects driver to be on a jegs.com page. If the page is fine the session
+    is saved; if it shows a challenge the saved session is tried first, and
+    only if that fails is the operator prompted to solve it.
+    """
+    if on_challenge(driver):
+        if restore_session(driver) and not on_challenge(driver):
+            print("Reused the saved verified session.")
+            return
+        print("Please solve the CAPTCHA manually.")
+        input("Press Enter after solving the CAPTCHA...")
+    save_session(driver)
@@ -0,0 +1,46 @@
+import os
+
+import yaml
+
+# config.yaml lives next to the brand scripts at the repository root
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.yaml')
+
+DEFAULTS = {
+    'cache_dir': 'jegs_cache',
+    'cache_max_mb': 2048,
+    'cache_ttl_hours': 24,
+    'captcha_timeout': 300,
+    'dead_letter_dir': 'jegs_dead_letters',
+    'element_wait_time': 30,
+    'fetch_batch_size': 16,
+    'lightweight_browser': True,
+    'link_queue_size': 500,
+    'max_pages': 100,
+    'max_request_delay': 30,
+    'metrics_dir': 'jegs_metrics',
+    'network_capture': False,
+    'output_format': 'jsonl',
+    'page_cache': True,
+    'pipeline_tabs': 4,
+    'rate_burst': 1,
+    'recycle_pages': 500,
+    'recycle_rss_mb': 1500,
+    'request_delay': 1.5,
+    'retry_attempts': 3,
+    'retry_backoff_seconds': 5,
+    'session_file': 'jegs_session.json',
+    'session_ttl_hours': 12,
+    'slow_response_seconds': 10,
+    'thread_workers': 1,
+}
+
+
+def load_config(path=CONFIG_PATH):
+    """Read config.yaml, falling back to DEFAULTS for missing keys."""
+    config = dict(DEFAULTS)
+    try:
+        with open(path, encoding='utf-8') as f:
+            config.update(yaml.safe_load(f) or {})
+    except FileNotFoundError:
+        print(f"Config file not found at {path}, using defaults.")
+    return config
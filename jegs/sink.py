@@ -0,0 +1,158 @@
+import glob
+import json
+import os
+import threading
+
+import pandas as pd
+
+from jegs.settings import load_config
+
+OUTPUT_DIR = 'jegs_output'
+CHUNK_ROWS = 20000
+
+
+class JsonlSink:
+    """Appends scraped rows to a JSON Lines file as they are produced."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, rows):
+        if not rows:
+            return
+        lines = ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ParquetSink:
+    """
+    Writes scraped rows as Parquet row groups.
+
+    Rows are buffered and flushed every `batch_rows` rows. Each flush is its
+    own file in the sink directory, because the columns change from brand
+    to brand and even between batches.
+    """
+
+    def __init__(self, path, batch_rows=5000):
+        import pyarrow  # noqa: F401  (optional dependency, fail early if missing)
+
+        self.path = path
+        self.batch_rows = batch_rows
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._parts = 0
+        os.makedirs(path, exist_ok=True)
+        for old_part in glob.glob(os.path.join(path, 'part-*.parquet')):
+            os.remove(old_part)
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+        columns = list(dict.fromkeys(key for row in self._buffer for key in row))
+        table = pa.table({
+            column: pa.array([row.get(column) for row in self._buffer], type=pa.string())
+            for column in columns
+        })
+        pq.write_table(table, os.path.join(self.path, f"part-{self._parts:05d}.parquet"))
+        self._parts += 1
+        self._buffer = []
+
+    def write(self, rows):
+        with self._lock:
+            self._buffer.extend(rows)
+            if len(self._buffer) >= self.batch_rows:
+                self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+
+
+def open_sink(script_path):
+    """
+    Open the row sink for a brand script under jegs_output/.
+
+    The format comes from output_format in config.yaml ('jsonl' or 'parquet').
+    """
+    run = os.path.splitext(os.path.basename(script_path))[0]
+    output_format = load_config()['output_format']
+    path = os.path.join(os.getcwd(), OUTPUT_DIR, run)
+    if output_format == 'parquet':
+        return ParquetSink(path)
+    return JsonlSink(f"{path}.jsonl")
+
+
+def iter_records(path, chunk_rows=CHUNK_ROWS):
+    """Yield the rows stored at path (JSONL file or Parquet directory) in chunks."""
+    if os.path.isdir(path):
+        import pyarrow.parquet as pq
+
+        for part in sorted(glob.glob(os.path.join(path, 'part-*.parquet'))):
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=chunk_rows):
+                yield [
+                    {key: value for key, value in row.items() if value is not None}
+                    for row in batch.to_pylist()
+                ]
+        return
+
+    chunk = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                chunk.append(json.loads(line))
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def collect_columns(path):
+    """Every column that appears in the stored rows, in first-seen order."""
+    columns = {}
+    for chunk in iter_records(path):
+        for row in chunk:
+            columns.update(dict.fromkeys(row))
+    return list(columns)
+
+
+def iter_processed(path, process_data, chunk_rows=CHUNK_ROWS):
+    """
+    Run a script's process_data over the stored rows one chunk at a time.
+
+    The final column order is worked out once by passing process_data a
+    single row holding every column, and each processed chunk is aligned to
+    it, so only one chunk is ever in memory. Every chunk carries all the
+    columns too, since a chunk may have no row with an optional field such
+    as Product Category.
+
+    Yields:
+        tuple: (final column list, processed DataFrame chunk)
+    """
+    all_columns = collect_columns(path)
+    if not all_columns:
+        raise ValueError("No part data to process")
+    columns = list(process_data([dict.fromkeys(all_columns, '')]).columns)
+
+    for chunk in iter_records(path, chunk_rows):
+        rows = pd.DataFrame(chunk, columns=all_columns).to_dict('records')
+        yield columns, process_data(rows).reindex(columns=columns)
+
+
+def read_processed(path, process_data, chunk_rows=CHUNK_ROWS):
+    """Processed DataFrame for the rows stored at path."""
+    frames = [frame for _, frame in iter_processed(path, process_data, chunk_rows)]
+    return pd.concat(frames, ignore_index=True)
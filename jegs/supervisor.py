@@ -0,0 +1,191 @@
+"""
+Keeps each pool worker's browser alive for the length of a run.
+
+A Chrome session can die mid-run ("no such window: target window already
+closed", "web view not found", "invalid session id"). Before this, every
+remaining part then failed inside the scraper's catch-all except. The
+DriverSupervisor notices a dead session and relaunches the browser (a new
+driver, verified like the first one). It also recycles Chrome every
+recycle_pages parts, or sooner once the browser's process tree grows past
+recycle_rss_mb, so long runs don't slow down as Chrome bloats.
+
+When a part runs into a bot check instead, the same browser is sent back
+to the brand page and verified again (jegs.session_store), which only
+needs the operator if the saved session no longer gets past it.
+"""
+import threading
+
+import psutil
+
+from jegs.browser import process_tree, unblock_resources
+from jegs.metrics import count
+from jegs.parser import ChallengeError, is_challenge_page
+from jegs.settings import load_config
+
+DEAD_SESSION_ERRORS = (
+    'no such window',
+    'target window already closed',
+    'web view not found',
+    'invalid session id',
+    'no such session',
+    'session deleted',
+    'chrome not reachable',
+    'disconnected: not connected to devtools',
+    'connection refused',
+    'max retries exceeded',
+)
+
+# Measuring RSS walks Chrome's process tree, so only do it every few parts
+RSS_CHECK_EVERY = 10
+
+# Verification may need the operator; one CAPTCHA prompt at a time
+_verify_lock = threading.Lock()
+
+
+def is_dead_session(error):
+    """True if error says the browser session is gone for good."""
+    message = str(error).lower()
+    return any(marker in message for marker in DEAD_SESSION_ERRORS)
+
+
+def is_alive(driver):
+    """Cheap round trip to the browser; False only for a dead session."""
+    try:
+        driver.execute_script('return 1;')
+    except Exception as e:
+        return not is_dead_session(e)
+    return True
+
+
+def browser_rss_mb(driver):
+    """Resident memory of the driver's chromedriver/Chrome process tree, in MB."""
+    rss = 0
+    for process in process_tree(driver):
+        try:
+            rss += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return rss / 1024 ** 2
+
+
+def start_driver(setup_driver, wait_for_captcha, website, cleanup=None):
+    """
+    Set up a driver, open the brand page on it and verify it.
+
+    Returns:
+        The verified driver; on failure it is cleaned up and the error raised
+    """
+    driver = None
+    try:
+        with _verify_lock:
+            driver = setup_driver()
+            driver.get(website)
+            wait_for_captcha(driver)
+        return driver
+    except Exception:
+        if driver is not None and cleanup is not None:
+            cleanup(driver)
+        raise
+
+
+class DriverSupervisor:
+    """
+    One pool worker's driver, restarted when it dies and recycled as it ages.
+
+    Args:
+        name (str): Worker name used in progress messages
+        driver: The verified driver the worker starts with
+        setup_driver, wait_for_captcha, cleanup: The script's driver helpers
+        website (str): Brand page a replacement driver is verified on
+        on_replace: Optional callback(old_driver, new_driver), so whoever
+            owns the drivers can keep track of replacements
+    """
+
+    def __init__(self, name, driver, setup_driver, wait_for_captcha, cleanup, website,
+                 on_replace=None):
+        config = load_config()
+        self.name = name
+        self.driver = driver
+        self.setup_driver = setup_driver
+        self.wait_for_captcha = wait_for_captcha
+        self.cleanup = cleanup
+        self.website = website
+        self.on_replace = on_replace
+        self.recycle_pages = int(config['recycle_pages'])
+        self.recycle_rss_mb = float(config['recycle_rss_mb'])
+        self.pages = 0
+
+    def alive(self):
+        return is_alive(self.driver)
+
+    def challenged(self, error=None):
+        """True if the last part ran into a bot check rather than a real error."""
+        if isinstance(error, ChallengeError):
+            return True
+        try:
+            return is_challenge_page(self.driver.page_source)
+        except Exception:
+            return False
+
+    def reverify(self):
+        """
+        Take the browser back through verification after a bot check.
+
+        Returns:
+            bool: False if it could not be verified or replaced
+        """
+        print(f"[{self.name}] Bot check detected, verifying the browser again...")
+        try:
+            with _verify_lock:
+                if getattr(self.driver, 'lightweight', False):
+                    unblock_resources(self.driver)
+                self.driver.get(self.website)
+                self.wait_for_captcha(self.driver)
+        except Exception as e:
+            if is_dead_session(e):
+                return self.restart('browser session died')
+            print(f"[{self.name}] Could not verify browser: {e}")
+            return False
+        # The HTTP session copied the old cookies; rebuild it on next use
+        self.driver.http_session = None
+        count('reverifications')
+        return True
+
+    def restart(self, reason):
+        """
+        Replace the driver with a freshly verified one.
+
+        Returns:
+            bool: False if no replacement could be started
+        """
+        print(f"[{self.name}] Restarting browser: {reason}")
+        old_driver = self.driver
+        self.cleanup(old_driver)
+        try:
+            new_driver = start_driver(self.setup_driver, self.wait_for_captcha, self.website, self.cleanup)
+        except Exception as e:
+            print(f"[{self.name}] Could not restart browser: {e}")
+            return False
+        self.driver = new_driver
+        self.pages = 0
+        count('browser_restarts')
+        if self.on_replace is not None:
+            self.on_replace(old_driver, new_driver)
+        return True
+
+    def page_done(self, parts=1):
+        """
+        Count finished parts and recycle the browser if it is due.
+
+        Returns:
+            bool: False if the browser was due but could not be replaced
+        """
+        checked = self.pages // RSS_CHECK_EVERY
+        self.pages += parts
+        if self.recycle_pages and self.pages >= self.recycle_pages:
+            return self.restart(f"recycling after {self.pages} pages")
+        if self.recycle_rss_mb and self.pages // RSS_CHECK_EVERY > checked:
+            rss_mb = browser_rss_mb(self.driver)
+            if rss_mb > self.recycle_rss_mb:
+                return self.restart(f"recycling at {rss_mb:.0f} MB")
+        return True
@@ -0,0 +1,173 @@
+"""
+Pipelined product pages: several tabs in one browser instead of several browsers.
+
+With a single tab the browser sits idle while a part is extracted, and
+Python sits idle while the next page loads. scrape_individual keeps
+pipeline_tabs tabs (window handles) open in the worker's browser: while it
+extracts the part in one tab, the next parts are already loading in the
+others, and each tab is sent on to a new part as soon as it has been read.
+Navigation is started with window.location from a script, which returns at
+once, where driver.get() would block until the page has loaded.
+
+The tabs share the browser's cookies, so one verification covers them all,
+and a tab costs a renderer process rather than a whole Chrome.
+"""
+import time
+from collections import deque
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from jegs.browser import block_resources
+from jegs.cache import get_cache
+from jegs.extract import PAGE_LOAD_WAIT_TIME, extract_product_details
+from jegs.metrics import stage
+from jegs.parser import ChallengeError, is_challenge_page, parse_product_html
+from jegs.ratelimit import get_limiter
+from jegs.retry import record_failure
+from jegs.settings import load_config
+from jegs.waits import present, wait_for
+
+# Marks the document the tab is leaving, so a wait can't match the old page
+NAVIGATE_SCRIPT = """
+document.documentElement.setAttribute('data-jegs-stale', '');
+window.location.href = arguments[0];
+"""
+
+FRESH_PRODUCT_PAGE = 'html:not([data-jegs-stale]) #tab-item-specification'
+
+# Seconds from the request to the end of the response, from Navigation Timing
+RESPONSE_TIME_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav ? (nav.responseEnd - nav.startTime) / 1000 : null;
+"""
+
+
+def tab_count():
+    return max(1, int(load_config()['pipeline_tabs']))
+
+
+def open_tabs(driver, count):
+    """
+    count tabs of driver to load parts in, the current (verified) tab first.
+
+    New tabs are opened as needed; the handles are kept on the driver so
+    later batches reuse them.
+    """
+    tabs = getattr(driver, 'pipeline_tabs', None) or [driver.current_window_handle]
+    while len(tabs) < count:
+        driver.switch_to.new_window('tab')
+        # DevTools blocking is set per tab
+        if getattr(driver, 'lightweight', False):
+            block_resources(driver)
+        tabs.append(driver.current_window_handle)
+    driver.pipeline_tabs = tabs
+    return tabs[:count]
+
+
+def start_loading(driver, tab, part_link, limiter):
+    """Point tab at part_link and return without waiting for the page."""
+    limiter.acquire()
+    driver.switch_to.window(tab)
+    driver.execute_script(NAVIGATE_SCRIPT, part_link)
+
+
+def wait_for_product(driver, timeout=PAGE_LOAD_WAIT_TIME):
+    """Wait for the product page loading in the current tab, not the one it left."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return wait_for(driver, [present(FRESH_PRODUCT_PAGE)],
+                            max(deadline - time.monotonic(), 1), name='product page')
+        except JavascriptException as e:
+            # The old page unloaded under the wait; wait again on the new one
+            if 'unload' not in str(e).lower() or time.monotonic() >= deadline:
+                raise
+
+
+def _read_product(driver, tab, part_link, limiter, cache):
+    driver.switch_to.window(tab)
+    try:
+        with stage('navigation'):
+            wait_for_product(driver)
+    except TimeoutException:
+        limiter.report(ok=False)
+        if is_challenge_page(driver.page_source):
+            raise ChallengeError(f"Loading {part_link} hit a bot check")
+        raise
+    limiter.report(seconds=driver.execute_script(RESPONSE_TIME_SCRIPT))
+
+    with stage('extraction'):
+        if cache:
+            part_detail, page_html = extract_product_details(driver, with_html=True)
+            cache.put(part_link, page_html)
+        else:
+            part_detail = extract_product_details(driver)
+    return part_detail
+
+
+def scrape_individual(driver, part_links):
+    """
+    {part_link: [part_detail]} for a batch, loaded in pipeline_tabs tabs of driver.
+
+    A part that fails is left out and its error recorded with jegs.retry.
+    After a bot check the rest of the batch is handed back too, since every
+    tab shares the challenged session.
+    """
+    cache = get_cache()
+    limiter = get_limiter()
+    result = {}
+    waiting = deque()
+    for part_link in part_links:
+        cached_html = cache.get(part_link) if cache else None
+        if cached_html is None:
+            waiting.append(part_link)
+        else:
+            part_detail = parse_product_html(cached_html)
+            result[part_link] = [part_detail] if part_detail else []
+    if not waiting:
+        return result
+
+    print(f"Loading {len(waiting)} parts in {min(tab_count(), len(waiting))} tabs")
+    tabs = open_tabs(driver, min(tab_count(), len(waiting)))
+    loading = deque()
+
+    def load_next(tab):
+        while waiting:
+            part_link = waiting.popleft()
+            try:
+                start_loading(driver, tab, part_link, limiter)
+            except Exception as e:
+                print(f"Error loading part ({part_link}): {str(e)}")
+                record_failure(part_link, e)
+                continue
+            loading.append((tab, part_link))
+            return
+
+    try:
+        for tab in tabs:
+            load_next(tab)
+
+        while loading:
+            tab, part_link = loading.popleft()
+            try:
+                part_detail = _read_product(driver, tab, part_link, limiter, cache)
+            except ChallengeError as e:
+                # Let the pool verify the browser again and retry the batch's rest
+                print(str(e))
+                for link in [part_link] + [link for _, link in loading] + list(waiting):
+                    record_failure(link, e)
+                break
+            except Exception as e:
+                print(f"Error processing part ({part_link}): {str(e)}")
+                record_failure(part_link, e)
+            else:
+                result[part_link] = [part_detail] if part_detail else []
+            load_next(tab)
+    finally:
+        # Leave the driver on its verified tab for the pool and the next brand
+        try:
+            driver.switch_to.window(tabs[0])
+        except Exception as e:
+            print(f"Could not switch back to the first tab: {e}")
+
+    return result
@@ -0,0 +1,159 @@
+"""
+Waits that return as soon as the page is ready instead of sleeping.
+
+wait_for() runs one async script that checks its conditions straight away
+and then again after every DOM mutation (MutationObserver), so it resolves
+on the mutation that makes a condition true rather than on a polling tick
+or a fixed sleep. Every wait's real duration is recorded in WAIT_STATS.
+
+Pacing requests to be polite to the site is not a wait; jegs.ratelimit
+does that, from request_delay in config.yaml.
+"""
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+from jegs.metrics import METRICS
+
+ELEMENT_WAIT_TIME = 30
+
+# arguments: conditions, timeout in ms, callback. Resolves with the index of
+# the first condition that holds, or -1 on timeout. A condition is
+#   {selector}                 an element matches
+#   {selector, text}           a matching element's text contains text
+#   {selector, changed_from}   the matches' joined text differs from a snapshot
+WAIT_SCRIPT = r"""
+const conditions = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+
+const joined = (nodes) => nodes.map((el) => el.textContent || '').join('\n');
+const holds = (c) => {
+    const nodes = Array.from(document.querySelectorAll(c.selector));
+    if (!nodes.length) return false;
+    if (c.text !== undefined) return nodes.some((el) => (el.textContent || '').includes(c.text));
+    if (c.changed_from !== undefined) return joined(nodes) !== c.changed_from;
+    return true;
+};
+const check = () => conditions.findIndex(holds);
+
+let matched = check();
+if (matched >= 0) {
+    done(matched);
+} else {
+    let scheduled = false;
+    let finished = false;
+    const finish = (result) => {
+        if (finished) return;
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        done(result);
+    };
+    // Mutations arrive in bursts; check once per burst (microtasks are not
+    // throttled in background tabs the way timers are)
+    const observer = new MutationObserver(() => {
+        if (scheduled) return;
+        scheduled = true;
+        Promise.resolve().then(() => {
+            scheduled = false;
+            matched = check();
+            if (matched >= 0) finish(matched);
+        });
+    });
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, characterData: true, attributes: true,
+    });
+    const timer = setTimeout(() => finish(-1), timeoutMs);
+}
+"""
+
+SNAPSHOT_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]))
+    .map((el) => el.textContent || '').join('\\n');
+"""
+
+
+class WaitStats:
+    """Thread-safe record of how long each named wait actually took."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = {}
+
+    def record(self, name, seconds, timed_out=False):
+        with self._lock:
+            entry = self._waits.setdefault(name, {'count': 0, 'timeouts': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1
+            entry['timeouts'] += int(timed_out)
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+
+    def summary(self):
+        """{name: {count, timeouts, mean, max}} with times in seconds."""
+        with self._lock:
+            return {
+                name: {
+                    'count': entry['count'],
+                    'timeouts': entry['timeouts'],
+                    'mean': entry['total'] / entry['count'],
+                    'max': entry['max'],
+                }
+                for name, entry in self._waits.items()
+            }
+
+    def report(self):
+        for name, entry in sorted(self.summary().items()):
+            print(f"Wait '{name}': {entry['count']} waits, mean {entry['mean']:.2f}s, "
+                  f"max {entry['max']:.2f}s, {entry['timeouts']} timeouts")
+
+
+WAIT_STATS = WaitStats()
+
+
+def present(selector):
+    """Condition: an element matches selector."""
+    return {'selector': selector}
+
+
+def contains(selector, text):
+    """Condition: an element matching selector contains text."""
+    return {'selector': selector, 'text': text}
+
+
+def changed(selector, before):
+    """Condition: the text of the elements matching selector is no longer `before`."""
+    return {'selector': selector, 'changed_from': before}
+
+
+def snapshot(driver, selector):
+    """Joined text of the elements matching selector, for a later changed() condition."""
+    return driver.execute_script(SNAPSHOT_SCRIPT, selector) or ''
+
+
+def wait_for(driver, conditions, timeout=ELEMENT_WAIT_TIME, name='wait'):
+    """
+    Block until one of the conditions holds in the current page.
+
+    Args:
+        driver: Selenium driver
+        conditions (list): Conditions built with present(), contains(), changed()
+        timeout (float): Seconds before giving up
+        name (str): Label the duration is recorded under in WAIT_STATS
+
+    Returns:
+        int: Index of the condition that matched
+
+    Raises:
+        TimeoutException: If no condition held within timeout
+    """
+    driver.set_script_timeout(timeout + 5)
+    started = time.monotonic()
+    matched = driver.execute_async_script(WAIT_SCRIPT, list(conditions), int(timeout * 1000))
+    elapsed = time.monotonic() - started
+    WAIT_STATS.record(name, elapsed, timed_out=matched < 0)
+    METRICS.observe(f"wait:{name}", elapsed)
+    if matched < 0:
+        raise TimeoutException(f"'{name}' did not happen within {timeout}s")
+    return matched
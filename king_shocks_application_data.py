@@ -4,20 +4,26 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
-import time
 import os
-import shutil
 import tempfile
 import pandas as pd
-import xlwings as xw
 from datetime import datetime
 from fake_useragent import UserAgent
 import logging
 
-import time
-import psutil
-import shutil
-import os
+from jegs import discovery
+from jegs.browser import PAGE_LOAD_STRATEGY, block_resources, cleanup, lightweight_enabled
+from jegs.checkpoint import open_checkpoint
+from jegs.excel import write_workbook
+from jegs.fitment import FITMENT_ROWS, capture_fitment_rows, wait_for_fitment
+from jegs.metrics import stage, timed, write_metrics
+from jegs.netlog import LOGGING_PREFS, network_capture_enabled
+from jegs.pool import scrape_with_pool
+from jegs.ratelimit import get_limiter
+from jegs.retry import record_failure
+from jegs.session_store import saved_user_agent, verify_session
+from jegs.sink import iter_processed, open_sink
+from jegs.waits import snapshot
 
 
 # Constants
@@ -26,6 +32,10 @@ CAPTCHA_WAIT_TIME = 500
 ELEMENT_WAIT_TIME = 30
 PAGE_LOAD_WAIT_TIME = 30
 MAX_PAGES = 500 # Change to 100 if you scrape all
+# 'page' reads the page count once and fetches listing pages concurrently
+# inside the browser, 'http' does the same over a requests session,
+# 'serial' walks the pages one by one with scrape_part_links below
+DISCOVERY_MODE = 'page'
 
 # Add logging configuration
 logging.basicConfig(
@@ -43,7 +53,7 @@ def setup_driver():
         # Create a temporary directory for user data
         user_data_dir = tempfile.mkdtemp()
         
-        user_agent = UserAgent().random
+        user_agent = saved_user_agent() or UserAgent().random
         options = uc.ChromeOptions()
         options.add_argument(f'user-agent={user_agent}')
         options.add_argument("--ignore-certificate-errors")
@@ -54,11 +64,19 @@ def setup_driver():
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument(f'--user-data-dir={user_data_dir}')
+        lightweight = lightweight_enabled()
+        if lightweight:
+            options.page_load_strategy = PAGE_LOAD_STRATEGY
+        network_capture = network_capture_enabled()
+        if network_capture:
+            options.set_capability('goog:loggingPrefs', LOGGING_PREFS)
         
         driver = uc.Chrome(options=options)
         
         # Attach the temp directory path to the driver for later cleanup
         driver.user_data_dir = user_data_dir
+        driver.lightweight = lightweight
+        driver.network_capture = network_capture
 
         # Set page load timeout
         driver.set_page_load_timeout(30)
@@ -71,8 +89,10 @@ def setup_driver():
 
 
 def wait_for_captcha(driver):
-    print("Please solve the CAPTCHA manually.")
-    input("Press Enter after solving the CAPTCHA...")  # Better than fixed time sleep
+    # Prompts only if a challenge is showing and the saved session fails
+    verify_session(driver)
+    if driver.lightweight:
+        block_resources(driver)
 
 
 def navigate_to_individual_parts(driver):
@@ -88,8 +108,7 @@ def navigate_to_individual_parts(driver):
                 EC.element_to_be_clickable(locator)
             )
             
-            element.click()
-            time.sleep(2)
+            driver.get(element.get_attribute('href'))
             return
         except Exception as e:
             print(f"Failed with locator {locator}: {e}")
@@ -140,10 +159,10 @@ def scrape_part_links(driver):
                     By.CSS_SELECTOR, f'a[href*="pageNumber={page_number + 1}"]'
                 )
 
-                # Click the link to navigate to the next page
-                driver.execute_script("arguments[0].click();", next_page_link)
+                # Load the next page; the container wait above tells us when it is ready
+                get_limiter().acquire()
+                driver.get(next_page_link.get_attribute('href'))
                 page_number += 1
-                time.sleep(2)  # Allow page transition
 
             except (NoSuchElementException, TimeoutException):
                 print("No more pages to scrape or 'Next' link not found.")
@@ -295,6 +314,7 @@ def scrape_part_details(driver, part_links):
     for index, part_link in enumerate(part_links, 1):
         try:
             print(f"Processing part {index}/{total_links}: {part_link}")
+            get_limiter().acquire()
             driver.get(part_link)
             
             # Extract the part number from the part_link
@@ -315,8 +335,14 @@ def scrape_part_details(driver, part_links):
                 vehicle_fitment_tab = WebDriverWait(driver, 10).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, 'a.tab-label[onclick*="ajaxLoadFirstProductFitment"]'))
                 )
+                if driver.network_capture:
+                    # Parse each page's fragment from the network log instead of the DOM
+                    fitment_rows = capture_fitment_rows(driver, vehicle_fitment_tab, part_number)
+                    part_data.extend(fitment_rows)
+                    print(f"Scraped {len(fitment_rows)} fitment rows for part {index}")
+                    continue
                 vehicle_fitment_tab.click()
-                time.sleep(2)  # Allow time for the fitment data to load
+                wait_for_fitment(driver)
             except NoSuchElementException:
                 print("Vehicle Fitment tab not found.")
                 continue
@@ -371,9 +397,10 @@ def scrape_part_details(driver, part_links):
                     try:
                         next_page_link = driver.find_element(By.CSS_SELECTOR, f'a[onclick*="pageNumber={page_number + 1}"]')
                         if next_page_link:
+                            before = snapshot(driver, FITMENT_ROWS)
                             driver.execute_script("arguments[0].click();", next_page_link)
                             page_number += 1
-                            time.sleep(2)  # Allow page transition
+                            wait_for_fitment(driver, before)
                         else:
                             print("Next page link not found. Ending pagination.")
                             break  # Exit pagination loop
@@ -387,6 +414,7 @@ def scrape_part_details(driver, part_links):
         
         except Exception as e:
             print(f"Error processing part {index} ({part_link}): {str(e)}")
+            record_failure(part_link, e)
             continue
     
     return part_data
@@ -431,30 +459,8 @@ def save_to_excel(df):
         desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
         file_path = os.path.join(desktop_path, output_file_name)
         
-        # Save with pandas first
-        df.to_excel(file_path, index=False, freeze_panes=(1, 0))
-        
-        # Format with xlwings
-        with xw.App(visible=False) as app:
-            wb = xw.Book(file_path)
-            ws = wb.sheets[0]
-            
-            # Format header
-            header_range = ws.range('1:1')
-            header_range.color = (200, 200, 200)
-            header_range.api.Font.Bold = True
-            
-            # Autofit columns
-            ws.autofit('c')
-            
-            # Set minimum and maximum column widths
-            for column in ws.api.UsedRange.Columns:
-                if column.ColumnWidth < 8:
-                    column.ColumnWidth = 8
-                elif column.ColumnWidth > 50:
-                    column.ColumnWidth = 50
-            wb.save()
-            wb.close()
+        # Header formatting and column widths are written in the same pass
+        write_workbook(file_path, df)
         
         print(f'Data successfully saved to: {file_path}')
         
@@ -463,44 +469,12 @@ def save_to_excel(df):
         raise
 
 
-def cleanup(driver):
-    """Helper function to handle driver cleanup and temp data directory deletion."""
-    try:
-        # Attempt to close all windows
-        for _ in range(5):
-            try:
-                driver.quit()
-                
-                # Wait a bit before cleanup to ensure all processes are closed
-                time.sleep(2)
-
-                # Forcefully close any remaining chrome processes
-                for proc in psutil.process_iter(attrs=['pid', 'name']):
-                    if 'chrome' in proc.info['name'].lower():
-                        proc.kill()
-
-                # Remove temporary user data directory
-                if hasattr(driver, 'user_data_dir') and os.path.exists(driver.user_data_dir):
-                    shutil.rmtree(driver.user_data_dir, ignore_errors=False)
-                
-                # Short sleep to allow proper cleanup
-                time.sleep(0.1)
-                break
-            except FileNotFoundError:
-                break
-            except (RuntimeError, OSError, PermissionError) as e:
-                print(f"Cleanup error: {e}")
-                # Wait a bit before retrying
-                time.sleep(0.1)
-    except Exception as close_error:
-        print(f"Error during driver closure: {close_error}")
-
-
-
 def main():
     driver = None
+    checkpoint = None
     try:
         print("Starting scraping process...")
+        checkpoint = open_checkpoint(__file__)
         driver = setup_driver()
         driver.get(WEBSITE)
         
@@ -509,20 +483,44 @@ def main():
         navigate_to_individual_parts(driver)
         
         print("Collecting part links...")
-        part_links = scrape_part_links(driver)
+        part_links = checkpoint.load_links()
+        if not part_links:
+            discover = {
+                'page': discovery.scrape_part_links,
+                'http': discovery.scrape_part_links_http,
+            }.get(DISCOVERY_MODE)
+            with stage('scrape_part_links'):
+                part_links = discover(driver, WEBSITE, MAX_PAGES) if discover else scrape_part_links(driver)
+            checkpoint.save_links(part_links)
         print(f"Scraping details for {len(part_links)} parts...")
-        part_data = scrape_part_details(driver, part_links)
+        sink = open_sink(__file__)
+        try:
+            scrape_with_pool(
+                driver, part_links, scrape_part_details,
+                setup_driver=setup_driver,
+                wait_for_captcha=wait_for_captcha,
+                cleanup=cleanup,
+                website=WEBSITE,
+                checkpoint=checkpoint,
+                sink=sink,
+            )
+        finally:
+            sink.close()
         
         print("Processing part data...")
-        df = process_data(part_data)
+        chunks = iter_processed(sink.path, timed('process_data', process_data))
         
         print("Saving data to Excel...")
-        save_to_excel(df)
+        with stage('save_to_excel'):
+            save_to_excel(chunks)
+        write_metrics(__file__)
         
     except Exception as e:
         print(f"An error occurred: {e}")
     
     finally:
+        if checkpoint:
+            checkpoint.close()
         if driver:
             cleanup(driver)
 
@@ -1,31 +1,8 @@
 import pandas as pd
 import glob
 import os
-import xlwings as xw
 
-def format_excel_file(file_path):
-    """Formats an Excel file using xlwings."""
-    with xw.App(visible=False) as app:
-        wb = xw.Book(file_path)
-        ws = wb.sheets[0]
-        
-        # Format header
-        header_range = ws.range('1:1')
-        header_range.color = (200, 200, 200)
-        header_range.api.Font.Bold = True
-        
-        # Autofit columns
-        ws.autofit('c')
-        
-        # Set minimum and maximum column widths
-        for column in ws.api.UsedRange.Columns:
-            if column.ColumnWidth < 8:
-                column.ColumnWidth = 8
-            elif column.ColumnWidth > 50:
-                column.ColumnWidth = 50
-        
-        wb.save()
-        wb.close()
+from jegs.excel import write_workbook
 
 def merge_excel_files(input_folder, output_file_name):
     """Merges multiple Excel files and writes to a new file."""
@@ -55,10 +32,7 @@ def merge_excel_files(input_folder, output_file_name):
 
     # Define the output file path
     file_path = os.path.join(os.path.expanduser("~"), "Desktop", output_file_name)
-    merged_df.to_excel(file_path, index=False, freeze_panes=(1, 0))
-
-    # Format the output file
-    format_excel_file(file_path)
+    write_workbook(file_path, merged_df)
 
     print(f"Data successfully saved to: {file_path}")
 
@@ -0,0 +1,17 @@
+import pytest
+
+from jegs import pool, retry, settings, supervisor
+
+
+@pytest.fixture
+def config(monkeypatch, tmp_path):
+    """Run with DEFAULTS plus the given overrides in place of config.yaml."""
+    monkeypatch.chdir(tmp_path)
+
+    def override(**values):
+        def load_config(path=None):
+            return dict(settings.DEFAULTS, **values)
+        for module in (pool, retry, supervisor):
+            monkeypatch.setattr(module, 'load_config', load_config)
+    override()
+    return override
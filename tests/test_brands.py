@@ -0,0 +1,55 @@
+import glob
+import os
+import re
+
+import pytest
+
+from jegs.brands import APPLICATION, BRANDS, COMBINED, INDIVIDUAL, brand_modes, brand_url, get_brand
+from jegs.settings import DEFAULTS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def script_caps():
+    """{(jegs.com name, vendor code): highest MAX_PAGES} from the brand scripts."""
+    caps = {}
+    for path in glob.glob(os.path.join(ROOT, '*.py')):
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        cap = re.search(r'^MAX_PAGES\s*=\s*(\d+)', source, re.MULTILINE)
+        brand = re.search(r'jegs\.com/v/([^/]+)/(\d+)', source)
+        if cap and brand:
+            caps[brand.groups()] = max(caps.get(brand.groups(), 0), int(cap.group(1)))
+    return caps
+
+
+def test_brands_keep_their_scripts_page_caps():
+    caps = script_caps()
+    assert caps
+    for slug, brand in BRANDS.items():
+        old_cap = caps.get((brand['name'], brand['code']), 0)
+        if old_cap > DEFAULTS['max_pages']:
+            assert 'max_pages' in brand, f"{slug} needs max_pages >= {old_cap}"
+        assert brand.get('max_pages', DEFAULTS['max_pages']) >= old_cap, slug
+
+
+def test_every_script_brand_is_registered():
+    registered = {(brand['name'], brand['code']) for brand in BRANDS.values()}
+    assert set(script_caps()) <= registered
+
+
+def test_get_brand():
+    assert get_brand('Warn') is BRANDS['warn']
+    with pytest.raises(Exception, match='Unknown brand'):
+        get_brand('nope')
+
+
+def test_brand_url():
+    assert brand_url(BRANDS['warn']).startswith('https://www.jegs.com/v/Warn/940?')
+
+
+def test_brand_modes():
+    assert brand_modes(BRANDS['warn'], COMBINED) == [INDIVIDUAL, APPLICATION]
+    assert brand_modes(BRANDS['warn'], APPLICATION) == [APPLICATION]
+    with pytest.raises(Exception, match='no application workbook'):
+        brand_modes(BRANDS['acc_performance'], APPLICATION)
@@ -0,0 +1,115 @@
+import os
+import time
+
+import pytest
+
+from jegs import cache as cache_module
+from jegs.cache import PageCache, cached_fetcher, canonical_url, replay_fetcher, replay_links
+from jegs.checkpoint import Checkpoint
+from jegs.extract import replay_part_details
+from jegs.fakesite import FakeSite
+
+PRODUCT = 'https://www.jegs.com/i/Warn/940/{sku}/10002/-1'
+
+
+@pytest.fixture
+def page_cache(tmp_path):
+    return PageCache(str(tmp_path / 'cache'), ttl=3600)
+
+
+@pytest.fixture
+def shared_cache(monkeypatch, page_cache):
+    monkeypatch.setattr(cache_module, '_shared_cache', page_cache)
+    monkeypatch.setattr(cache_module, '_shared_cache_loaded', True)
+    return page_cache
+
+
+def test_canonical_url():
+    assert canonical_url('HTTPS://WWW.Jegs.com/i/Warn/940/1/?b=2&a=1#top') == 'https://www.jegs.com/i/Warn/940/1?a=1&b=2'
+
+
+def test_equivalent_urls_share_an_entry(page_cache):
+    page_cache.put('https://www.jegs.com/i/Warn/940/1/?b=2&a=1', '<html>1</html>')
+    assert page_cache.get('https://WWW.jegs.com/i/Warn/940/1?a=1&b=2') == '<html>1</html>'
+    assert page_cache.get('https://www.jegs.com/i/Warn/940/2') is None
+
+
+def test_expired_entries_are_misses_except_for_replay(page_cache):
+    url = PRODUCT.format(sku=1)
+    page_cache.put(url, '<html>old</html>')
+    old = time.time() - 7200
+    os.utime(page_cache._path(url), (old, old))
+
+    assert page_cache.get(url) is None
+    assert page_cache.get(url, max_age=None) == '<html>old</html>'
+
+
+def test_oldest_entries_are_evicted(tmp_path):
+    page_cache = PageCache(str(tmp_path / 'cache'), max_bytes=2000)
+    for sku in range(20):
+        page_cache.put(PRODUCT.format(sku=sku), os.urandom(300).hex())
+        path = page_cache._path(PRODUCT.format(sku=sku))
+        os.utime(path, (sku, sku))
+
+    assert page_cache._size <= 2000
+    assert page_cache.get(PRODUCT.format(sku=19), max_age=None) is not None
+    assert page_cache.get(PRODUCT.format(sku=0), max_age=None) is None
+
+
+def test_urls_by_prefix(page_cache):
+    page_cache.put(PRODUCT.format(sku=1), 'a')
+    page_cache.put('https://www.jegs.com/i/Bestop/025/2/10002/-1', 'b')
+    assert page_cache.urls('/i/Warn/940/') == [PRODUCT.format(sku=1)]
+
+
+def test_cached_fetcher_only_fetches_misses(page_cache):
+    fetched = []
+
+    def fetch(urls):
+        fetched.extend(urls)
+        return [f'<html>{url}</html>' for url in urls]
+
+    page_cache.put(PRODUCT.format(sku=1), '<html>cached</html>')
+    fetch_cached = cached_fetcher(fetch, page_cache)
+    urls = [PRODUCT.format(sku=1), PRODUCT.format(sku=2)]
+
+    assert fetch_cached(urls) == ['<html>cached</html>', f'<html>{urls[1]}</html>']
+    assert fetch_cached(urls)[1] == f'<html>{urls[1]}</html>'
+    assert fetched == [urls[1]]
+
+
+def test_cached_fetcher_without_a_cache():
+    fetch = lambda urls: urls
+    assert cached_fetcher(fetch, None) is fetch
+
+
+def test_replay_fetcher_never_fetches(page_cache):
+    page_cache.put(PRODUCT.format(sku=1), 'a')
+    fetch = replay_fetcher(page_cache)
+    assert fetch([PRODUCT.format(sku=1)]) == ['a']
+    with pytest.raises(Exception, match='not in cache'):
+        fetch([PRODUCT.format(sku=2)])
+
+
+def test_replay_links(shared_cache, tmp_path):
+    shared_cache.put(PRODUCT.format(sku=2), 'product')
+    shared_cache.put(PRODUCT.format(sku=1), 'product')
+    shared_cache.put(PRODUCT.format(sku=1) + '?pageNumber=2', 'fitment fragment')
+    checkpoint = Checkpoint('replay', path=str(tmp_path / 'checkpoint.sqlite3'))
+
+    # Every cached product page, without the fitment fragments
+    assert replay_links(checkpoint, '/i/Warn/940/') == [PRODUCT.format(sku=1), PRODUCT.format(sku=2)]
+
+    checkpoint.save_links([PRODUCT.format(sku=2)])
+    assert replay_links(checkpoint, '/i/Warn/940/') == [PRODUCT.format(sku=2)]
+    checkpoint.close()
+
+
+def test_replay_part_details(shared_cache):
+    site = FakeSite(page_kb=0)
+    for sku in (100000, 100001):
+        shared_cache.put(PRODUCT.format(sku=sku), site.product('Warn', '940', sku))
+
+    part_data = replay_part_details([PRODUCT.format(sku=sku) for sku in (100000, 100001, 100002)])
+
+    assert [part['Part Number'] for part in part_data] == ['940-100000', '940-100001']
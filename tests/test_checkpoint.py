@@ -0,0 +1,82 @@
+import pytest
+
+from jegs.checkpoint import Checkpoint, open_checkpoint
+
+LINKS = [f'https://www.jegs.com/i/Warn/940/{sku}/10002/-1' for sku in (100002, 100000, 100001)]
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    checkpoint = Checkpoint('warn', str(tmp_path / 'checkpoint.sqlite3'))
+    yield checkpoint
+    checkpoint.close()
+
+
+def test_links_keep_discovery_order(checkpoint):
+    checkpoint.save_links(LINKS)
+    checkpoint.save_links(LINKS)
+
+    assert checkpoint.load_links() == LINKS
+
+
+def test_records_follow_link_order(checkpoint):
+    checkpoint.mark_done(LINKS[2], [{'Part Number': 'c'}])
+    checkpoint.mark_done(LINKS[0], [{'Part Number': 'a1'}, {'Part Number': 'a2'}])
+
+    assert checkpoint.completed() == {LINKS[0], LINKS[2]}
+    assert checkpoint.records(LINKS) == [{'Part Number': 'a1'}, {'Part Number': 'a2'}, {'Part Number': 'c'}]
+    assert list(checkpoint.iter_records(LINKS)) == [
+        [{'Part Number': 'a1'}, {'Part Number': 'a2'}],
+        [{'Part Number': 'c'}],
+    ]
+
+
+def test_failures_and_dead_letters(checkpoint):
+    checkpoint.mark_failed(LINKS[0], 1, TimeoutError('slow page'), retry_at=123.0)
+    checkpoint.mark_failed(LINKS[1], 3, ValueError('no product_id'))
+
+    failures = checkpoint.failures()
+    assert [failure['url'] for failure in failures] == LINKS[:2]
+    assert failures[0]['error_class'] == 'TimeoutError'
+    assert failures[0]['retry_at'] == 123.0
+
+    dead = checkpoint.failures(dead=True)
+    assert [(failure['url'], failure['attempts'], failure['error']) for failure in dead] == [
+        (LINKS[1], 3, 'no product_id'),
+    ]
+
+    # Finishing a part clears its failure
+    checkpoint.mark_done(LINKS[0], [])
+    assert [failure['url'] for failure in checkpoint.failures()] == [LINKS[1]]
+
+
+def test_reset_only_clears_its_run(checkpoint):
+    other = Checkpoint('bilstein', checkpoint.path)
+    for run in (checkpoint, other):
+        run.save_links(LINKS)
+        run.mark_done(LINKS[0], [{}])
+        run.mark_failed(LINKS[1], 1, RuntimeError('boom'))
+
+    checkpoint.reset()
+
+    assert checkpoint.load_links() == []
+    assert checkpoint.completed() == set()
+    assert checkpoint.failures() == []
+    assert other.load_links() == LINKS
+    assert other.completed() == {LINKS[0]}
+    other.close()
+
+
+@pytest.mark.parametrize('argv, kept', [([], False), (['--resume'], True), (['--replay'], True)])
+def test_open_checkpoint(config, argv, kept):
+    previous = open_checkpoint('/scripts/warn_individual_parts.py', [])
+    previous.save_links(LINKS)
+    previous.mark_done(LINKS[0], [{'Part Number': 'a'}])
+    previous.close()
+
+    checkpoint = open_checkpoint('/scripts/warn_individual_parts.py', argv)
+
+    assert checkpoint.run == 'warn_individual_parts'
+    assert checkpoint.load_links() == (LINKS if kept else [])
+    assert checkpoint.completed() == ({LINKS[0]} if kept else set())
+    checkpoint.close()
@@ -0,0 +1,89 @@
+from urllib.parse import parse_qsl, urlsplit
+
+from jegs.discovery import discover_part_links, href_prefix, iter_part_links, listing_url
+from jegs.fakesite import FIRST_SKU, FakeSite, brand_website
+
+WEBSITE = brand_website('https://www.jegs.com')
+
+
+def product_link(sku):
+    return f'https://www.jegs.com/i/Warn/940/{sku}/10002/-1'
+
+
+class SiteFetch:
+    """A discovery fetch callable serving FakeSite listings, recording every URL asked for."""
+
+    def __init__(self, site, hide_count=False):
+        self.site = site
+        self.hide_count = hide_count
+        self.urls = []
+
+    def __call__(self, urls):
+        self.urls.extend(urls)
+        bodies = []
+        for url in urls:
+            parts = urlsplit(url)
+            status, body = self.site.respond(parts.path, dict(parse_qsl(parts.query)))
+            assert status == 200
+            if self.hide_count:
+                body = body.replace(' results', '')
+            bodies.append(body)
+        return bodies
+
+    def page_sizes(self):
+        return [dict(parse_qsl(urlsplit(url).query))['pageSize'] for url in self.urls]
+
+
+def test_listing_urls():
+    assert href_prefix(WEBSITE) == '/i/Warn/940/'
+    query = dict(parse_qsl(urlsplit(listing_url(WEBSITE, 3, 60)).query))
+    assert (query['Tab'], query['pageSize'], query['pageNumber'], query['storeId']) == ('SKU', '60', '3', '10001')
+
+
+def test_every_part_in_listing_order():
+    fetch = SiteFetch(FakeSite(parts=250, max_page_size=60))
+
+    links = discover_part_links(fetch, WEBSITE, concurrency=2)
+
+    assert links == [product_link(sku) for sku in range(FIRST_SKU, FIRST_SKU + 250)]
+    # 120 and 90 come back capped at 60, so 60 is used for the remaining pages
+    assert fetch.page_sizes() == ['120', '90', '60'] + ['60'] * 4
+
+
+def test_windowed_pagination_without_a_count():
+    fetch = SiteFetch(FakeSite(parts=500, max_page_size=30), hide_count=True)
+
+    links = discover_part_links(fetch, WEBSITE, page_sizes=(30,))
+
+    # Page 1 only links pages 2-3; later pages reveal the rest
+    assert len(links) == 500
+    assert len(fetch.urls) == 17
+
+
+def test_max_pages_caps_the_listing():
+    fetch = SiteFetch(FakeSite(parts=500, max_page_size=30), hide_count=True)
+
+    links = discover_part_links(fetch, WEBSITE, max_pages=4, page_sizes=(30,))
+
+    assert links == [product_link(sku) for sku in range(FIRST_SKU, FIRST_SKU + 120)]
+    assert len(fetch.urls) == 4
+
+
+def test_links_repeated_across_pages_are_yielded_once():
+    def page(skus, last_page):
+        links = ''.join(f'<a href="/i/Warn/940/{sku}/10002/-1">{sku}</a>' for sku in skus)
+        pages = ''.join(f'<a href="/v/Warn/940?Tab=SKU&amp;pageNumber={n}">{n}</a>' for n in range(2, last_page + 1))
+        return f'<div id="product-details">{links}</div><div id="pagination">{pages}</div>'
+
+    pages = {'1': page([1, 2, 2], 3), '2': page([2, 3], 3), '3': page([1, 4], 3)}
+
+    def fetch(urls):
+        return [pages[dict(parse_qsl(urlsplit(url).query))['pageNumber']] for url in urls]
+
+    batches = list(iter_part_links(fetch, WEBSITE, page_sizes=(30,)))
+
+    assert batches == [
+        [product_link(1), product_link(2)],
+        [product_link(3)],
+        [product_link(4)],
+    ]
@@ -0,0 +1,87 @@
+import re
+import zipfile
+
+import pandas as pd
+from lxml import etree
+
+from jegs.excel import MAX_COLUMN_WIDTH, MIN_COLUMN_WIDTH, write_workbook
+
+NS = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def read_sheet(path):
+    """The first worksheet's XML, read without Excel or openpyxl."""
+    with zipfile.ZipFile(path) as workbook:
+        return etree.fromstring(workbook.read('xl/worksheets/sheet1.xml'))
+
+
+def cell_values(sheet):
+    """{cell reference: value}; text cells as str, numbers as float."""
+    values = {}
+    for cell in sheet.iterfind('.//x:sheetData/x:row/x:c', NS):
+        text = cell.findtext('x:is/x:t', namespaces=NS)
+        values[cell.get('r')] = text if text is not None else float(cell.findtext('x:v', namespaces=NS))
+    return values
+
+
+def rows(sheet):
+    values = cell_values(sheet)
+    table = {}
+    for ref, value in values.items():
+        column, row = re.match(r'([A-Z]+)(\d+)', ref).groups()
+        table.setdefault(int(row), {})[column] = value
+    return [table[row] for row in sorted(table)]
+
+
+def test_layout(tmp_path):
+    path = str(tmp_path / 'out' / 'parts.xlsx')
+    df = pd.DataFrame([
+        {'Part Number': 'JEG-1', 'Title': 'Winch', 'Description': 'x' * 200, 'Weight': 10},
+        {'Part Number': 'JEG-2', 'Title': None, 'Description': 'short', 'Weight': 12.5},
+    ])
+
+    assert write_workbook(path, df) == 2
+
+    sheet = read_sheet(path)
+    assert rows(sheet) == [
+        {'A': 'Part Number', 'B': 'Title', 'C': 'Description', 'D': 'Weight'},
+        {'A': 'JEG-1', 'B': 'Winch', 'C': 'x' * 200, 'D': 10.0},
+        {'A': 'JEG-2', 'C': 'short', 'D': 12.5},
+    ]
+    pane = sheet.find('.//x:pane', NS)
+    assert (pane.get('topLeftCell'), pane.get('state')) == ('A2', 'frozen')
+    # The header row has the bold grey style
+    assert sheet.find('.//x:row[@r="1"]', NS).get('s') != sheet.find('.//x:row[@r="2"]', NS).get('s')
+    widths = [float(col.get('width')) for col in sheet.iterfind('.//x:cols/x:col', NS)]
+    assert all(MIN_COLUMN_WIDTH <= width <= MAX_COLUMN_WIDTH + 1 for width in widths)
+    assert max(widths) >= MAX_COLUMN_WIDTH
+
+
+def test_chunks_are_written_in_order(tmp_path):
+    path = str(tmp_path / 'parts.xlsx')
+    columns = ['Part Number', 'Color']
+    chunks = [
+        (columns, pd.DataFrame({'Part Number': ['JEG-1', 'JEG-2'], 'Color': [None, 'Black']})),
+        (columns, pd.DataFrame({'Part Number': ['JEG-3'], 'Color': ['Red']})),
+    ]
+
+    assert write_workbook(path, chunks) == 3
+
+    assert rows(read_sheet(path)) == [
+        {'A': 'Part Number', 'B': 'Color'},
+        {'A': 'JEG-1'},
+        {'A': 'JEG-2', 'B': 'Black'},
+        {'A': 'JEG-3', 'B': 'Red'},
+    ]
+
+
+def test_text_is_never_a_formula_or_link(tmp_path):
+    path = str(tmp_path / 'parts.xlsx')
+    df = pd.DataFrame([{'Specs': '=SUM(A1:A2)', 'Link': 'https://www.jegs.com/i/Warn', 'Qty': 2}])
+
+    write_workbook(path, df)
+
+    sheet = read_sheet(path)
+    assert rows(sheet)[1] == {'A': '=SUM(A1:A2)', 'B': 'https://www.jegs.com/i/Warn', 'C': 2.0}
+    assert sheet.find('.//x:f', NS) is None
+    assert sheet.find('.//x:hyperlinks', NS) is None
@@ -0,0 +1,62 @@
+import pytest
+
+from jegs import extract
+from jegs.cache import PageCache
+from jegs.fakesite import FakeSite
+from jegs.parser import parse_product_html
+from jegs.ratelimit import NO_LIMIT
+
+LINKS = [f'https://www.jegs.com/i/Warn/940/{sku}/10002/-1' for sku in (100000, 100001)]
+
+
+class ProductDriver:
+    """Serves stand-in product pages and runs PRODUCT_SCRIPT with the offline parser."""
+
+    def __init__(self):
+        self.site = FakeSite(page_kb=0)
+        self.html = ''
+        self.page_source_reads = 0
+        self.scripts = 0
+
+    def get(self, url):
+        self.html = self.site.product('Warn', '940', int(url.split('/')[6]))
+
+    def set_script_timeout(self, timeout):
+        pass
+
+    def execute_async_script(self, script, *args):
+        return 0
+
+    def execute_script(self, script, *args):
+        assert script is extract.PRODUCT_SCRIPT
+        self.scripts += 1
+        record = list(parse_product_html(self.html).items())
+        return [record, self.html] if args[0] else record
+
+    @property
+    def page_source(self):
+        self.page_source_reads += 1
+        return self.html
+
+
+@pytest.fixture
+def no_limit(monkeypatch):
+    monkeypatch.setattr(extract, 'get_limiter', lambda: NO_LIMIT)
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_one_round_trip_per_part(monkeypatch, tmp_path, no_limit, cached):
+    page_cache = PageCache(str(tmp_path / 'cache')) if cached else None
+    monkeypatch.setattr(extract, 'get_cache', lambda: page_cache)
+    driver = ProductDriver()
+
+    part_data = extract.scrape_part_details(driver, LINKS)
+
+    assert [part['Part Number'] for part in part_data] == ['940-100000', '940-100001']
+    assert driver.scripts == 2
+    assert driver.page_source_reads == 0
+    if cached:
+        # The HTML came back with the record, and the next run reads it from the cache
+        assert parse_product_html(page_cache.get(LINKS[0])) == part_data[0]
+        assert extract.scrape_part_details(driver, LINKS) == part_data
+        assert driver.scripts == 2
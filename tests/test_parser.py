@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from jegs.parser import (
+    fitment_tab_onclick, is_challenge_page, max_page_number, pagination_onclicks,
+    parse_fitment_html, parse_listing_html, parse_product_html, parse_vehicle_info,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_product_record():
+    record = parse_product_html(fixture('product.html'))
+
+    assert list(record) == [
+        'Part Number', 'Title', 'Product Category', 'Bullet 1', 'Bullet 2',
+        'Specs', 'Description', 'Material', 'Finish',
+    ]
+    assert record['Part Number'] == '940-101570'
+    assert record['Title'] == 'Warn VR EVO 10-S Winch'
+    assert record['Bullet 2'] == 'Synthetic Rope'
+    assert record['Description'] == (
+        "Fits most full-size trucks.\n\n"
+        "The VR EVO is built for daily recovery work.\nSealed motor\nWireless remote\n"
+    )
+    assert record['Finish'] == 'Black Powdercoat'
+
+
+def test_product_without_optional_sections():
+    record = parse_product_html('<html><body><span id="product_id">1-2</span></body></html>')
+
+    assert record == {'Part Number': '1-2', 'Title': '', 'Specs': '', 'Description': ''}
+
+
+def test_fitment_rows():
+    rows = parse_fitment_html(fixture('fitment.html'), '940-101570')
+
+    assert rows == [
+        {
+            'Vehicle': '2018 Jeep Wrangler JL', 'Year': '2018', 'Make': 'Jeep', 'Model': 'Wrangler JL',
+            'Part Number': '940-101570', 'Engine': '3.6L V6', 'SubModel': 'Rubicon',
+            'Notes': 'Requires bumper: ARB 3450420',
+        },
+        {
+            'Vehicle': 'Universal Fit', 'Year': '', 'Make': 'Universal', 'Model': 'Fit',
+            'Part Number': '940-101570', 'Notes': 'Check clearance',
+        },
+    ]
+
+
+@pytest.mark.parametrize('fragment', ['', '<div>No Fitment record found for current selection</div>'])
+def test_no_fitment(fragment):
+    assert parse_fitment_html(fragment, '940-101570') == []
+
+
+def test_fitment_pagination():
+    onclicks = pagination_onclicks(fixture('fitment.html'))
+
+    assert len(onclicks) == 2
+    assert max_page_number(onclicks) == 7
+    assert max_page_number([]) == 1
+    assert pagination_onclicks('') == []
+
+
+def test_fitment_tab_onclick():
+    onclick = fitment_tab_onclick(fixture('product.html'))
+
+    assert onclick.startswith("ajaxLoadFirstProductFitment('/webapp/")
+    assert 'productId=101570&pageNumber=1' in onclick
+    assert fitment_tab_onclick('<html><body><a class="tab-label">Reviews</a></body></html>') is None
+
+
+def test_listing_page():
+    links, last_page, total = parse_listing_html(
+        fixture('listing.html'), '/i/Warn/940/', 'https://www.jegs.com/v/Warn/940?Tab=SKU'
+    )
+
+    assert links == [
+        'https://www.jegs.com/i/Warn/940/101570/10002/-1',
+        'https://www.jegs.com/i/Warn/940/92820/10002/-1',
+    ]
+    assert last_page == 21
+    assert total == 1234
+
+
+def test_challenge_pages():
+    assert is_challenge_page('<html><head><title>Just a moment...</title></head></html>')
+    assert is_challenge_page('<script>window._cf_chl_opt={};</script>')
+    assert not is_challenge_page(fixture('product.html'))
+    assert not is_challenge_page('')
+
+
+@pytest.mark.parametrize('vehicle, expected', [
+    ('2018 Jeep Wrangler JL', {'Year': '2018', 'Make': 'Jeep', 'Model': 'Wrangler JL'}),
+    ('2020 Ram', {'Year': '2020', 'Make': 'Ram', 'Model': ''}),
+    ('Universal', {'Year': '', 'Make': 'Universal', 'Model': ''}),
+])
+def test_parse_vehicle_info(vehicle, expected):
+    assert parse_vehicle_info(vehicle) == expected
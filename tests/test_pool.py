@@ -0,0 +1,300 @@
+import threading
+import time
+
+import pytest
+
+from jegs.checkpoint import Checkpoint
+from jegs.parser import ChallengeError
+from jegs.pool import scrape_with_pool
+from jegs.retry import record_failure
+
+WEBSITE = 'https://www.jegs.com/v/Warn/940'
+LINKS = [f'https://www.jegs.com/i/Warn/940/{number}/10002/-1' for number in range(6)]
+
+
+class StubDriver:
+    """Answers the supervisor's liveness checks; dead once killed."""
+
+    def __init__(self, name='driver'):
+        self.name = name
+        self.dead = False
+        self.challenge = False
+        self.visited = []
+        self.probes = 0
+
+    def execute_script(self, script, *args):
+        self.probes += 1
+        if self.dead:
+            raise Exception('invalid session id')
+        return 1
+
+    def get(self, url):
+        self.visited.append(url)
+        self.challenge = False
+
+    @property
+    def page_source(self):
+        self.probes += 1
+        return 'Just a moment...' if self.challenge else '<html></html>'
+
+
+class ListSink:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, records):
+        self.rows.extend(records)
+
+
+def rows_for(part_link):
+    return [{'url': part_link}]
+
+
+def run_pool(driver, scrape, setup_driver=None, wait_for_captcha=None, batch_size=1, checkpoint=None):
+    sink = ListSink()
+    scrape_with_pool(
+        driver, LINKS, scrape,
+        setup_driver=setup_driver or StubDriver,
+        wait_for_captcha=wait_for_captcha or (lambda driver: None),
+        cleanup=lambda driver: None,
+        website=WEBSITE,
+        workers=1,
+        checkpoint=checkpoint,
+        sink=sink,
+        batch_size=batch_size,
+    )
+    return sink
+
+
+def urls(sink):
+    return sorted(row['url'] for row in sink.rows)
+
+
+def test_dead_session_restarts_the_browser_and_retries_at_once(config):
+    config(retry_backoff_seconds=60)
+    first = StubDriver('first')
+    used = []
+
+    def scrape(driver, part_links):
+        if driver is first and part_links[0] == LINKS[2]:
+            first.dead = True
+            raise Exception('invalid session id')
+        used.append(driver.name)
+        return rows_for(part_links[0])
+
+    started = time.monotonic()
+    sink = run_pool(first, scrape, setup_driver=lambda: StubDriver('second'))
+
+    assert urls(sink) == sorted(LINKS)
+    assert used == ['first', 'first'] + ['second'] * 4
+    # Retried without the 60s backoff
+    assert time.monotonic() - started < 10
+
+
+def test_empty_results_are_not_treated_as_browser_failures(config, tmp_path):
+    driver = StubDriver()
+    checkpoint = Checkpoint('pool', path=str(tmp_path / 'checkpoint.sqlite3'))
+    calls = []
+
+    def scrape(driver, part_links):
+        calls.extend(part_links)
+        # Parts 1 and 3 have no data
+        return {part_link: rows_for(part_link) for part_link in part_links
+                if part_link not in (LINKS[1], LINKS[3])}
+
+    sink = run_pool(driver, scrape, batch_size=6, checkpoint=checkpoint)
+
+    assert urls(sink) == sorted(set(LINKS) - {LINKS[1], LINKS[3]})
+    assert checkpoint.completed() == set(LINKS)
+    assert calls == LINKS
+    assert driver.probes == 0
+    checkpoint.close()
+
+
+def test_empty_results_are_retried_with_a_challenged_batch(config, tmp_path):
+    config(retry_backoff_seconds=60)
+    driver = StubDriver()
+    checkpoint = Checkpoint('pool', path=str(tmp_path / 'checkpoint.sqlite3'))
+    verified = []
+
+    def scrape(driver, part_links):
+        if not verified:
+            # The bot check blanked part 1 and failed part 4
+            driver.challenge = True
+            record_failure(LINKS[4], ChallengeError('bot check'))
+            return {part_link: [] if part_link == LINKS[1] else rows_for(part_link)
+                    for part_link in part_links if part_link != LINKS[4]}
+        return {part_link: rows_for(part_link) for part_link in part_links}
+
+    sink = run_pool(driver, scrape, wait_for_captcha=verified.append, batch_size=6, checkpoint=checkpoint)
+
+    assert urls(sink) == sorted(LINKS)
+    assert checkpoint.completed() == set(LINKS)
+    assert verified == [driver]
+    checkpoint.close()
+
+
+def test_bot_check_reverifies_the_same_browser(config):
+    config(retry_backoff_seconds=60)
+    driver = StubDriver()
+    verified = []
+    setups = []
+
+    def scrape(driver, part_links):
+        if part_links[0] == LINKS[3] and not verified:
+            driver.challenge = True
+            raise ChallengeError('bot check')
+        return rows_for(part_links[0])
+
+    def setup_driver():
+        setups.append(1)
+        return StubDriver()
+
+    sink = run_pool(driver, scrape, setup_driver=setup_driver, wait_for_captcha=verified.append)
+
+    assert urls(sink) == sorted(LINKS)
+    assert verified == [driver]
+    assert driver.visited == [WEBSITE]
+    assert not setups
+
+
+def test_batch_recovery_keeps_the_parts_that_finished(config, tmp_path):
+    config(retry_backoff_seconds=60)
+    driver = StubDriver()
+    checkpoint = Checkpoint('pool', path=str(tmp_path / 'checkpoint.sqlite3'))
+    verified = []
+
+    def scrape(driver, part_links):
+        result = {}
+        for part_link in part_links:
+            if part_link == LINKS[4] and not verified:
+                driver.challenge = True
+                record_failure(part_link, ChallengeError('bot check'))
+            else:
+                result[part_link] = rows_for(part_link)
+        return result
+
+    sink = run_pool(driver, scrape, wait_for_captcha=verified.append, batch_size=6, checkpoint=checkpoint)
+
+    assert urls(sink) == sorted(LINKS)
+    assert checkpoint.completed() == set(LINKS)
+    assert verified == [driver]
+    checkpoint.close()
+
+
+def test_recycle_mid_batch_saves_the_whole_batch(config, tmp_path):
+    # recycle_pages is reached partway through the batch and no new browser
+    # can be started; every part of the batch is still written
+    config(recycle_pages=2)
+    checkpoint = Checkpoint('pool', path=str(tmp_path / 'checkpoint.sqlite3'))
+
+    def setup_driver():
+        raise Exception('no chrome')
+
+    def scrape(driver, part_links):
+        return {part_link: rows_for(part_link) for part_link in part_links}
+
+    sink = run_pool(StubDriver(), scrape, setup_driver=setup_driver, batch_size=6, checkpoint=checkpoint)
+
+    assert urls(sink) == sorted(LINKS)
+    assert checkpoint.completed() == set(LINKS)
+    checkpoint.close()
+
+
+def listing(pages, events, page_size=10):
+    def link_source(get_driver):
+        for page in range(pages):
+            assert get_driver() is not None
+            events.append(('page', page))
+            yield [f'https://www.jegs.com/i/Warn/940/{page}{number:02}/10002/-1' for number in range(page_size)]
+    return link_source
+
+
+def stream_pool(link_source, scrape, source_uses_driver, workers=1, checkpoint=None):
+    sink = ListSink()
+    scrape_with_pool(
+        StubDriver(), [], scrape,
+        setup_driver=StubDriver,
+        wait_for_captcha=lambda driver: None,
+        cleanup=lambda driver: None,
+        website=WEBSITE,
+        workers=workers,
+        checkpoint=checkpoint,
+        sink=sink,
+        link_source=link_source,
+        source_uses_driver=source_uses_driver,
+    )
+    return sink
+
+
+@pytest.mark.parametrize('source_uses_driver', [True, False])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_streamed_links_are_scraped_while_the_listing_loads(config, tmp_path, source_uses_driver, workers):
+    config(link_queue_size=5)
+    checkpoint = Checkpoint('pool', path=str(tmp_path / 'checkpoint.sqlite3'))
+    events = []
+    queued = []
+    lock = threading.Lock()
+
+    def scrape(driver, part_links):
+        with lock:
+            events.append(('part', part_links[0]))
+        time.sleep(0.005)
+        return rows_for(part_links[0])
+
+    def link_source(get_driver):
+        for page_links in listing(4, events)(get_driver):
+            with lock:
+                links = sum(1 for event in events if event[0] == 'page') * 10 - 10
+                queued.append(links - sum(1 for event in events if event[0] == 'part'))
+            yield page_links
+
+    sink = stream_pool(link_source, scrape, source_uses_driver, workers, checkpoint)
+
+    assert len(sink.rows) == 40
+    assert len(checkpoint.load_links()) == 40
+    kinds = [event[0] for event in events]
+    # Scraping started before the last listing page was read
+    assert kinds.index('part') < len(kinds) - 1 - kinds[::-1].index('page')
+    # The listing was held back while link_queue_size links were waiting
+    assert max(queued) <= 5 + workers
+    checkpoint.close()
+
+
+@pytest.mark.parametrize('source_uses_driver', [True, False])
+def test_listing_error_is_raised_after_queued_parts(config, tmp_path, source_uses_driver):
+    checkpoint = Checkpoint('pool', path=str(tmp_path / 'checkpoint.sqlite3'))
+
+    def link_source(get_driver):
+        yield LINKS[:2]
+        raise Exception('listing failed')
+
+    with pytest.raises(Exception, match='listing failed'):
+        stream_pool(link_source, lambda driver, part_links: rows_for(part_links[0]),
+                    source_uses_driver, checkpoint=checkpoint)
+
+    assert checkpoint.completed() == set(LINKS[:2])
+    # An incomplete listing is not saved, so --resume reads it again
+    assert checkpoint.load_links() == []
+    checkpoint.close()
+
+
+def test_losing_the_listing_browser_stops_the_run(config):
+    def setup_driver():
+        raise Exception('no chrome')
+
+    def scrape(driver, part_links):
+        driver.dead = True
+        raise Exception('invalid session id')
+
+    with pytest.raises(Exception, match='first browser was lost'):
+        scrape_with_pool(
+            StubDriver(), [], scrape,
+            setup_driver=setup_driver,
+            wait_for_captcha=lambda driver: None,
+            cleanup=lambda driver: None,
+            website=WEBSITE,
+            workers=1,
+            link_source=listing(4, []),
+            source_uses_driver=True,
+        )
@@ -0,0 +1,93 @@
+import pytest
+
+from jegs import ratelimit, settings
+from jegs.ratelimit import NO_LIMIT, RateLimiter
+
+
+class Clock:
+    """Stands in for the time module: sleep() moves time() forward instead of blocking."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'ratelimit.sqlite3')
+
+
+def test_burst_then_steady_rate(clock, path):
+    limiter = RateLimiter(1.0, burst=3, path=path)
+
+    waits = [limiter.acquire() for _ in range(5)]
+
+    assert waits == [0.0, 0.0, 0.0, 1.0, 1.0]
+    assert limiter.acquire(0) == 0.0
+
+
+def test_batches_reserve_every_request(clock, path):
+    limiter = RateLimiter(0.5, path=path)
+
+    assert limiter.acquire(4) == 0.0
+    assert limiter.acquire() == 2.0
+
+
+def test_processes_share_one_budget(clock, path):
+    first = RateLimiter(1.0, path=path)
+    second = RateLimiter(1.0, path=path)
+
+    assert first.acquire() == 0.0
+    assert second.acquire() == 1.0
+    assert first.acquire() == 1.0
+
+
+def test_backoff_and_recovery(clock, path):
+    limiter = RateLimiter(1.0, max_delay=3.0, slow_seconds=5.0, path=path)
+
+    assert limiter.report(ok=False) == 2.0
+    # An error pauses everyone for one full backed-off delay
+    assert limiter.acquire() == 2.0
+    assert limiter.report(ok=False) == 3.0
+    assert limiter.report(ok=True, seconds=6.0) == 3.0
+
+    delays = [limiter.report(ok=True, seconds=0.2) for _ in range(40)]
+    assert delays[0] == pytest.approx(2.85)
+    assert delays[-1] == 1.0
+    assert limiter.delay == 1.0
+
+
+def test_slow_responses_stretch_the_delay(clock, path):
+    limiter = RateLimiter(2.0, slow_seconds=5.0, path=path)
+
+    assert limiter.report(ok=True, seconds=5.0) == 2.0
+    assert limiter.report(ok=True, seconds=8.0) == 3.0
+
+
+@pytest.mark.parametrize('request_delay, limited', [(0, False), (0.5, True)])
+def test_get_limiter_follows_config(monkeypatch, tmp_path, request_delay, limited):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ratelimit, '_shared_limiter', None)
+    monkeypatch.setattr(ratelimit, 'load_config', lambda path=None: dict(settings.DEFAULTS, request_delay=request_delay))
+
+    limiter = ratelimit.get_limiter()
+
+    assert (limiter is not NO_LIMIT) == limited
+    assert ratelimit.get_limiter() is limiter
+    if limited:
+        assert limiter.base_delay == 0.5
+        assert limiter.path == str(tmp_path / ratelimit.RATE_LIMIT_FILE)
@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+
+from jegs.retry import MAX_BACKOFF, RetryQueue, write_dead_letters
+
+
+class FakeCheckpoint:
+    def __init__(self):
+        self.failures = []
+
+    def mark_failed(self, part_link, attempts, error, retry_at=None):
+        self.failures.append((part_link, attempts, type(error).__name__, retry_at))
+
+
+def run_in_thread(function):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function()), daemon=True)
+    thread.start()
+    return thread, result
+
+
+def test_links_come_out_in_order(config):
+    queue = RetryQueue()
+    for index, link in enumerate(['a', 'b', 'c']):
+        queue.put(index, link)
+    assert [queue.get() for _ in range(3)] == [(0, 'a', 0), (1, 'b', 0), (2, 'c', 0)]
+    assert queue.get() is None
+
+
+def test_failed_part_is_retried_after_the_rest(config):
+    queue = RetryQueue(attempts=3, backoff=0.05)
+    queue.put(0, 'a')
+    queue.put(1, 'b')
+    index, link, attempt = queue.get()
+    queue.failed('worker-1', index, link, attempt, TimeoutError('slow'))
+
+    assert queue.get() == (1, 'b', 0)
+    started = time.monotonic()
+    assert queue.get() == (0, 'a', 1)
+    assert time.monotonic() - started >= 0.04
+
+
+def test_backoff_doubles_and_is_capped(config):
+    checkpoint = FakeCheckpoint()
+    queue = RetryQueue(checkpoint, attempts=20, backoff=5)
+    for attempt in (0, 1, 2, 10):
+        now = time.time()
+        queue.failed('worker-1', 0, 'a', attempt, TimeoutError('slow'))
+        retry_at = checkpoint.failures[-1][3]
+        assert abs(retry_at - now - min(5 * 2 ** attempt, MAX_BACKOFF)) < 1
+
+
+def test_retry_without_backoff_is_due_at_once(config):
+    queue = RetryQueue(attempts=3, backoff=60)
+    queue.failed('worker-1', 0, 'a', 0, Exception('browser session died'), backoff=False)
+    assert queue.get_batch(5) == [(0, 'a', 1)]
+
+
+def test_part_out_of_attempts_is_dead_lettered(config):
+    checkpoint = FakeCheckpoint()
+    queue = RetryQueue(checkpoint, attempts=2, backoff=0)
+    queue.failed('worker-1', 0, 'a', 1, TimeoutError('slow'))
+
+    assert queue.empty()
+    assert [(entry['url'], entry['attempts'], entry['error_class'], entry['error'])
+            for entry in queue.dead] == [('a', 2, 'TimeoutError', 'slow')]
+    assert checkpoint.failures == [('a', 2, 'TimeoutError', None)]
+
+
+def test_get_batch_takes_only_due_links(config):
+    queue = RetryQueue()
+    queue.put(0, 'a')
+    queue.put(1, 'b', delay=60)
+    queue.put(2, 'c')
+    assert queue.get_batch(5) == [(0, 'a', 0), (2, 'c', 0)]
+    assert queue.qsize() == 1
+
+
+def test_get_waits_for_links_while_open(config):
+    queue = RetryQueue()
+    queue.open()
+    thread, result = run_in_thread(queue.get)
+    time.sleep(0.05)
+    assert thread.is_alive()
+
+    queue.put(0, 'a')
+    thread.join(1)
+    assert result == [(0, 'a', 0)]
+
+    thread, result = run_in_thread(queue.get)
+    queue.close()
+    thread.join(1)
+    assert result == [None]
+
+
+def test_bounded_put_waits_for_room(config):
+    queue = RetryQueue(maxsize=1)
+    queue.open()
+    assert queue.put(0, 'a', wait=True)
+    assert queue.full()
+
+    thread, result = run_in_thread(lambda: queue.put(1, 'b', wait=True))
+    time.sleep(0.05)
+    assert thread.is_alive()
+
+    assert queue.get() == (0, 'a', 0)
+    thread.join(1)
+    assert result == [True]
+    assert queue.get() == (1, 'b', 0)
+
+
+def test_bounded_put_returns_false_once_closed(config):
+    queue = RetryQueue(maxsize=1)
+    queue.open()
+    queue.put(0, 'a', wait=True)
+
+    thread, result = run_in_thread(lambda: queue.put(1, 'b', wait=True))
+    time.sleep(0.05)
+    queue.close()
+    thread.join(1)
+    assert result == [False]
+    assert queue.qsize() == 1
+
+
+def test_retries_are_not_held_to_maxsize(config):
+    queue = RetryQueue(maxsize=1, attempts=3, backoff=0)
+    queue.open()
+    queue.put(0, 'a', wait=True)
+    queue.failed('worker-1', 1, 'b', 0, TimeoutError('slow'))
+    assert queue.qsize() == 2
+
+
+def test_write_dead_letters(config, tmp_path):
+    entries = [{'url': 'a', 'attempts': 3, 'error_class': 'TimeoutError', 'error': 'slow'}]
+    path = write_dead_letters('warn_individual', entries, str(tmp_path))
+
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == entries
+
+    # A later run with nothing given up on removes the stale file
+    assert write_dead_letters('warn_individual', [], str(tmp_path)) is None
+    assert not (tmp_path / 'warn_individual.jsonl').exists()
@@ -0,0 +1,92 @@
+import pytest
+
+from jegs.engine import process_application, process_individual
+from jegs.sink import JsonlSink, ParquetSink, iter_processed, iter_records, read_processed
+
+
+def part(number, **fields):
+    row = {
+        'Part Number': f'JEG-{number}',
+        'Title': f'Part {number}',
+        'Product Category': 'Winches',
+        'Bullet 1': 'Steel',
+        'Specs': 'spec',
+        'Description': 'desc',
+        'Weight': '10 lb',
+    }
+    row.update(fields)
+    return {key: value for key, value in row.items() if value is not None}
+
+
+def write_rows(sink, rows):
+    for row in rows:
+        sink.write([row])
+    sink.close()
+    return sink.path
+
+
+@pytest.fixture(params=['jsonl', 'parquet'])
+def make_sink(request, tmp_path):
+    if request.param == 'jsonl':
+        return lambda: JsonlSink(str(tmp_path / 'rows.jsonl'))
+    pytest.importorskip('pyarrow')
+    return lambda: ParquetSink(str(tmp_path / 'rows'), batch_rows=100)
+
+
+def test_rows_come_back_in_chunks(make_sink):
+    rows = [part(number) for number in range(7)]
+    path = write_rows(make_sink(), rows)
+
+    chunks = list(iter_records(path, chunk_rows=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [row for chunk in chunks for row in chunk] == rows
+
+
+def test_chunk_without_an_optional_column(make_sink):
+    # The last chunk has no row with a Product Category at all
+    rows = [part(number) for number in range(5)] + [part(5, **{'Product Category': None})]
+    path = write_rows(make_sink(), rows)
+
+    chunks = list(iter_processed(path, process_individual, chunk_rows=5))
+
+    columns = chunks[0][0]
+    assert columns[:4] == ['Part Number', 'Title', 'Product Category', 'Bullet 1']
+    assert all(chunk_columns == columns for chunk_columns, _ in chunks)
+    last = chunks[-1][1]
+    assert list(last.columns) == columns
+    assert last['Part Number'].tolist() == ['JEG-5']
+    assert last['Product Category'].isna().all()
+
+
+def test_chunks_are_aligned_to_every_column(tmp_path):
+    rows = [part(0), part(1, **{'Bullet 2': 'Wide', 'Color': 'Black'})]
+    path = write_rows(JsonlSink(str(tmp_path / 'rows.jsonl')), rows)
+
+    df = read_processed(path, process_individual, chunk_rows=1)
+
+    assert list(df.columns) == ['Part Number', 'Title', 'Product Category', 'Bullet 1', 'Bullet 2',
+                                'Specs', 'Description', 'Weight', 'Color']
+    assert df['Bullet 2'].isna().tolist() == [True, False]
+    assert df['Color'].isna().tolist() == [True, False]
+
+
+def test_application_rows_are_processed_in_chunks(tmp_path):
+    rows = [
+        {'Vehicle': '2020 Jeep Wrangler', 'Engine': '3.6L', 'Year': '2020', 'Make': 'Jeep',
+         'Model': 'Wrangler', 'Part Number': 'JEG-1'},
+        {'Vehicle': '2021 Ford F-150', 'Year': '2021', 'Make': 'Ford', 'Model': 'F-150',
+         'Part Number': 'JEG-1'},
+    ]
+    path = write_rows(JsonlSink(str(tmp_path / 'rows.jsonl')), rows)
+
+    df = read_processed(path, process_application, chunk_rows=1)
+
+    assert list(df.columns) == ['Part Number', 'Year', 'Make', 'Model', 'Engine']
+    assert df['Model'].tolist() == ['Wrangler', 'F-150']
+    assert df['Engine'].isna().tolist() == [False, True]
+
+
+def test_no_rows(tmp_path):
+    path = write_rows(JsonlSink(str(tmp_path / 'rows.jsonl')), [])
+    with pytest.raises(ValueError):
+        list(iter_processed(path, process_individual))